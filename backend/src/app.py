@@ -1,11 +1,42 @@
+import os
+
 from flask import Flask, jsonify
 from flask_cors import CORS
 from src.controller.game_controller import game_bp
+from src.controller.game_socket import sock
+from src.controller.session_registry import session_registry
+from src.controller.simulation_jobs import simulation_jobs
+from src.linearprogramming.disk_cache import disk_equilibrium_cache
+from src.linearprogramming.equilibrium_cache import equilibrium_cache
 
 app = Flask(__name__)
-CORS(app)
+# Browsers only let scripts read the headers listed here
+CORS(app, expose_headers=['ETag', 'X-Matrix-Offset'])
+
+# Session limits, e.g. HIDE_SEEK_MAX_SESSIONS=50000 HIDE_SEEK_SESSION_TTL=1800
+session_registry.configure(
+    capacity=int(os.environ.get('HIDE_SEEK_MAX_SESSIONS', session_registry.capacity)),
+    ttl=float(os.environ.get('HIDE_SEEK_SESSION_TTL', session_registry.ttl))
+)
+
+# Background simulation jobs, e.g. HIDE_SEEK_JOB_WORKERS=4 HIDE_SEEK_JOB_QUEUE=32: jobs beyond
+# workers + queue depth are rejected with 429 until earlier ones finish
+simulation_jobs.configure(
+    max_workers=int(os.environ.get('HIDE_SEEK_JOB_WORKERS', simulation_jobs.max_workers)),
+    max_queued=int(os.environ.get('HIDE_SEEK_JOB_QUEUE', simulation_jobs.max_queued))
+)
+
+# Persistent equilibria survive restarts, e.g. HIDE_SEEK_DISK_CACHE_DIR=/var/cache/hide-seek;
+# the most recently used HIDE_SEEK_DISK_CACHE_WARMUP entries are preloaded into the in-memory cache
+if os.environ.get('HIDE_SEEK_DISK_CACHE_DIR'):
+    disk_equilibrium_cache.configure(
+        os.environ['HIDE_SEEK_DISK_CACHE_DIR'],
+        int(os.environ.get('HIDE_SEEK_DISK_CACHE_BYTES', disk_equilibrium_cache.max_bytes))
+    )
+    disk_equilibrium_cache.warm_up(equilibrium_cache, int(os.environ.get('HIDE_SEEK_DISK_CACHE_WARMUP', 1000)))
 
 app.register_blueprint(game_bp, url_prefix='/api/game')
+sock.init_app(app)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
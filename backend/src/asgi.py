@@ -0,0 +1,298 @@
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+
+from src.app import app as flask_app
+from src.controller.game_socket import handle_message
+from src.controller.matrix_encoding import parse_matrix_options
+from src.controller.session_registry import session_registry
+
+# Endpoints that only touch one game's state or a registry; they run on the event loop.
+# Everything else may solve a game, generate a grid or simulate, and runs on the solver pool
+INLINE_ENDPOINTS = frozenset({
+    'health_check',
+    'game.play_round',
+    'game.get_round_history',
+    'game.close_session',
+    'game.session_stats',
+    'game.get_configuration_place_types',
+    'game.submit_simulation_job',
+    'game.get_simulation_job',
+    'game.cancel_simulation_job',
+    'game.get_simulation_job_result',
+    'game.simulation_job_stats'
+})
+
+# Endpoints that send the O(n^2) payoff matrix unless include_matrix=false; only inline without it
+MATRIX_ENDPOINTS = frozenset({
+    'game.get_game_state',
+    'game.reset_game'
+})
+
+SOCKET_PATH = '/api/game/ws'
+
+_END = object()
+
+
+class GameASGIApp:
+    """
+    Asyncio front end of the Flask game API.
+
+    Connections, request bodies and WebSocket messages are handled by the event loop.
+    The Flask views stay synchronous and shared with the WSGI server: cheap endpoints
+    are called inline, the rest on a bounded pool of solver threads, so a solve never
+    holds up light requests. Threads rather than processes, because the views mutate
+    the in-process session registry; the solves spend their time in NumPy and HiGHS,
+    which release the GIL. Streamed bodies (event streams, history exports) are pulled
+    on a separate stream pool so open streams cannot starve the solvers.
+    """
+
+    def __init__(self, wsgi_app, inline_endpoints=INLINE_ENDPOINTS, matrix_endpoints=MATRIX_ENDPOINTS,
+                 solver_threads=None, stream_threads=64):
+        self.wsgi_app = wsgi_app
+        self.inline_endpoints = inline_endpoints
+        self.matrix_endpoints = matrix_endpoints
+        self.solver_executor = ThreadPoolExecutor(max_workers=solver_threads or os.cpu_count(),
+                                                  thread_name_prefix='solver')
+        self.stream_executor = ThreadPoolExecutor(max_workers=stream_threads, thread_name_prefix='stream')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http':
+            await self._http(scope, receive, send)
+        elif scope['type'] == 'websocket':
+            await self._websocket(scope, receive, send)
+        elif scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.solver_executor.shutdown(wait=False, cancel_futures=True)
+                self.stream_executor.shutdown(wait=False, cancel_futures=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _endpoint(self, method, path):
+        try:
+            endpoint, _ = self.wsgi_app.url_map.bind('').match(path, method)
+        except (HTTPException, RequestRedirect):
+            # Unknown routes and redirects are answered by Flask without work
+            return None
+        return endpoint
+
+    @staticmethod
+    def _request_data(scope, body):
+        # Query parameters and JSON body fields, like the views read them
+        data = {name: values[0] for name, values in parse_qs(scope['query_string'].decode('latin-1')).items()}
+        if body:
+            try:
+                fields = json.loads(body)
+            except ValueError:
+                fields = None
+            if isinstance(fields, dict):
+                data.update(fields)
+        return data
+
+    def _inline_session(self, scope, body):
+        # Whether the request may run on the loop, and the session whose lock it must take
+        # there first. The caller acquires that lock without blocking and offloads the
+        # request when a solver thread holds it
+        endpoint = self._endpoint(scope['method'], scope['path'])
+        if endpoint is None:
+            return True, None
+        if endpoint not in self.inline_endpoints and endpoint not in self.matrix_endpoints:
+            return False, None
+
+        data = self._request_data(scope, body)
+        if endpoint in self.matrix_endpoints:
+            try:
+                if parse_matrix_options(data)['include_matrix']:
+                    return False, None
+            except ValueError:
+                return False, None
+        session_id = data.get('session_id')
+        return True, session_registry.get(session_id) if isinstance(session_id, str) else None
+
+    async def _http(self, scope, receive, send):
+        body = bytearray()
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body += message.get('body', b'')
+            if not message.get('more_body', False):
+                break
+        body = bytes(body)
+
+        environ = _wsgi_environ(scope, body)
+        loop = asyncio.get_running_loop()
+        inline, session = self._inline_session(scope, body)
+        # The session lock is reentrant: taken here without blocking, the view takes it again
+        # on the same thread, and no solver thread can grab it in between
+        if inline and (session is None or session.lock.acquire(blocking=False)):
+            try:
+                status, headers, result, streamed = self._call_wsgi(environ)
+            finally:
+                if session is not None:
+                    session.lock.release()
+        else:
+            status, headers, result, streamed = await loop.run_in_executor(self.solver_executor,
+                                                                           self._call_wsgi, environ)
+
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        if not streamed:
+            await send({'type': 'http.response.body', 'body': b''.join(result)})
+            return
+
+        # Chunks are pulled off the loop until the stream ends or the client leaves
+        iterator = iter(result)
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(receive))
+        try:
+            while not disconnected.done():
+                chunk = await loop.run_in_executor(self.stream_executor, next, iterator, _END)
+                if chunk is _END:
+                    break
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            disconnected.cancel()
+            if hasattr(result, 'close'):
+                await loop.run_in_executor(self.stream_executor, result.close)
+
+    def _call_wsgi(self, environ):
+        # Status, headers, body and whether the body is streamed (sent without a length) and
+        # must be read incrementally; other bodies are read here, on the thread that made them
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'] = int(status.split(' ', 1)[0])
+            started['headers'] = [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                  for name, value in headers]
+
+        result = self.wsgi_app(environ, start_response)
+        if all(name != b'content-length' for name, _ in started['headers']):
+            return started['status'], started['headers'], result, True
+        try:
+            return started['status'], started['headers'], list(result), False
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+
+    async def _websocket(self, scope, receive, send):
+        # Same protocol as the flask-sock route: ws://host/api/game/ws?session_id=...
+        message = await receive()
+        if message['type'] != 'websocket.connect':
+            return
+        if scope['path'] != SOCKET_PATH:
+            await send({'type': 'websocket.close', 'code': 1008})
+            return
+        await send({'type': 'websocket.accept'})
+
+        session_id = parse_qs(scope['query_string'].decode('latin-1')).get('session_id', [None])[0]
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await receive()
+            if message['type'] == 'websocket.disconnect':
+                return
+            text = message.get('text')
+            if text is None:
+                text = (message.get('bytes') or b'').decode('utf-8', errors='replace')
+
+            session = session_registry.get(session_id)
+            if session is None:
+                await send({'type': 'websocket.send',
+                            'text': json.dumps({"e": "Unknown or expired session. Call /initialize again."})})
+                await send({'type': 'websocket.close', 'code': 1000})
+                return
+            # Anything that may hold a list is a batch and leaves the loop, as does a
+            # message on a session whose lock another thread holds
+            if '[' not in text and session.lock.acquire(blocking=False):
+                try:
+                    reply = handle_message(session, text)
+                finally:
+                    session.lock.release()
+            else:
+                reply = await loop.run_in_executor(self.solver_executor, handle_message, session, text)
+            await send({'type': 'websocket.send', 'text': json.dumps(reply, separators=(",", ":"))})
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+def _wsgi_environ(scope, body):
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': (scope.get('client') or ('', 0))[0],
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            key = f'HTTP_{name}'
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+app = GameASGIApp(flask_app, solver_threads=int(os.environ.get('HIDE_SEEK_SOLVER_THREADS', 0)) or None)
+
+
+def _serve(host, port):
+    import uvicorn
+    uvicorn.run(app, host=host, port=port, log_level='warning')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the game API on an asyncio event loop.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes, each on its own port from --port on")
+    args = parser.parse_args(argv)
+
+    if args.workers == 1:
+        _serve(args.host, args.port)
+        return
+
+    # Sessions live in the memory of the worker that created them, so every worker gets
+    # its own port and the reverse proxy keeps a client on one of them
+    workers = [multiprocessing.Process(target=_serve, args=(args.host, args.port + i))
+               for i in range(args.workers)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,134 +1,480 @@
-from flask import Blueprint, jsonify, request
+import json
+import os
 
+from flask import Blueprint, Response, jsonify, request
+
+from src.controller.matrix_encoding import add_matrix, encode_matrix, npy_bytes, parse_matrix_options
+
+from src.controller.session_registry import session_registry
+from src.controller.simulation_jobs import JobQueueFull, simulation_jobs
+from src.game.game_configuration import configuration_store
 from src.game.gamefacade import GameFacade, PlayerRole
+from src.game.gamelogic.gamegrid.place_type import PlaceType
 from src.game.gamesimulation import GameSimulation
+from src.game.montecarlo import MonteCarloSimulation
+from src.game.round_history import MAX_CAPACITY, iter_csv, iter_ndjson, iter_npy
 
 game_bp = Blueprint('game', __name__)
 
-interactive_game = None
-simulation_game = None
+
+def _json_body():
+    # The JSON body, {} without one; None when it is valid JSON but not an object
+    data = request.get_json(silent=True)
+    if data is None:
+        return {}
+    return data if isinstance(data, dict) else None
+
+
+NOT_AN_OBJECT = 'Request body must be a JSON object.'
+
+
+def _get_session():
+    # session_id comes in the JSON body of POSTs and as a query parameter of GETs
+    data = _json_body()
+    if data is None:
+        return None, (jsonify({'status': 'error', 'message': NOT_AN_OBJECT}), 400)
+    session_id = data.get('session_id') or request.args.get('session_id')
+    if not session_id:
+        return None, (jsonify({'status': 'error', 'message': 'Missing session_id. Call /initialize first.'}), 400)
+    if not isinstance(session_id, str):
+        return None, (jsonify({'status': 'error', 'message': 'session_id must be a string.'}), 400)
+
+    session = session_registry.get(session_id)
+    if session is None:
+        return None, (jsonify({'status': 'error',
+                               'message': 'Unknown or expired session. Call /initialize again.'}), 404)
+    return session, None
+
+
+# Session state changes with every round, clients must revalidate; configuration
+# resources are named by the configuration digest and never change
+REVALIDATE = 'no-cache'
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def _options_tag(matrix_options):
+    return '-'.join(str(matrix_options[key]) for key in ('include_matrix', 'format', 'dtype', 'compression'))
+
+
+def _not_modified(etag, cache_control):
+    # 304 without building the body when If-None-Match already names this representation
+    if not request.if_none_match.contains(etag):
+        return None
+    response = Response(status=304)
+    return _cacheable(response, etag, cache_control)
+
+
+def _cacheable(response, etag, cache_control):
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
+
+
+def _get_matrix_options(default_format='json'):
+    # Payoff matrix transport options, from the JSON body or the query string
+    body = _json_body()
+    if body is None:
+        return None, (jsonify({'status': 'error', 'message': NOT_AN_OBJECT}), 400)
+    data = {**request.args.to_dict(), **body}
+    try:
+        return parse_matrix_options(data, default_format), None
+    except ValueError as e:
+        return None, (jsonify({'status': 'error', 'message': str(e)}), 400)
 
 
 @game_bp.route('/initialize', methods=['POST'])
 def initialize_game():
+    matrix_options, error = _get_matrix_options()
+    if error:
+        return error
+
     data = request.json
     grid_size = data.get('grid_size', 4)
     grid_type = 'linear' if data.get('grid_type', 'linear') == 'linear' or data.get('grid_type',
                                                                                     'linear') == 'linear-approximation' else '2d'
     use_proximity = False if data.get('grid_type', 'linear') == 'linear' else True
+    # Rounds kept for /round-history, the latest history_capacity ones up to the server's cap
+    history_capacity = data.get('history_capacity')
+    if history_capacity is None:
+        history_capacity = MAX_CAPACITY
+    if (isinstance(history_capacity, bool) or not isinstance(history_capacity, int)
+            or not 0 <= history_capacity <= MAX_CAPACITY):
+        return jsonify({'status': 'error',
+                        'message': f'history_capacity must be an integer between 0 and {MAX_CAPACITY}'}), 400
 
-    global interactive_game
-    interactive_game = GameFacade(grid_size, grid_type, use_proximity)
+    interactive_game = GameFacade(grid_size, grid_type, use_proximity, history_capacity=history_capacity)
+    session = session_registry.create(interactive_game)
 
-    return jsonify({
+    return jsonify(add_matrix({
         'status': 'success',
-        'payoff_matrix': interactive_game.payoff_matrix.tolist(),
+        'session_id': session.session_id,
         'grid_size': grid_size,
         'grid_type': grid_type,
         'use_proximity': use_proximity,
         'place_types': [interactive_game.game_grid.get_place_type(i).name for i in range(grid_size)]
-    })
+    }, 'payoff_matrix', interactive_game.payoff_matrix_loader(), matrix_options))
 
 
 @game_bp.route('/start-game', methods=['POST'])
 def start_game():
-    if not interactive_game:
-        return jsonify({'status': 'error', 'message': 'Game not initialized. Call /initialize first.'}), 400
+    session, error = _get_session()
+    if error:
+        return error
+    matrix_options, error = _get_matrix_options()
+    if error:
+        return error
 
     data = request.json
     human_role = data.get('human_role', 'seeker')
     role = PlayerRole.HIDER if human_role.lower() == 'hider' else PlayerRole.SEEKER
-    game_data = interactive_game.start_new_game(role)
+    with session.lock:
+        game_data = session.game.start_new_game(role)
+        session.version += 1
 
-    return jsonify({
+    return jsonify(add_matrix({
         'status': 'success',
+        'session_id': session.session_id,
         'human_role': game_data['human_role'].value,
         'computer_role': game_data['computer_role'].value,
-        'payoff_matrix': game_data['payoff_matrix'].tolist(),
         'computer_strategy': {
             'probabilities': game_data['computer_strategy']['probabilities'].tolist(),
         }
-    })
+    }, 'payoff_matrix', game_data['payoff_matrix'], matrix_options))
 
 
 @game_bp.route('/play-round', methods=['POST'])
 def play_round():
-    if not interactive_game or not interactive_game.is_game_running:
-        return jsonify({'status': 'error', 'message': 'Game not running. Call /start-game first.'}), 400
+    session, error = _get_session()
+    if error:
+        return error
 
     data = request.json
     human_position = data.get('human_position')
     if human_position is None:
         return jsonify({'status': 'error', 'message': 'Missing human_position parameter.'}), 400
 
-    try:
-        round_result = interactive_game.play_round(human_position)
-        return jsonify({
-            'status': 'success',
-            'human_position': round_result['human_position'],
-            'computer_position': round_result['computer_position'],
-            'hider_position': round_result['hider_position'],
-            'seeker_position': round_result['seeker_position'],
-            'human_score': round_result['human_score'],
-            'computer_score': round_result['computer_score'],
-            'human_wins': round_result['human_wins'],
-            'computer_wins': round_result['computer_wins'],
-            'winner': round_result['winner'],
-            'round_number': round_result['round_number']
-        })
-    except ValueError as e:
-        return jsonify({'status': 'error', 'message': str(e)}), 400
+    with session.lock:
+        interactive_game = session.game
+        if not interactive_game.is_game_running:
+            return jsonify({'status': 'error', 'message': 'Game not running. Call /start-game first.'}), 400
 
+        try:
+            round_result = interactive_game.play_round(human_position)
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        session.version += 1
 
-@game_bp.route('/reset-game', methods=['POST'])
-def reset_game():
-    if not interactive_game:
-        return jsonify({'status': 'error', 'message': 'Game not initialized. Call /initialize first.'}), 400
+    return jsonify({
+        'status': 'success',
+        'human_position': round_result['human_position'],
+        'computer_position': round_result['computer_position'],
+        'hider_position': round_result['hider_position'],
+        'seeker_position': round_result['seeker_position'],
+        'human_score': round_result['human_score'],
+        'computer_score': round_result['computer_score'],
+        'human_wins': round_result['human_wins'],
+        'computer_wins': round_result['computer_wins'],
+        'winner': round_result['winner'],
+        'round_number': round_result['round_number']
+    })
+
+
+@game_bp.route('/play-rounds', methods=['POST'])
+def play_rounds():
+    session, error = _get_session()
+    if error:
+        return error
 
-    reset_data = interactive_game.reset_game()
+    data = request.json
+    human_positions = data.get('human_positions')
+    if not isinstance(human_positions, list):
+        return jsonify({'status': 'error', 'message': 'Missing human_positions parameter.'}), 400
+
+    with session.lock:
+        interactive_game = session.game
+        if not interactive_game.is_game_running:
+            return jsonify({'status': 'error', 'message': 'Game not running. Call /start-game first.'}), 400
+
+        try:
+            rounds = interactive_game.play_rounds(human_positions)
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        session.version += 1
 
     return jsonify({
         'status': 'success',
-        'payoff_matrix': reset_data['payoff_matrix'].tolist()
+        'rounds': len(human_positions),
+        'computer_positions': rounds['computer_positions'].tolist(),
+        # 1 where the seeker found the hider, 0 where the hider escaped
+        'seeker_wins': rounds['seeker_wins'].astype(int).tolist(),
+        'human_score_changes': rounds['human_score_changes'].tolist(),
+        'human_score': rounds['human_score'],
+        'computer_score': rounds['computer_score'],
+        'human_wins': rounds['human_wins'],
+        'computer_wins': rounds['computer_wins'],
+        'round_number': rounds['round_number']
     })
 
 
+@game_bp.route('/edit-places', methods=['POST'])
+def edit_places():
+    session, error = _get_session()
+    if error:
+        return error
+    matrix_options, error = _get_matrix_options()
+    if error:
+        return error
+
+    data = request.json
+    places = data.get('places')
+    if not isinstance(places, dict) or not places:
+        return jsonify({'status': 'error', 'message': 'places must map positions to place types.'}), 400
+    try:
+        changes = {int(position): PlaceType[name.upper()] for position, name in places.items()}
+    except (ValueError, KeyError, AttributeError):
+        return jsonify({'status': 'error',
+                        'message': 'Positions must be integers and place types EASY, NEUTRAL or HARD.'}), 400
+
+    with session.lock:
+        try:
+            edit_data = session.game.edit_places(changes)
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
+        session.version += 1
+
+    response = add_matrix({
+        'status': 'success',
+        'place_types': edit_data['place_types']
+    }, 'payoff_matrix', edit_data['payoff_matrix'], matrix_options)
+    if edit_data['computer_strategy'] is not None:
+        response['computer_strategy'] = {'probabilities': edit_data['computer_strategy']['probabilities'].tolist()}
+    return jsonify(response)
+
+
+@game_bp.route('/reset-game', methods=['POST'])
+def reset_game():
+    session, error = _get_session()
+    if error:
+        return error
+    matrix_options, error = _get_matrix_options()
+    if error:
+        return error
+
+    with session.lock:
+        reset_data = session.game.reset_game()
+        session.version += 1
+
+    return jsonify(add_matrix({'status': 'success'}, 'payoff_matrix', reset_data['payoff_matrix'], matrix_options))
+
+
 @game_bp.route('/get-game-state', methods=['GET'])
 def get_game_state():
-    if not interactive_game:
-        return jsonify({'status': 'error', 'message': 'Game not initialized. Call /initialize first.'}), 400
+    session, error = _get_session()
+    if error:
+        return error
+    matrix_options, error = _get_matrix_options()
+    if error:
+        return error
+    include_place_types = request.args.get('include_place_types', 'true').lower() not in ('false', '0', 'no')
+
+    # The version is read before the state: a concurrent round can only make the ETag older
+    etag = f'{session.session_id}-{session.version}-{_options_tag(matrix_options)}-{int(include_place_types)}'
+    not_modified = _not_modified(etag, REVALIDATE)
+    if not_modified:
+        return not_modified
 
-    state = interactive_game.get_game_state()
+    with session.lock:
+        state = session.game.get_game_state()
 
     if state['human_role']:
         state['human_role'] = state['human_role'].value
     if state['computer_role']:
         state['computer_role'] = state['computer_role'].value
-    state['payoff_matrix'] = state['payoff_matrix'].tolist()
+    add_matrix(state, 'payoff_matrix', state.pop('payoff_matrix'), matrix_options)
+    if not include_place_types:
+        del state['place_types']
+
+    return _cacheable(jsonify({'game_state': state}), etag, REVALIDATE)
+
+
+HISTORY_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'npy': ('application/octet-stream', 'npy')
+}
+
+
+@game_bp.route('/round-history', methods=['GET'])
+def get_round_history():
+    # Streams the recorded rounds chunk by chunk; the game keeps playing meanwhile
+    session, error = _get_session()
+    if error:
+        return error
+
+    history_format = request.args.get('format', 'csv').lower()
+    if history_format not in HISTORY_FORMATS:
+        return jsonify({'status': 'error',
+                        'message': f"format must be one of {', '.join(HISTORY_FORMATS)}"}), 400
+    try:
+        chunk_size = int(request.args.get('chunk_size', 10000))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'chunk_size must be an integer'}), 400
+    if chunk_size < 1:
+        return jsonify({'status': 'error', 'message': 'chunk_size must be positive'}), 400
+
+    history = session.game.history
+    if history_format == 'npy':
+        # The .npy header states the length, so the bounded history is copied in one go
+        with session.lock:
+            body = iter_npy(history.read(history.start, history.stop), chunk_size)
+    else:
+        with session.lock:
+            start, stop = history.start, history.stop
+        chunks = history.chunks(chunk_size, session.lock, start, stop)
+        body = iter_csv(chunks) if history_format == 'csv' else iter_ndjson(chunks)
+
+    mimetype, extension = HISTORY_FORMATS[history_format]
+    response = Response(body, mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=round-history.{extension}'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+@game_bp.route('/payoff-matrix', methods=['GET'])
+def get_payoff_matrix():
+    # Rows row_start:row_stop and columns col_start:col_stop of the session's payoff matrix
+    # (the whole matrix by default), built from the structured payoffs without the dense n x n
+    session, error = _get_session()
+    if error:
+        return error
+    matrix_options, error = _get_matrix_options(default_format='npy')
+    if error:
+        return error
+
+    return _payoff_matrix_response(session.game.configuration, matrix_options, REVALIDATE)
+
+
+@game_bp.route('/configuration/<digest>/payoff-matrix', methods=['GET'])
+def get_configuration_payoff_matrix(digest):
+    # Same as /payoff-matrix for the configuration named in get-game-state's configuration_digest
+    configuration = configuration_store.get_by_digest(digest)
+    if configuration is None:
+        return jsonify({'status': 'error', 'message': 'Unknown configuration.'}), 404
+    matrix_options, error = _get_matrix_options(default_format='npy')
+    if error:
+        return error
+
+    return _payoff_matrix_response(configuration, matrix_options, IMMUTABLE)
+
+
+@game_bp.route('/configuration/<digest>/place-types', methods=['GET'])
+def get_configuration_place_types(digest):
+    configuration = configuration_store.get_by_digest(digest)
+    if configuration is None:
+        return jsonify({'status': 'error', 'message': 'Unknown configuration.'}), 404
+
+    etag = f'{digest}-place-types'
+    not_modified = _not_modified(etag, IMMUTABLE)
+    if not_modified:
+        return not_modified
+
+    return _cacheable(jsonify({
+        'status': 'success',
+        'grid_size': configuration.grid_size,
+        'grid_type': configuration.grid_type,
+        'use_proximity': configuration.use_proximity,
+        'place_types': list(configuration.place_type_names)
+    }), etag, IMMUTABLE)
+
+
+def _payoff_matrix_response(configuration, matrix_options, cache_control):
+    payoff_matrix = configuration.structured_payoff_matrix
+    rows, cols = payoff_matrix.shape
+    try:
+        row_start = int(request.args.get('row_start', 0))
+        row_stop = int(request.args.get('row_stop', rows))
+        col_start = int(request.args.get('col_start', 0))
+        col_stop = int(request.args.get('col_stop', cols))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Row and column bounds must be integers.'}), 400
+    if not (0 <= row_start <= row_stop <= rows and 0 <= col_start <= col_stop <= cols):
+        return jsonify({'status': 'error',
+                        'message': f'Bounds must satisfy 0 <= start <= stop <= {rows} (rows) / {cols} (columns).'}), 400
+
+    # The payoffs of a configuration never change, so its digest names every tile of it
+    etag = f'{configuration.digest}-{row_start}-{row_stop}-{col_start}-{col_stop}-{_options_tag(matrix_options)}'
+    not_modified = _not_modified(etag, cache_control)
+    if not_modified:
+        return not_modified
+
+    tile = payoff_matrix.block(row_start, row_stop, col_start, col_stop)
+    if matrix_options['format'] == 'npy':
+        response = Response(npy_bytes(tile, matrix_options), mimetype='application/octet-stream')
+        if matrix_options['compression']:
+            # HTTP "deflate" is the zlib format
+            response.headers['Content-Encoding'] = 'gzip' if matrix_options['compression'] == 'gzip' else 'deflate'
+        response.headers['X-Matrix-Offset'] = f'{row_start},{col_start}'
+        return _cacheable(response, etag, cache_control)
+
+    return _cacheable(jsonify({
+        'status': 'success',
+        'row_start': row_start,
+        'col_start': col_start,
+        'shape': list(tile.shape),
+        'payoff_matrix': encode_matrix(tile, matrix_options)
+    }), etag, cache_control)
+
+
+@game_bp.route('/close-session', methods=['POST'])
+def close_session():
+    session, error = _get_session()
+    if error:
+        return error
+
+    session_registry.remove(session.session_id)
+    return jsonify({'status': 'success'})
+
 
-    return jsonify({'game_state': state})
+@game_bp.route('/session-stats', methods=['GET'])
+def session_stats():
+    return jsonify({'status': 'success', 'sessions': session_registry.stats()})
 
 
 @game_bp.route('/run-simulation', methods=['POST'])
 def run_simulation():
+    matrix_options, error = _get_matrix_options()
+    if error:
+        return error
+
     data = request.json
     grid_size = data.get('grid_size', 4)
     grid_type = 'linear' if data.get('grid_type', 'linear') == 'linear' or data.get('grid_type',
                                                                                     'linear') == 'linear-approximation' else '2d'
     use_proximity = False if data.get('grid_type', 'linear') == 'linear' else True
-    num_rounds = data.get('num_rounds', 100)
+    mode = data.get('mode', 'rounds')
+    if mode not in ('rounds', 'vectorized', 'exact'):
+        return jsonify({'status': 'error', 'message': "mode must be 'rounds', 'vectorized' or 'exact'."}), 400
+    try:
+        num_rounds = _positive_int(data, 'num_rounds', 100)
+        confidence = _confidence(data)
+        seed = _seed(data)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
 
-    global simulation_game
     simulation_game = GameSimulation(grid_size, grid_type, use_proximity)
     simulation_game.setup_simulation()
-    simulation_game.run_simulation(num_rounds)
+
+    if mode == 'exact':
+        return _exact_simulation_response(simulation_game, num_rounds, confidence, matrix_options)
+
+    simulation_game.run_simulation(num_rounds, vectorized=mode == 'vectorized', rng=seed)
 
     state = simulation_game.game_facade.get_game_state()
     if state['human_role']:
         state['human_role'] = state['human_role'].value
     if state['computer_role']:
         state['computer_role'] = state['computer_role'].value
-    state['payoff_matrix'] = state['payoff_matrix'].tolist()
+    add_matrix(state, 'payoff_matrix', state.pop('payoff_matrix'), matrix_options)
 
     return jsonify({
         'status': 'success',
@@ -142,3 +488,208 @@ def run_simulation():
             'probabilities': simulation_game.game_facade.computer_strategy['probabilities'].tolist(),
         }
     })
+
+
+def _exact_simulation_response(simulation, num_rounds, confidence, matrix_options):
+    # Expected outcome instead of sampled rounds, no round is played on the facade
+    outcome = simulation.compute_exact_outcome(num_rounds, confidence)
+
+    state = simulation.game_facade.get_game_state()
+    if state['human_role']:
+        state['human_role'] = state['human_role'].value
+    if state['computer_role']:
+        state['computer_role'] = state['computer_role'].value
+    add_matrix(state, 'payoff_matrix', state.pop('payoff_matrix'), matrix_options)
+
+    return jsonify({
+        'status': 'success',
+        'mode': 'exact',
+        'simulation_rounds': num_rounds,
+        'human_score': outcome['expected_human_score'],
+        'computer_score': -outcome['expected_human_score'],
+        'human_wins': outcome['expected_human_wins'],
+        'computer_wins': num_rounds - outcome['expected_human_wins'],
+        'exact_outcome': outcome,
+        'game_state': state,
+        'computer_strategy': {
+            'probabilities': simulation.game_facade.computer_strategy['probabilities'].tolist(),
+        }
+    })
+
+
+def _positive_int(data, name, default, maximum=None):
+    value = data.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f'{name} must be a positive integer')
+    if maximum is not None and value > maximum:
+        raise ValueError(f'{name} must be at most {maximum}')
+    return value
+
+
+def _confidence(data):
+    # Outside (0, 1) the interval bounds are NaN or infinite, which JSON cannot carry
+    confidence = data.get('confidence', 0.95)
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) or not 0 < confidence < 1:
+        raise ValueError('confidence must be between 0 and 1')
+    return float(confidence)
+
+
+def _seed(data):
+    # Integers, or the decimal strings the simulation responses send seeds back as
+    seed = data.get('seed')
+    if seed is None:
+        return None
+    try:
+        seed = int(seed)
+    except (TypeError, ValueError):
+        raise ValueError('seed must be a non-negative integer')
+    if seed < 0:
+        raise ValueError('seed must be a non-negative integer')
+    return seed
+
+
+def _monte_carlo_parameters(data):
+    grid_size = data.get('grid_size', 4)
+    grid_type = 'linear' if data.get('grid_type', 'linear') == 'linear' or data.get('grid_type',
+                                                                                    'linear') == 'linear-approximation' else '2d'
+    use_proximity = False if data.get('grid_type', 'linear') == 'linear' else True
+    return grid_size, grid_type, use_proximity, _seed(data)
+
+
+def _monte_carlo_response(monte_carlo, result):
+    simulation = monte_carlo.simulation
+    game_grid = simulation.game_facade.game_grid
+    return {
+        'status': 'success',
+        'grid_size': simulation.grid_size,
+        'grid_type': simulation.grid_type,
+        'use_proximity': simulation.use_proximity,
+        'place_types': [game_grid.get_place_type(i).name for i in range(simulation.grid_size)],
+        # The entropy may exceed 64 bits, send it as a string to survive JSON number parsing
+        'seed': str(result.pop('seed')),
+        **result
+    }
+
+
+# Rounds a synchronous Monte Carlo request may play in total, over all replications
+MAX_MONTE_CARLO_ROUNDS = 10 ** 8
+
+
+@game_bp.route('/run-monte-carlo', methods=['POST'])
+def run_monte_carlo():
+    data = request.json
+
+    try:
+        grid_size, grid_type, use_proximity, seed = _monte_carlo_parameters(data)
+        # The request waits for the whole run; longer ones go to /simulation-jobs
+        num_rounds = _positive_int(data, 'num_rounds', 100000, maximum=MAX_MONTE_CARLO_ROUNDS)
+        # Every worker is a process, never more than there are CPUs
+        num_workers = _positive_int(data, 'num_workers', 1, maximum=os.cpu_count())
+        num_replications = data.get('num_replications')
+        if num_replications is not None:
+            num_replications = _positive_int(data, 'num_replications', None,
+                                             maximum=MAX_MONTE_CARLO_ROUNDS // num_rounds)
+        confidence = _confidence(data)
+
+        monte_carlo = MonteCarloSimulation(grid_size, grid_type, use_proximity, seed=seed, num_workers=num_workers)
+        result = monte_carlo.run(num_rounds, num_replications=num_replications, confidence=confidence)
+    except (TypeError, ValueError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    return jsonify(_monte_carlo_response(monte_carlo, result))
+
+
+# Rounds per progress update of a simulation job; a chunk's arrays are held in memory
+JOB_CHUNK_SIZE = 100000
+MAX_JOB_CHUNK_SIZE = JOB_CHUNK_SIZE * 10
+MAX_JOB_ROUNDS = 10 ** 10
+
+
+def _get_job(job_id):
+    job = simulation_jobs.get(job_id)
+    if job is None:
+        return None, (jsonify({'status': 'error', 'message': 'Unknown or expired simulation job.'}), 404)
+    return job, None
+
+
+@game_bp.route('/simulation-jobs', methods=['POST'])
+def submit_simulation_job():
+    data = request.get_json(silent=True) or {}
+
+    try:
+        grid_size, grid_type, use_proximity, seed = _monte_carlo_parameters(data)
+        num_rounds = _positive_int(data, 'num_rounds', 1000000, maximum=MAX_JOB_ROUNDS)
+        chunk_size = _positive_int(data, 'chunk_size', JOB_CHUNK_SIZE, maximum=MAX_JOB_CHUNK_SIZE)
+        confidence = _confidence(data)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    def simulation_factory():
+        # Runs on the worker thread, setting up the simulation solves the game
+        return MonteCarloSimulation(grid_size, grid_type, use_proximity, seed=seed, chunk_size=chunk_size)
+
+    try:
+        job = simulation_jobs.submit(simulation_factory, num_rounds, confidence, format_result=_monte_carlo_response)
+    except JobQueueFull as e:
+        response = jsonify({'status': 'error', 'message': str(e)})
+        response.headers['Retry-After'] = '1'
+        return response, 429
+
+    return jsonify({'status': 'success', **simulation_jobs.status(job)}), 202
+
+
+@game_bp.route('/simulation-jobs/<job_id>', methods=['GET'])
+def get_simulation_job(job_id):
+    job, error = _get_job(job_id)
+    if error:
+        return error
+    return jsonify({'status': 'success', 'job': simulation_jobs.status(job)})
+
+
+@game_bp.route('/simulation-jobs/<job_id>/events', methods=['GET'])
+def stream_simulation_job(job_id):
+    job, error = _get_job(job_id)
+    if error:
+        return error
+
+    def stream():
+        # Server-Sent Events: one progress event per update, a comment as keep-alive,
+        # and a final event named after the terminal status
+        for snapshot in simulation_jobs.events(job):
+            if snapshot is None:
+                yield ': keep-alive\n\n'
+                continue
+            event = 'progress' if snapshot['status'] in ('queued', 'running') else snapshot['status']
+            yield f"event: {event}\nid: {snapshot['rounds_done']}\ndata: {json.dumps(snapshot)}\n\n"
+
+    response = Response(stream(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Keeps reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@game_bp.route('/simulation-jobs/<job_id>/cancel', methods=['POST'])
+def cancel_simulation_job(job_id):
+    job = simulation_jobs.cancel(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': 'Unknown or expired simulation job.'}), 404
+    return jsonify({'status': 'success', 'job': simulation_jobs.status(job)})
+
+
+@game_bp.route('/simulation-jobs/<job_id>/result', methods=['GET'])
+def get_simulation_job_result(job_id):
+    job, error = _get_job(job_id)
+    if error:
+        return error
+
+    snapshot = simulation_jobs.status(job)
+    if job.result is None:
+        return jsonify({'status': 'error', 'message': f"Simulation job is {snapshot['status']}",
+                        'job': snapshot}), 409
+    return jsonify(job.result)
+
+
+@game_bp.route('/simulation-job-stats', methods=['GET'])
+def simulation_job_stats():
+    return jsonify({'status': 'success', 'jobs': simulation_jobs.stats()})
@@ -0,0 +1,69 @@
+import json
+
+from flask import request
+from flask_sock import Sock
+
+from src.controller.game_controller import game_bp
+from src.controller.session_registry import session_registry
+
+sock = Sock()
+
+
+def handle_message(session, message):
+    """
+    Plays the moves of one WebSocket message on the session's game and returns the reply.
+
+    Messages are compact JSON objects: {"m": 3} plays one round, {"m": [3, 0, 1]} a batch.
+    An optional "id" is echoed back so clients can match replies to requests. Replies
+    carry the round number "r", the computer position(s) "c", the winner(s) "w" (1 when
+    the seeker found the hider), the human score change(s) "d" and the human and
+    computer totals "hs" and "cs"; failures reply {"e": message}.
+    """
+    try:
+        message = json.loads(message)
+        moves = message["m"]
+    except (TypeError, ValueError, KeyError):
+        return {"e": 'Messages must be JSON objects like {"m": 3}.'}
+
+    reply = {"id": message["id"]} if "id" in message else {}
+    with session.lock:
+        game = session.game
+        if not game.is_game_running:
+            return {**reply, "e": "Game not running. Call /start-game first."}
+        try:
+            if isinstance(moves, list):
+                rounds = game.play_rounds(moves)
+                reply.update({
+                    "c": rounds["computer_positions"].tolist(),
+                    "w": rounds["seeker_wins"].astype(int).tolist(),
+                    "d": rounds["human_score_changes"].tolist()
+                })
+            else:
+                human_score = game.human_score
+                round_result = game.play_round(moves)
+                reply.update({
+                    "c": round_result["computer_position"],
+                    "w": int(round_result["winner"] == "seeker"),
+                    "d": round_result["human_score"] - human_score
+                })
+        except (TypeError, ValueError) as e:
+            return {**reply, "e": str(e)}
+        session.version += 1
+
+        reply.update({"r": game.round_number, "hs": game.human_score, "cs": game.computer_score})
+    return reply
+
+
+@sock.route('/ws', bp=game_bp)
+def game_socket(ws):
+    # One connection per session: ws://host/api/game/ws?session_id=...
+    session_id = request.args.get('session_id')
+    while True:
+        message = ws.receive()
+        # Looked up per message so the session stays alive and expiry is noticed
+        session = session_registry.get(session_id)
+        if session is None:
+            ws.send(json.dumps({"e": "Unknown or expired session. Call /initialize again."}))
+            ws.close()
+            return
+        ws.send(json.dumps(handle_message(session, message), separators=(",", ":")))
@@ -0,0 +1,82 @@
+import base64
+import gzip
+import io
+import zlib
+
+import numpy as np
+
+MATRIX_FORMATS = ('json', 'base64', 'npy')
+MATRIX_DTYPES = {'float64': '<f8', 'float32': '<f4'}
+COMPRESSIONS = (None, 'zlib', 'gzip')
+
+
+def _flag(value):
+    # JSON booleans in bodies, "true"/"false" strings in query strings
+    if isinstance(value, str):
+        return value.lower() not in ('false', '0', 'no')
+    return bool(value)
+
+
+def parse_matrix_options(data, default_format='json'):
+    """
+    Reads how the payoff matrix should be sent from a request body or query string.
+
+    matrix_format: 'json' (nested lists), 'base64' (little-endian bytes in the JSON) or
+    'npy' (raw .npy file, /payoff-matrix only); dtype: 'float64' or 'float32';
+    compression: 'zlib' or 'gzip' for the bytes; include_matrix=false leaves it out.
+    Raises ValueError on unknown values.
+    """
+    options = {
+        'include_matrix': _flag(data.get('include_matrix', True)),
+        'format': data.get('matrix_format', default_format),
+        'dtype': data.get('dtype', 'float64'),
+        'compression': data.get('compression') or None
+    }
+    # Non-string values (lists, numbers) are unknown values too, not server errors
+    if not isinstance(options['format'], str) or options['format'] not in MATRIX_FORMATS:
+        raise ValueError(f"matrix_format must be one of {', '.join(MATRIX_FORMATS)}")
+    if not isinstance(options['dtype'], str) or options['dtype'] not in MATRIX_DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(MATRIX_DTYPES)}")
+    if not isinstance(options['compression'], (str, type(None))) or options['compression'] not in COMPRESSIONS:
+        raise ValueError("compression must be 'zlib' or 'gzip'")
+    return options
+
+
+def compress(payload, compression):
+    if compression == 'zlib':
+        return zlib.compress(payload)
+    if compression == 'gzip':
+        return gzip.compress(payload)
+    return payload
+
+
+def npy_bytes(matrix, options):
+    buffer = io.BytesIO()
+    np.save(buffer, np.asarray(matrix, dtype=MATRIX_DTYPES[options['dtype']]))
+    return compress(buffer.getvalue(), options['compression'])
+
+
+def encode_matrix(matrix, options):
+    # JSON value of the matrix: nested lists, or a base64 envelope with what is needed to decode it
+    if options['format'] == 'json':
+        return np.asarray(matrix).tolist()
+    if options['format'] == 'npy':
+        raise ValueError("matrix_format 'npy' is only available from /payoff-matrix")
+
+    dtype = MATRIX_DTYPES[options['dtype']]
+    payload = compress(np.ascontiguousarray(matrix, dtype=dtype).tobytes(), options['compression'])
+    return {
+        'encoding': 'base64',
+        'dtype': dtype,
+        'shape': list(np.shape(matrix)),
+        'compression': options['compression'],
+        'data': base64.b64encode(payload).decode('ascii')
+    }
+
+
+def add_matrix(response, key, matrix, options):
+    # Sets response[key] unless the client asked to leave the matrix out. matrix may be a
+    # loader called only then, so an excluded matrix is never built
+    if options['include_matrix']:
+        response[key] = encode_matrix(matrix() if callable(matrix) else matrix, options)
+    return response
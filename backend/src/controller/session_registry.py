@@ -0,0 +1,114 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class GameSession:
+    __slots__ = ("session_id", "game", "lock", "last_access", "version")
+
+    def __init__(self, session_id, game, last_access):
+        self.session_id = session_id
+        self.game = game
+        # Serializes concurrent requests on the same game. Reentrant, so the ASGI front end
+        # can take it without blocking before running a view inline on the same thread
+        self.lock = threading.RLock()
+        self.last_access = last_access
+        # Bumped by every request that changes the game, names the state in ETags
+        self.version = 0
+
+
+class SessionRegistry:
+    """
+    Maps session ids to games with a capacity bound and an idle time-to-live.
+
+    Sessions are kept in least-recently-used order, so both the LRU victim and the
+    sessions that idled past the TTL sit at the front of the ordered dict and each
+    eviction is O(1).
+    """
+
+    def __init__(self, capacity=10000, ttl=3600, clock=time.monotonic):
+        self._validate(capacity, ttl)
+        self.capacity = capacity
+        self.ttl = ttl
+        self._clock = clock
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evicted = 0
+        self.expired = 0
+
+    @staticmethod
+    def _validate(capacity, ttl):
+        if capacity < 1:
+            raise ValueError("Session capacity must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Session TTL must be positive (or None to disable expiry)")
+
+    def configure(self, capacity=None, ttl=None):
+        capacity = self.capacity if capacity is None else capacity
+        ttl = self.ttl if ttl is None else ttl
+        self._validate(capacity, ttl)
+        with self._lock:
+            self.capacity = capacity
+            self.ttl = ttl
+            self._expire(self._clock())
+            self._evict_over_capacity()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def create(self, game):
+        now = self._clock()
+        session = GameSession(uuid.uuid4().hex, game, now)
+        with self._lock:
+            self._expire(now)
+            self._sessions[session.session_id] = session
+            self.created += 1
+            self._evict_over_capacity()
+        return session
+
+    def get(self, session_id):
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def remove(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self):
+        with self._lock:
+            self._expire(self._clock())
+            return {
+                "live": len(self._sessions),
+                "capacity": self.capacity,
+                "ttl": self.ttl,
+                "created": self.created,
+                "evicted": self.evicted,
+                "expired": self.expired
+            }
+
+    def _expire(self, now):
+        if self.ttl is None:
+            return
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_access < self.ttl:
+                break
+            self._sessions.popitem(last=False)
+            self.expired += 1
+
+    def _evict_over_capacity(self):
+        while len(self._sessions) > self.capacity:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+
+session_registry = SessionRegistry()
@@ -0,0 +1,230 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from src.game.montecarlo import _empty_aggregate, _merge_aggregates
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+CANCELLED = 'cancelled'
+FAILED = 'failed'
+FINISHED_STATUSES = (COMPLETED, CANCELLED, FAILED)
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class SimulationJob:
+    __slots__ = ("job_id", "num_rounds", "confidence", "status", "aggregate", "result", "error",
+                 "cancel_event", "future", "version", "created", "started", "finished")
+
+    def __init__(self, job_id, num_rounds, confidence, created):
+        self.job_id = job_id
+        self.num_rounds = num_rounds
+        self.confidence = confidence
+        self.status = QUEUED
+        # Merged aggregate of the chunks played so far
+        self.aggregate = _empty_aggregate()
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.future = None
+        # Bumped on every progress update, lets event streams wait for the next one
+        self.version = 0
+        self.created = created
+        self.started = None
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.status in FINISHED_STATUSES
+
+    def snapshot(self, now):
+        aggregate = self.aggregate
+        count = aggregate["count"]
+        end = self.finished if self.finished is not None else now
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'num_rounds': self.num_rounds,
+            'rounds_done': count,
+            'progress': count / self.num_rounds if self.num_rounds else 1.0,
+            # Running estimates over the rounds played so far
+            'score_mean': aggregate["mean"],
+            'human_score': aggregate["total"],
+            'win_rate': aggregate["human_wins"] / count if count else 0.0,
+            'elapsed': end - self.started if self.started is not None else 0.0,
+            'error': self.error
+        }
+
+
+class SimulationJobQueue:
+    """
+    Runs Monte Carlo simulations in the background on a bounded thread pool.
+
+    At most max_workers jobs run at once and at most max_queued more wait for a
+    worker; submitting beyond that raises JobQueueFull, so clients back off instead
+    of piling up work. Jobs play their rounds in chunks, publishing the merged
+    aggregate after each one and checking for cancellation in between. Finished jobs
+    are kept for their results until max_finished newer ones have finished.
+    """
+
+    def __init__(self, max_workers=2, max_queued=16, max_finished=256, clock=time.monotonic):
+        self._validate(max_workers, max_queued, max_finished)
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self._clock = clock
+        self._jobs = OrderedDict()
+        self._executor = None
+        self._lock = threading.Lock()
+        self._updated = threading.Condition(self._lock)
+        self.submitted = 0
+        self.rejected = 0
+
+    @staticmethod
+    def _validate(max_workers, max_queued, max_finished):
+        if max_workers < 1:
+            raise ValueError("Job workers must be at least 1")
+        if max_queued < 0:
+            raise ValueError("Job queue depth must be non-negative")
+        if max_finished < 0:
+            raise ValueError("Finished job retention must be non-negative")
+
+    def configure(self, max_workers=None, max_queued=None, max_finished=None):
+        max_workers = self.max_workers if max_workers is None else max_workers
+        max_queued = self.max_queued if max_queued is None else max_queued
+        max_finished = self.max_finished if max_finished is None else max_finished
+        self._validate(max_workers, max_queued, max_finished)
+        with self._lock:
+            if max_workers != self.max_workers and self._executor is not None:
+                # Jobs already handed to the old pool still run there
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self.max_workers = max_workers
+            self.max_queued = max_queued
+            self.max_finished = max_finished
+
+    def _active(self):
+        return sum(1 for job in self._jobs.values() if not job.done)
+
+    def submit(self, simulation_factory, num_rounds, confidence=0.95, format_result=None):
+        # simulation_factory builds the MonteCarloSimulation on the worker thread, since
+        # setting up the game solves it. format_result(simulation, result) turns the summary
+        # into the stored result when the job completes; the simulation is dropped after that
+        with self._lock:
+            if self._active() >= self.max_workers + self.max_queued:
+                self.rejected += 1
+                raise JobQueueFull(f"{self.max_workers + self.max_queued} simulation jobs are already pending")
+            job = SimulationJob(uuid.uuid4().hex, num_rounds, confidence, self._clock())
+            self._jobs[job.job_id] = job
+            self.submitted += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='simulation-job')
+            job.future = self._executor.submit(self._run, job, simulation_factory, format_result)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job):
+        with self._lock:
+            return job.snapshot(self._clock())
+
+    def cancel(self, job_id):
+        # Queued jobs are dropped at once, running ones stop after their current chunk
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if not job.done:
+                job.cancel_event.set()
+                if job.future.cancel():
+                    self._finish(job, CANCELLED)
+            return job
+
+    def events(self, job, heartbeat=15.0):
+        # Yields a status snapshot after every update until the job finishes, and None
+        # when heartbeat seconds pass without one
+        seen = None
+        while True:
+            with self._updated:
+                if job.version == seen:
+                    self._updated.wait_for(lambda: job.version != seen, timeout=heartbeat)
+                if job.version == seen:
+                    snapshot = None
+                else:
+                    seen = job.version
+                    snapshot = job.snapshot(self._clock())
+            yield snapshot
+            if snapshot is not None and snapshot['status'] in FINISHED_STATUSES:
+                return
+
+    def stats(self):
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            return {
+                'max_workers': self.max_workers,
+                'max_queued': self.max_queued,
+                'queued': statuses.count(QUEUED),
+                'running': statuses.count(RUNNING),
+                'finished': sum(1 for status in statuses if status in FINISHED_STATUSES),
+                'submitted': self.submitted,
+                'rejected': self.rejected
+            }
+
+    def _publish(self, job):
+        # Caller holds the lock
+        job.version += 1
+        self._updated.notify_all()
+
+    def _finish(self, job, status):
+        # Caller holds the lock
+        job.status = status
+        job.finished = self._clock()
+        self._publish(job)
+        self._evict_finished()
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(len(finished) - self.max_finished, 0)]:
+            del self._jobs[job_id]
+
+    def _run(self, job, simulation_factory, format_result):
+        with self._lock:
+            if job.cancel_event.is_set():
+                self._finish(job, CANCELLED)
+                return
+            job.status = RUNNING
+            job.started = self._clock()
+            self._publish(job)
+
+        try:
+            simulation = simulation_factory()
+            for chunk in simulation.stream_chunks(job.num_rounds):
+                with self._lock:
+                    job.aggregate = _merge_aggregates(job.aggregate, chunk)
+                    self._publish(job)
+                if job.cancel_event.is_set():
+                    break
+            if job.cancel_event.is_set():
+                status = CANCELLED
+            else:
+                result = simulation.summarize(job.aggregate, job.confidence)
+                job.result = format_result(simulation, result) if format_result is not None else result
+                status = COMPLETED
+        except Exception as e:
+            job.error = str(e)
+            status = FAILED
+
+        with self._lock:
+            self._finish(job, status)
+
+
+simulation_jobs = SimulationJobQueue()
@@ -0,0 +1,48 @@
+import numpy as np
+
+
+class AliasSampler:
+    """
+    Draws positions from a fixed mixed strategy with Walker's alias method (Vose's build).
+
+    Building the tables is O(n) and done once per strategy; every draw then takes one
+    uniform index and one coin flip, O(1) whatever the grid size. The tables are
+    read-only and can be shared between threads, each caller passing its own RNG.
+    """
+
+    def __init__(self, probabilities):
+        # LP solutions can carry tiny negative entries or sum to 1 +- eps
+        probabilities = np.maximum(np.asarray(probabilities, dtype=float), 0)
+        total = probabilities.sum()
+        if probabilities.ndim != 1 or total <= 0:
+            raise ValueError("Probabilities must be a non-empty vector with a positive sum")
+
+        size = probabilities.shape[0]
+        scaled = probabilities * (size / total)
+        threshold = np.ones(size)
+        alias = np.arange(size)
+
+        small = [i for i in range(size) if scaled[i] < 1]
+        large = [i for i in range(size) if scaled[i] >= 1]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            threshold[low] = scaled[low]
+            alias[low] = high
+            # The large entry pays for the missing mass of the small one
+            scaled[high] -= 1 - scaled[low]
+            (small if scaled[high] < 1 else large).append(high)
+        # Whatever is left is 1 up to rounding and keeps its own column
+
+        threshold.setflags(write=False)
+        alias.setflags(write=False)
+        self.size = size
+        self.threshold = threshold
+        self.alias = alias
+
+    def sample(self, rng):
+        column = int(rng.integers(self.size))
+        return column if rng.random() < self.threshold[column] else int(self.alias[column])
+
+    def sample_many(self, num_samples, rng):
+        columns = rng.integers(self.size, size=num_samples)
+        return np.where(rng.random(num_samples) < self.threshold[columns], columns, self.alias[columns])
@@ -0,0 +1,165 @@
+import hashlib
+import threading
+import weakref
+
+from src.game.alias_sampler import AliasSampler
+from src.game.gamelogic.gamegrid.abstract_gamegrid import random_place_types
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.linearprogramming.equilibrium_cache import cached_solve_game
+from src.linearprogramming.equilibrium_table import equilibrium_table
+
+
+class GameConfiguration:
+    """
+    Immutable grid configuration shared by every game played on it (flyweight).
+
+    Holds the grid, its structured payoff matrix and, once solved, the equilibrium,
+    so games only keep their own counters and a reference to this object. The dense
+    payoff matrix is only built, read-only, when someone asks for it.
+    """
+
+    __slots__ = ("grid_size", "grid_type", "use_proximity", "place_types", "place_type_names", "digest", "game_grid",
+                 "structured_payoff_matrix", "_payoff_matrix", "_equilibrium", "_initial_strategies", "_samplers",
+                 "_lock", "__weakref__")
+
+    def __init__(self, grid_size, grid_type="linear", use_proximity=False, place_types=None, game_grid=None,
+                 structured_payoff_matrix=None, initial_strategies=None):
+        self.grid_size = grid_size
+        self.grid_type = grid_type
+        self.use_proximity = use_proximity
+
+        # An edited configuration passes its grid and payoffs in, already updated
+        if game_grid is None:
+            game_grid = create_game_grid(grid_size, grid_type, use_proximity, place_types)
+        self.game_grid = game_grid
+        self.place_types = tuple(self.game_grid.place_types)
+        self.place_type_names = tuple(place_type.name for place_type in self.place_types)
+        # Stable across processes, names the immutable parts as cacheable resources
+        self.digest = configuration_digest(self.key)
+        if structured_payoff_matrix is None:
+            structured_payoff_matrix = self.game_grid.get_structured_payoff_matrix()
+        self.structured_payoff_matrix = structured_payoff_matrix
+
+        self._payoff_matrix = None
+        self._equilibrium = None
+        # Previous equilibrium, reused by the first solve if still optimal (and seeding the
+        # iterative engine otherwise); dropped once the equilibrium is known
+        self._initial_strategies = initial_strategies
+        self._samplers = {}
+        self._lock = threading.Lock()
+
+    @property
+    def key(self):
+        return configuration_key(self.grid_type, self.use_proximity, self.place_types)
+
+    @property
+    def payoff_matrix(self):
+        if self._payoff_matrix is None:
+            payoff_matrix = self.structured_payoff_matrix.toarray()
+            payoff_matrix.setflags(write=False)
+            self._payoff_matrix = payoff_matrix
+        return self._payoff_matrix
+
+    @property
+    def equilibrium(self):
+        # Solved on first use, once per configuration however many games share it.
+        # Small boards are read from the precomputed table instead
+        if self._equilibrium is None:
+            with self._lock:
+                if self._equilibrium is None:
+                    self._equilibrium = equilibrium_table.lookup(self.grid_type, self.use_proximity, self.place_types)
+                if self._equilibrium is None:
+                    self._equilibrium = cached_solve_game(
+                        self.structured_payoff_matrix, self.grid_type, self.use_proximity, self.place_types,
+                        initial_strategies=self._initial_strategies
+                    )
+                    self._initial_strategies = None
+        return self._equilibrium
+
+    def edited(self, changes):
+        # New configuration with the {position: PlaceType} changes. Only the payoff rows of
+        # the changed places are rebuilt, and the first solve reuses this equilibrium if it is
+        # still optimal
+        game_grid = self.game_grid.with_place_types(changes)
+        structured_payoff_matrix = game_grid.update_structured_payoff_matrix(self.structured_payoff_matrix,
+                                                                             list(changes))
+        initial_strategies = None
+        if self._equilibrium is not None:
+            initial_strategies = (self._equilibrium["hider_probabilities"], self._equilibrium["seeker_probabilities"])
+        return GameConfiguration(self.grid_size, self.grid_type, self.use_proximity, game_grid=game_grid,
+                                 structured_payoff_matrix=structured_payoff_matrix,
+                                 initial_strategies=initial_strategies)
+
+    def sampler(self, role):
+        # Alias tables of the "hider" or "seeker" equilibrium mix, built on first use
+        sampler = self._samplers.get(role)
+        if sampler is None:
+            probabilities = self.equilibrium[f"{role}_probabilities"]
+            with self._lock:
+                sampler = self._samplers.setdefault(role, AliasSampler(probabilities))
+        return sampler
+
+    def __getstate__(self):
+        # Locks cannot be pickled, e.g. when a simulation is shipped to a worker process
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot not in ("_lock", "__weakref__")}
+
+    def __setstate__(self, state):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+        self._lock = threading.Lock()
+
+
+def configuration_key(grid_type, use_proximity, place_types):
+    # The proximity flag stays in the key even for 2D grids: the facade scores rounds with it
+    return grid_type.lower(), bool(use_proximity), tuple(place_types)
+
+
+def configuration_digest(key):
+    grid_type, use_proximity, place_types = key
+    text = f"{grid_type}|{int(use_proximity)}|{','.join(place_type.name for place_type in place_types)}"
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+class ConfigurationStore:
+    """Interns configurations so equal grids share one GameConfiguration while any game uses it."""
+
+    def __init__(self):
+        self._configurations = weakref.WeakValueDictionary()
+        self._by_digest = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._configurations)
+
+    def intern(self, grid_size, grid_type="linear", use_proximity=False, place_types=None):
+        # Place types are drawn before building anything, so a repeated random grid costs nothing
+        if place_types is None:
+            place_types = random_place_types(grid_size)
+        key = configuration_key(grid_type, use_proximity, place_types)
+
+        with self._lock:
+            configuration = self._configurations.get(key)
+        if configuration is not None:
+            return configuration
+
+        # Built outside the lock; if another thread won the race its configuration is kept
+        return self._register(GameConfiguration(grid_size, grid_type, use_proximity, place_types))
+
+    def edit(self, configuration, changes):
+        # Interned configuration with the edited places. Deriving it only costs the changed
+        # rows, so it is simply dropped when an equal configuration is already interned
+        return self._register(configuration.edited(changes))
+
+    def get_by_digest(self, digest):
+        # Live configuration with the given digest, None once no game uses it
+        with self._lock:
+            return self._by_digest.get(digest)
+
+    def _register(self, configuration):
+        with self._lock:
+            configuration = self._configurations.setdefault(configuration.key, configuration)
+            self._by_digest.setdefault(configuration.digest, configuration)
+            return configuration
+
+
+configuration_store = ConfigurationStore()
@@ -1,7 +1,13 @@
 from enum import Enum
-import random
-from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
-from src.linearprogramming.lp_gamesolver import solve_payoff_matrix
+
+import numpy as np
+
+from src.game.game_configuration import configuration_store
+from src.game.round_history import MAX_CAPACITY, RoundHistory
+
+
+# Upper bound on the rounds of one play_rounds call, shared by every transport
+MAX_BATCH_ROUNDS = 100000
 
 
 class PlayerRole(Enum):
@@ -9,13 +15,19 @@ class PlayerRole(Enum):
     SEEKER = "seeker"
 
 class GameFacade:
-    def __init__(self, grid_size=4, grid_type="linear", use_proximity=False):
-        self.grid_size = grid_size
-        self.grid_type = grid_type
-        self.use_proximity = use_proximity
+    # A game only owns its counters; the grid, payoff matrix and equilibrium live in a
+    # GameConfiguration shared by all games on the same grid
+    __slots__ = ("configuration", "human_role", "computer_role", "human_score", "computer_score", "round_number",
+                 "human_wins", "computer_wins", "is_game_running", "_rng", "history")
 
-        self.game_grid = create_game_grid(grid_size, grid_type, use_proximity)
-        self.payoff_matrix = self.game_grid.get_payoff_matrix()
+    def __init__(self, grid_size=4, grid_type="linear", use_proximity=False, place_types=None, rng=None,
+                 history_capacity=MAX_CAPACITY):
+        self.configuration = configuration_store.intern(grid_size, grid_type, use_proximity, place_types)
+        # Seed or Generator for the computer's moves, turned into a Generator on first use
+        self._rng = rng
+        # Rounds of the current game: the last history_capacity ones, all of them with None.
+        # Neither allocates anything before the first round, so idle sessions stay small
+        self.history = RoundHistory(history_capacity)
 
         self.human_role = None
         self.computer_role = None
@@ -24,9 +36,57 @@ class GameFacade:
         self.round_number = 0
         self.human_wins = 0
         self.computer_wins = 0
-        self.computer_strategy = None
         self.is_game_running = False
 
+    @property
+    def rng(self):
+        if not isinstance(self._rng, np.random.Generator):
+            self._rng = np.random.default_rng(self._rng)
+        return self._rng
+
+    @rng.setter
+    def rng(self, rng):
+        self._rng = rng
+
+    @property
+    def grid_size(self):
+        return self.configuration.grid_size
+
+    @property
+    def grid_type(self):
+        return self.configuration.grid_type
+
+    @property
+    def use_proximity(self):
+        return self.configuration.use_proximity
+
+    @property
+    def game_grid(self):
+        return self.configuration.game_grid
+
+    @property
+    def payoff_matrix(self):
+        return self.configuration.payoff_matrix
+
+    @property
+    def equilibrium(self):
+        return self.configuration.equilibrium
+
+    def payoff_matrix_loader(self):
+        # The dense matrix costs O(n^2), so returned states carry a loader of the current
+        # configuration's matrix that callers only invoke when they send it
+        configuration = self.configuration
+        return lambda: configuration.payoff_matrix
+
+    @property
+    def computer_strategy(self):
+        if self.computer_role is None:
+            return None
+        return {
+            "probabilities": self.equilibrium[f"{self.computer_role.value}_probabilities"],
+            "expected_value": self.equilibrium["expected_value"]
+        }
+
     def start_new_game(self, human_role):
         self.is_game_running = True
         self.human_role = human_role
@@ -36,37 +96,36 @@ class GameFacade:
         self.computer_score = 0
         self.human_wins = 0
         self.computer_wins = 0
+        self.history.clear()
 
         self._calculate_computer_strategy()
         return {
             "human_role": self.human_role,
             "computer_role": self.computer_role,
-            "payoff_matrix": self.payoff_matrix,
+            "payoff_matrix": self.payoff_matrix_loader(),
             "computer_strategy": self.computer_strategy
         }
 
     def _calculate_computer_strategy(self):
-        probabilities, expected_value = solve_payoff_matrix(self.payoff_matrix, player=self.computer_role.name)
-        self.computer_strategy = {
-            "probabilities": probabilities,
-            "expected_value": expected_value
-        }
+        # One solve per configuration yields both mixes, so the opponent's side is available for free.
+        # The computer's alias table is built here too, so moves only draw from it
+        equilibrium = self.configuration.equilibrium
+        self.configuration.sampler(self.computer_role.value)
+        return equilibrium
 
     def get_computer_move(self):
-        positions = list(range(self.grid_size))
-        position = random.choices(
-            positions,
-            weights=self.computer_strategy["probabilities"],
-        )[0]
-
-        return position
+        return self.configuration.sampler(self.computer_role.value).sample(self.rng)
 
     def play_round(self, human_position):
         if not self.is_game_running:
             raise ValueError("Game is not running. Call start_new_game() first.")
 
+        # Same check as play_rounds: integers only, so 1.5 or True are not taken for places
+        if isinstance(human_position, (bool, np.bool_)) or not isinstance(human_position, (int, np.integer)):
+            raise ValueError("Position must be an integer")
         if not (0 <= human_position < self.grid_size):
             raise ValueError(f"Invalid position: {human_position} is out of range [0, {self.grid_size - 1}]")
+        human_position = int(human_position)
 
         computer_position = self.get_computer_move()
 
@@ -76,6 +135,8 @@ class GameFacade:
         round_result = self._evaluate_round(hider_position, seeker_position)
 
         self.round_number += 1
+        self.history.append(self.round_number, human_position, computer_position, round_result["winner"] == "seeker",
+                            round_result["human_score_change"])
         return {
             "human_position": human_position,
             "computer_position": computer_position,
@@ -89,6 +150,40 @@ class GameFacade:
             "round_number": self.round_number
         }
 
+    def play_rounds(self, human_positions):
+        # Batch version of play_round: validates every position up front, draws all computer
+        # moves at once and leaves the same state as playing the rounds one by one
+        if not self.is_game_running:
+            raise ValueError("Game is not running. Call start_new_game() first.")
+
+        human_positions = np.asarray(human_positions)
+        if human_positions.ndim != 1 or len(human_positions) == 0:
+            raise ValueError("Positions must be a non-empty list")
+        if len(human_positions) > MAX_BATCH_ROUNDS:
+            raise ValueError(f"At most {MAX_BATCH_ROUNDS} rounds per batch")
+        if not np.issubdtype(human_positions.dtype, np.integer):
+            raise ValueError("Positions must be integers")
+        invalid = np.flatnonzero((human_positions < 0) | (human_positions >= self.grid_size))
+        if len(invalid):
+            raise ValueError(f"Invalid position: {human_positions[invalid[0]]} at index {invalid[0]} is out of range "
+                             f"[0, {self.grid_size - 1}]")
+
+        computer_positions = self.configuration.sampler(self.computer_role.value).sample_many(len(human_positions),
+                                                                                              self.rng)
+        rounds = self._apply_rounds(human_positions, computer_positions)
+        self.history.extend(np.arange(self.round_number - len(human_positions) + 1, self.round_number + 1),
+                            human_positions, computer_positions, rounds["seeker_wins"], rounds["human_score_changes"])
+        return {
+            "computer_positions": computer_positions,
+            "seeker_wins": rounds["seeker_wins"],
+            "human_score_changes": rounds["human_score_changes"],
+            "human_score": self.human_score,
+            "computer_score": self.computer_score,
+            "human_wins": self.human_wins,
+            "computer_wins": self.computer_wins,
+            "round_number": self.round_number
+        }
+
     def _evaluate_round(self, hider_position, seeker_position):
         score = self.game_grid.get_place_score(seeker_position, "seeker") 
         winner = ("seeker" if hider_position == seeker_position else "hider")
@@ -118,9 +213,69 @@ class GameFacade:
             "computer_score_change": computer_score_change
         }
 
+    def _evaluate_rounds(self, hider_positions, seeker_positions):
+        # Vector version of _evaluate_round: returns the seeker-win mask and the
+        # human score change of every round without touching the game state
+        scores = self.game_grid.get_place_scores("seeker")[seeker_positions]
+        seeker_wins = hider_positions == seeker_positions
+
+        if self.use_proximity:
+            distances = self.game_grid._calculate_distance(hider_positions, seeker_positions)
+            multipliers = self.game_grid._apply_proximity_multipliers(distances)
+            scores = np.where(seeker_wins, scores, scores * multipliers)
+
+        human_round_wins = seeker_wins if self.human_role == PlayerRole.SEEKER else ~seeker_wins
+        human_score_changes = np.where(human_round_wins, scores, -scores)
+        return seeker_wins, human_score_changes
+
+    def _apply_rounds(self, human_positions, computer_positions):
+        # Plays a batch of rounds with known positions and leaves the facade in the
+        # same state as calling play_round once per round would
+        human_positions = np.asarray(human_positions)
+        computer_positions = np.asarray(computer_positions)
+        if self.human_role == PlayerRole.HIDER:
+            hider_positions, seeker_positions = human_positions, computer_positions
+        else:
+            hider_positions, seeker_positions = computer_positions, human_positions
+
+        seeker_wins, human_score_changes = self._evaluate_rounds(hider_positions, seeker_positions)
+
+        # Scores are multiples of 1/8, so the array sum is exact; keep the int/float
+        # type play_round would produce (only proximity hider wins turn it into a float)
+        human_score_change = human_score_changes.sum()
+        if self.use_proximity and not seeker_wins.all():
+            human_score_change = float(human_score_change)
+        else:
+            human_score_change = int(human_score_change)
+
+        human_round_wins = int(np.count_nonzero(seeker_wins if self.human_role == PlayerRole.SEEKER else ~seeker_wins))
+        self.human_score += human_score_change
+        self.computer_score -= human_score_change
+        self.human_wins += human_round_wins
+        self.computer_wins += len(seeker_wins) - human_round_wins
+        self.round_number += len(seeker_wins)
+
+        return {
+            "hider_positions": hider_positions,
+            "seeker_positions": seeker_positions,
+            "seeker_wins": seeker_wins,
+            "human_score_changes": human_score_changes
+        }
+
+    def edit_places(self, changes):
+        # Changes the place type of some cells, {position: PlaceType}. The game keeps its
+        # counters; the computer plays the edited configuration's equilibrium from now on
+        self.configuration = configuration_store.edit(self.configuration, changes)
+        if self.computer_role is not None:
+            self._calculate_computer_strategy()
+        return {
+            "payoff_matrix": self.payoff_matrix_loader(),
+            "place_types": list(self.configuration.place_type_names),
+            "computer_strategy": self.computer_strategy
+        }
+
     def reset_game(self):
-        self.game_grid = create_game_grid(self.grid_size, self.grid_type, self.use_proximity)
-        self.payoff_matrix = self.game_grid.get_payoff_matrix()
+        self.configuration = configuration_store.intern(self.grid_size, self.grid_type, self.use_proximity)
 
         self.human_role = None
         self.computer_role = None
@@ -129,11 +284,11 @@ class GameFacade:
         self.round_number = 0
         self.human_wins = 0
         self.computer_wins = 0
-        self.computer_strategy = None
         self.is_game_running = False
+        self.history.clear()
 
         return {
-            "payoff_matrix": self.payoff_matrix
+            "payoff_matrix": self.payoff_matrix_loader()
         }
 
     def get_game_state(self):
@@ -146,9 +301,10 @@ class GameFacade:
             "round_number": self.round_number,
             "human_wins": self.human_wins,
             "computer_wins": self.computer_wins,
-            "payoff_matrix": self.payoff_matrix,
+            "payoff_matrix": self.payoff_matrix_loader(),
             "grid_size": self.grid_size,
             "grid_type": self.grid_type,
             "use_proximity": self.use_proximity,
-            "place_types": [self.game_grid.get_place_type(i).name for i in range(self.grid_size)],
+            "place_types": list(self.configuration.place_type_names),
+            "configuration_digest": self.configuration.digest
         }
\ No newline at end of file
@@ -1,10 +1,19 @@
 from abc import ABC, abstractmethod
 import random
 import numpy as np
+from src.linearprogramming.structured_payoff_matrix import StructuredPayoffMatrix
 from .place_type import PlaceType
 
+
+def random_place_types(size):
+    return [random.choice(list(PlaceType)) for _ in range(size)]
+
+
 class AbstractGameGrid(ABC):
-    def __init__(self, size):
+    # Hider payoff multiplier indexed by the distance to the seeker, 1.0 beyond the table
+    PROXIMITY_MULTIPLIERS = np.array([1.0, 0.5, 0.75])
+
+    def __init__(self, size, place_types=None):
         self.size = size
         self.place_types = []
         self.base_scores = {
@@ -12,11 +21,38 @@ class AbstractGameGrid(ABC):
             PlaceType.NEUTRAL: (2, 2),  # Neutral: Both get 1 point when winning
             PlaceType.HARD: (3, 1)  # Hard: if seeker wins gets 3 points, if hider wins gets 1 point
         }
-        self._generate_place_types()
-        self.base_payoff_matrix = self._generate_base_payoff_matrix()
+        if place_types is None:
+            self._generate_place_types()
+        else:
+            if len(place_types) != size:
+                raise ValueError(f"Expected {size} place types, got {len(place_types)}")
+            self.place_types = list(place_types)
+        self._base_payoff_matrix = None
+
+    @property
+    def base_payoff_matrix(self):
+        # Dense n x n, built on first use so large grids can stay structured
+        if self._base_payoff_matrix is None:
+            self._base_payoff_matrix = self._generate_base_payoff_matrix()
+        return self._base_payoff_matrix
+
+    @base_payoff_matrix.setter
+    def base_payoff_matrix(self, payoff_matrix):
+        self._base_payoff_matrix = payoff_matrix
+
+    def with_place_types(self, changes):
+        # Copy of this grid with the {position: PlaceType} changes applied
+        place_types = list(self.place_types)
+        for position, place_type in changes.items():
+            if not 0 <= position < self.size:
+                raise ValueError(f"Invalid position: {position} is out of range [0, {self.size - 1}]")
+            if not isinstance(place_type, PlaceType):
+                raise ValueError(f"Invalid place type: {place_type}")
+            place_types[position] = place_type
+        return type(self)(self.size, place_types)
 
     def _generate_place_types(self):
-        self.place_types = [random.choice(list(PlaceType)) for _ in range(self.size)]
+        self.place_types = random_place_types(self.size)
 
     def get_place_type(self, position):
         if 0 <= position < self.size:
@@ -28,28 +64,56 @@ class AbstractGameGrid(ABC):
             return self.base_scores[self.get_place_type(position)][0]
         return self.base_scores[self.get_place_type(position)][1]
 
+    def get_place_scores(self, winner="hider"):
+        # Vector version of get_place_score over all positions
+        index = 0 if winner == "seeker" else 1
+        return np.array([self.base_scores[place_type][index] for place_type in self.place_types], dtype=float)
+
     def _generate_base_payoff_matrix(self):
-        payoff_matrix = np.zeros((self.size, self.size))
-        for hider_pos in range(self.size):
-            for seeker_pos in range(self.size):
-                if hider_pos == seeker_pos:
-                    payoff_matrix[hider_pos][seeker_pos] = -self.base_scores[self.get_place_type(seeker_pos)][0]
-                else:
-                    payoff_matrix[hider_pos][seeker_pos] = self.base_scores[self.get_place_type(hider_pos)][1]
+        # Hider row i earns its hider score everywhere except on the diagonal,
+        # where the seeker finds it and the hider loses the seeker score
+        payoff_matrix = np.repeat(self.get_place_scores("hider")[:, np.newaxis], self.size, axis=1)
+        np.fill_diagonal(payoff_matrix, -self.get_place_scores("seeker"))
 
         return payoff_matrix
 
     def _apply_proximity_multiplier(self, distance):
-        multiplier = 1.0
-        if distance == 1:
-            multiplier = 0.5
-        elif distance == 2:
-            multiplier = 0.75
-        return multiplier
+        if 0 <= distance < len(self.PROXIMITY_MULTIPLIERS):
+            return float(self.PROXIMITY_MULTIPLIERS[distance])
+        return 1.0
+
+    def _apply_proximity_multipliers(self, distances):
+        table = self.PROXIMITY_MULTIPLIERS
+        lookup = table[np.minimum(distances, len(table) - 1)]
+        return np.where(distances < len(table), lookup, 1.0)
+
+    def _generate_structured_base_payoff_matrix(self):
+        # Row-constant hider scores, the diagonal corrected down to -seeker score
+        hider_scores = self.get_place_scores("hider")
+        positions = np.arange(self.size)
+        return StructuredPayoffMatrix.from_entries(
+            hider_scores, positions, positions, -self.get_place_scores("seeker") - hider_scores
+        )
+
+    def _structured_base_rows(self, positions):
+        # Correction entries of the given hider rows without proximity: the diagonal only
+        hider_scores = np.array([self.get_place_score(position, "hider") for position in positions], dtype=float)
+        seeker_scores = np.array([self.get_place_score(position, "seeker") for position in positions], dtype=float)
+        return hider_scores, positions, positions, -seeker_scores - hider_scores
+
+    def update_structured_payoff_matrix(self, payoff_matrix, positions):
+        # A hider payoff only depends on the hider's own place, so after changing the
+        # places at positions only those rows differ from the previous payoff_matrix
+        positions = np.unique(np.asarray(positions, dtype=int))
+        return payoff_matrix.replace_rows(positions, *self._structured_rows(positions))
 
     def get_payoff_matrix(self):
         return self._generate_payoff_matrix()
 
+    def get_structured_payoff_matrix(self):
+        # Same payoffs as get_payoff_matrix in O(n) memory
+        return self._generate_structured_payoff_matrix()
+
     @abstractmethod
     def _calculate_distance(self, pos1, pos2):
         pass
@@ -58,6 +122,15 @@ class AbstractGameGrid(ABC):
     def _generate_payoff_matrix(self):
         pass
 
+    @abstractmethod
+    def _generate_structured_payoff_matrix(self):
+        pass
+
+    @abstractmethod
+    def _structured_rows(self, positions):
+        # (row constants, rows, cols, values) of the structured payoff rows at positions
+        pass
+
     @abstractmethod
     def print_game_grid(self):
         pass
\ No newline at end of file
@@ -3,14 +3,14 @@ from src.game.gamelogic.gamegrid.lineargrid.linear_approximate_gamegrid import L
 from src.game.gamelogic.gamegrid.lineargrid.linear_gamegrid import LinearGameGrid
 
 
-def create_game_grid(size, grid_type="linear", use_proximity=False):
+def create_game_grid(size, grid_type="linear", use_proximity=False, place_types=None):
     if grid_type.lower() == "linear":
         if use_proximity:
-            return LinearProximityGameGrid(size)
+            return LinearProximityGameGrid(size, place_types)
         else:
-            return LinearGameGrid(size)
+            return LinearGameGrid(size, place_types)
     elif grid_type.lower() == "2d":
-            return GameGrid2d(size)
+            return GameGrid2d(size, place_types)
     else:
         print(f"Received grid type: {grid_type}")
         raise ValueError("Invalid grid type. Must be 'linear' or '2d'.")
\ No newline at end of file
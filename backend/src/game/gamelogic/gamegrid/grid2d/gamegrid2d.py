@@ -1,18 +1,20 @@
 import math
 
-from src.game.gamelogic.gamegrid.abstract_gamegrid import AbstractGameGrid
+import numpy as np
+
 from src.game.gamelogic.gamegrid.place_type import PlaceType
+from src.game.gamelogic.gamegrid.proximity_gamegrid import ProximityGameGrid
 
 
-class GameGrid2d(AbstractGameGrid):
-    def __init__(self, size):
+class GameGrid2d(ProximityGameGrid):
+    def __init__(self, size, place_types=None):
         # Validate size for 2D grid
         self.size = size
-        rows, cols = self._calculate_grid_dimensions()
-        if rows * cols < size:
+        self.rows, self.cols = self._calculate_grid_dimensions()
+        if self.rows * self.cols < size:
             raise ValueError(f"invalid 2D square grid size, size must be a perfect square and greater than or equal to 9")
 
-        super().__init__(size)
+        super().__init__(size, place_types)
 
     def _calculate_grid_dimensions(self):
         grid_size = int(math.sqrt(self.size))
@@ -24,35 +26,38 @@ class GameGrid2d(AbstractGameGrid):
         return grid_size, grid_size
 
     def _get_2d_coordinates(self, position):
-        cols = self._calculate_grid_dimensions()[1]
-        row = position // cols
-        col = position % cols
+        # Works on scalars and on position arrays alike
+        row = position // self.cols
+        col = position % self.cols
         return row, col
 
     def _get_1d_position(self, row, col):
-        cols = self._calculate_grid_dimensions()[1]
-        return row * cols + col
+        return row * self.cols + col
 
     def _calculate_distance(self, pos1, pos2):
+        # Chebyshev distance, works on position arrays as well
         row1, col1 = self._get_2d_coordinates(pos1)
         row2, col2 = self._get_2d_coordinates(pos2)
-        return max(abs(row1 - row2), abs(col1 - col2))
-
-    def _generate_payoff_matrix(self):
-        base_matrix = self._generate_base_payoff_matrix()
-        proximity_matrix = base_matrix.copy()
-
-        for hider_pos in range(self.size):
-            for seeker_pos in range(self.size):
-                if hider_pos != seeker_pos:
-                    distance = self._calculate_distance(hider_pos, seeker_pos)
-                    multiplier = self._apply_proximity_multiplier(distance)
-                    proximity_matrix[hider_pos][seeker_pos] *= multiplier
-
-        return proximity_matrix
+        return np.maximum(np.abs(row1 - row2), np.abs(col1 - col2))
+
+    def _neighbour_pairs(self, max_distance):
+        # Every (row, col) offset within the Chebyshev radius that stays on the board
+        rows, cols = self._get_2d_coordinates(np.arange(self.size))
+        pos1, pos2, distances = [], [], []
+        for row_offset in range(-max_distance, max_distance + 1):
+            for col_offset in range(-max_distance, max_distance + 1):
+                if row_offset == 0 and col_offset == 0:
+                    continue
+                neighbour = self._get_1d_position(rows + row_offset, cols + col_offset)
+                valid = ((0 <= rows + row_offset) & (rows + row_offset < self.rows) & (0 <= cols + col_offset)
+                         & (cols + col_offset < self.cols) & (neighbour < self.size))
+                pos1.append(np.flatnonzero(valid))
+                pos2.append(neighbour[valid])
+                distances.append(np.full(np.count_nonzero(valid), max(abs(row_offset), abs(col_offset))))
+        return np.concatenate(pos1), np.concatenate(pos2), np.concatenate(distances)
 
     def print_game_grid(self):
-        rows, cols = self._calculate_grid_dimensions()
+        rows, cols = self.rows, self.cols
         result = "2D Game Grid (With Proximity):\n"
         for row in range(rows):
             line = ""
@@ -1,25 +1,22 @@
-from src.game.gamelogic.gamegrid.abstract_gamegrid import AbstractGameGrid
+import numpy as np
+
 from src.game.gamelogic.gamegrid.lineargrid.linear_gamegrid import LinearGameGrid
 from src.game.gamelogic.gamegrid.place_type import PlaceType
+from src.game.gamelogic.gamegrid.proximity_gamegrid import ProximityGameGrid
 
 
-class LinearProximityGameGrid(AbstractGameGrid):
+class LinearProximityGameGrid(ProximityGameGrid):
     def _calculate_distance(self, pos1, pos2):
-        return abs(pos1 - pos2)
-
-    def _generate_payoff_matrix(self):
-
-        base_matrix = self._generate_base_payoff_matrix()
-        proximity_matrix = base_matrix.copy()
-
-        for hider_pos in range(self.size):
-            for seeker_pos in range(self.size):
-                if hider_pos != seeker_pos:
-                    distance = self._calculate_distance(hider_pos, seeker_pos)
-                    multiplier = self._apply_proximity_multiplier(distance)
-                    proximity_matrix[hider_pos][seeker_pos] *= multiplier
-
-        return proximity_matrix
+        return np.abs(pos1 - pos2)
+
+    def _neighbour_pairs(self, max_distance):
+        pos1, pos2, distances = [], [], []
+        for distance in range(1, max_distance + 1):
+            left = np.arange(self.size - distance)
+            pos1 += [left, left + distance]
+            pos2 += [left + distance, left]
+            distances += [np.full(2 * len(left), distance)]
+        return np.concatenate(pos1), np.concatenate(pos2), np.concatenate(distances)
 
     def print_game_grid(self):
         result = "1D Game Grid (With Proximity):\n"
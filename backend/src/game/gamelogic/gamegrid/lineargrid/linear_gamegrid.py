@@ -1,14 +1,22 @@
+import numpy as np
+
 from src.game.gamelogic.gamegrid.abstract_gamegrid import AbstractGameGrid
 from src.game.gamelogic.gamegrid.place_type import PlaceType
 
 
 class LinearGameGrid(AbstractGameGrid):
     def _calculate_distance(self, pos1, pos2):
-        return abs(pos1 - pos2)
+        return np.abs(pos1 - pos2)
 
     def _generate_payoff_matrix(self):
         return self._generate_base_payoff_matrix()
 
+    def _generate_structured_payoff_matrix(self):
+        return self._generate_structured_base_payoff_matrix()
+
+    def _structured_rows(self, positions):
+        return self._structured_base_rows(positions)
+
     def print_game_grid(self):
         result = "1D Game Grid (No Proximity):\n"
         for i in range(self.size):
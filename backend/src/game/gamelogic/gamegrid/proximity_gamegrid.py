@@ -0,0 +1,62 @@
+from abc import abstractmethod
+
+import numpy as np
+
+from src.game.gamelogic.gamegrid.abstract_gamegrid import AbstractGameGrid
+from src.linearprogramming.structured_payoff_matrix import StructuredPayoffMatrix
+
+
+class ProximityGameGrid(AbstractGameGrid):
+    # Grid whose hider payoff shrinks with the PROXIMITY_MULTIPLIERS near the seeker.
+    # Subclasses give the distance and list the close pairs, the payoffs are built here
+
+    @abstractmethod
+    def _neighbour_pairs(self, max_distance):
+        # (pos1, pos2, distance) arrays of all pairs with 0 < distance <= max_distance
+        pass
+
+    def _distance_matrix(self):
+        # _calculate_distance is written with array operations, so broadcasting
+        # a column of positions against a row gives every pairwise distance
+        positions = np.arange(self.size)
+        return self._calculate_distance(positions[:, np.newaxis], positions[np.newaxis, :])
+
+    def _generate_proximity_payoff_matrix(self):
+        # The diagonal has distance 0 and therefore multiplier 1.0, so it stays untouched
+        payoff_matrix = self._generate_base_payoff_matrix()
+        payoff_matrix *= self._apply_proximity_multipliers(self._distance_matrix())
+        return payoff_matrix
+
+    def _generate_structured_proximity_payoff_matrix(self):
+        # Only pairs closer than the end of the multiplier table differ from the row constant
+        hider_scores = self.get_place_scores("hider")
+        positions = np.arange(self.size)
+        hider_positions, seeker_positions, distances = self._neighbour_pairs(len(self.PROXIMITY_MULTIPLIERS) - 1)
+        band = hider_scores[hider_positions] * (self._apply_proximity_multipliers(distances) - 1)
+
+        return StructuredPayoffMatrix.from_entries(
+            hider_scores,
+            np.concatenate([positions, hider_positions]),
+            np.concatenate([positions, seeker_positions]),
+            np.concatenate([-self.get_place_scores("seeker") - hider_scores, band])
+        )
+
+    def _structured_proximity_rows(self, positions):
+        # Same as _structured_base_rows plus the band of each row, found by measuring the
+        # distance from the given rows to every column (O(k n) for k rows)
+        hider_scores, rows, cols, values = self._structured_base_rows(positions)
+        max_distance = len(self.PROXIMITY_MULTIPLIERS) - 1
+        distances = self._calculate_distance(positions[:, np.newaxis], np.arange(self.size)[np.newaxis, :])
+        row_index, seeker_positions = np.nonzero((distances > 0) & (distances <= max_distance))
+        band = hider_scores[row_index] * (self._apply_proximity_multipliers(distances[row_index, seeker_positions]) - 1)
+        return (hider_scores, np.concatenate([rows, positions[row_index]]), np.concatenate([cols, seeker_positions]),
+                np.concatenate([values, band]))
+
+    def _generate_payoff_matrix(self):
+        return self._generate_proximity_payoff_matrix()
+
+    def _generate_structured_payoff_matrix(self):
+        return self._generate_structured_proximity_payoff_matrix()
+
+    def _structured_rows(self, positions):
+        return self._structured_proximity_rows(positions)
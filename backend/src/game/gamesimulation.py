@@ -1,25 +1,108 @@
-import random
+import numpy as np
+from scipy.stats import binom, norm
 
 from src.game.gamefacade import GameFacade, PlayerRole
-from src.linearprogramming.lp_gamesolver import solve_payoff_matrix
+
+
+def _normalized(probabilities):
+    # LP solutions can carry tiny negative entries or sum to 1 +- eps, which Generator.choice rejects
+    probabilities = np.maximum(np.asarray(probabilities, dtype=float), 0)
+    return probabilities / probabilities.sum()
 
 
 class GameSimulation:
-    def __init__(self, grid_size=4, grid_type="linear", use_proximity=False):
+    def __init__(self, grid_size=4, grid_type="linear", use_proximity=False, place_types=None):
         self.grid_size = grid_size
         self.grid_type = grid_type
         self.use_proximity = use_proximity
-        self.game_facade = GameFacade(grid_size, grid_type, use_proximity)
+        # Simulated rounds are aggregated, not recorded
+        self.game_facade = GameFacade(grid_size, grid_type, use_proximity, place_types, history_capacity=0)
         self.seeker_strategy = None
 
-    def setup_simulation(self):
-        self.game_facade.reset_game()
+    def setup_simulation(self, new_grid=True):
+        if new_grid:
+            self.game_facade.reset_game()
         self.game_facade.start_new_game(PlayerRole.SEEKER)
-        self.seeker_strategy = solve_payoff_matrix(self.game_facade.payoff_matrix, player="hider")[0]
+        self.seeker_strategy = self.game_facade.equilibrium["seeker_probabilities"]
 
-    def run_simulation(self, num_rounds=100):
+    def run_simulation(self, num_rounds=100, vectorized=False, rng=None):
         self.setup_simulation()
 
+        if vectorized:
+            self.simulate_rounds(num_rounds, rng)
+            return
+
+        # The computer draws its moves from the same stream as the simulated seeker
+        rng = self.game_facade.rng = np.random.default_rng(rng)
+        seeker_sampler = self.game_facade.configuration.sampler("seeker")
         for i in range(num_rounds):
-            seeker_position = random.choices(list(range(self.grid_size)), self.seeker_strategy)[0]
-            self.game_facade.play_round(seeker_position)
+            self.game_facade.play_round(seeker_sampler.sample(rng))
+
+    def draw_rounds(self, num_rounds, rng):
+        # Seeker (human) and hider (computer) positions of num_rounds equilibrium rounds
+        configuration = self.game_facade.configuration
+        seeker_positions = configuration.sampler("seeker").sample_many(num_rounds, rng)
+        hider_positions = configuration.sampler("hider").sample_many(num_rounds, rng)
+        return seeker_positions, hider_positions
+
+    def simulate_rounds(self, num_rounds, rng=None, chunk_size=1_000_000):
+        # Plays num_rounds on the current setup with all positions drawn up front,
+        # chunked so millions of rounds never hold more than chunk_size positions.
+        # A chunk draws its seeker moves before its hider moves, so a seed reproduces the
+        # rounds for one chunk size only; other chunk sizes give the same distribution
+        rng = np.random.default_rng(rng)
+
+        remaining = num_rounds
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            self.game_facade._apply_rounds(*self.draw_rounds(size, rng))
+            remaining -= size
+
+    def compute_exact_outcome(self, num_rounds=100, confidence=0.95):
+        # Closed-form outcome of num_rounds independent equilibrium rounds, scored the way
+        # _evaluate_round scores them; the cost does not depend on num_rounds.
+        # With x the hider (computer) mix and y the seeker (human) mix, the human
+        # gains s_j when both pick j and loses s_j * m(i, j) when the hider is at i != j.
+        game_grid = self.game_facade.game_grid
+        hider_strategy = _normalized(self.game_facade.computer_strategy["probabilities"])
+        seeker_strategy = _normalized(self.seeker_strategy)
+        seeker_scores = game_grid.get_place_scores("seeker")
+
+        # escaped[j] = sum over i != j of x_i * m(i, j), only the proximity band has m != 1
+        escaped = escaped_squared = 1 - hider_strategy
+        if self.use_proximity:
+            hider_positions, seeker_positions, distances = game_grid._neighbour_pairs(
+                len(game_grid.PROXIMITY_MULTIPLIERS) - 1
+            )
+            multipliers = game_grid._apply_proximity_multipliers(distances)
+            weights = hider_strategy[hider_positions]
+            escaped = escaped + np.bincount(seeker_positions, weights * (multipliers - 1), minlength=self.grid_size)
+            escaped_squared = escaped_squared + np.bincount(seeker_positions, weights * (multipliers ** 2 - 1),
+                                                            minlength=self.grid_size)
+
+        found = hider_strategy * seeker_strategy
+        round_mean = float(seeker_strategy @ (seeker_scores * (hider_strategy - escaped)))
+        round_second_moment = float(seeker_strategy @ (seeker_scores ** 2 * (hider_strategy + escaped_squared)))
+        round_variance = max(round_second_moment - round_mean ** 2, 0.0)
+
+        # Human (seeker) wins are Binomial(num_rounds, P(same place))
+        win_probability = float(found.sum())
+        z = float(norm.ppf((1 + confidence) / 2))
+        score_mean = num_rounds * round_mean
+        score_std = float(np.sqrt(num_rounds * round_variance))
+        wins_low, wins_high = binom.interval(confidence, num_rounds, win_probability)
+
+        return {
+            "num_rounds": num_rounds,
+            "confidence": confidence,
+            "round_score_mean": round_mean,
+            "round_score_variance": round_variance,
+            "expected_human_score": score_mean,
+            "human_score_variance": num_rounds * round_variance,
+            "human_score_interval": [score_mean - z * score_std, score_mean + z * score_std],
+            "win_probability": win_probability,
+            "expected_human_wins": num_rounds * win_probability,
+            "human_wins_variance": num_rounds * win_probability * (1 - win_probability),
+            "human_wins_interval": [int(wins_low), int(wins_high)],
+            "win_distribution": {"type": "binomial", "trials": num_rounds, "probability": win_probability}
+        }
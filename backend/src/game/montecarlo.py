@@ -0,0 +1,220 @@
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from scipy.stats import norm
+
+from src.game.gamelogic.gamegrid.place_type import PlaceType
+from src.game.gamesimulation import GameSimulation
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor():
+    # One pool of at most cpu_count processes serves every run in this process, however many
+    # requests run at once. Workers are spawned: forking a multi-threaded server would copy
+    # locks other threads hold
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def _discard_executor(executor):
+    # A pool whose worker died is unusable, the next run starts a new one
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def _empty_aggregate():
+    return {"count": 0, "total": 0.0, "mean": 0.0, "m2": 0.0, "human_wins": 0}
+
+
+def _merge_aggregates(first, second):
+    # Chan et al. pairwise update of count, mean and sum of squared deviations
+    count = first["count"] + second["count"]
+    if count == 0:
+        return _empty_aggregate()
+    delta = second["mean"] - first["mean"]
+    return {
+        "count": count,
+        "total": first["total"] + second["total"],
+        "mean": first["mean"] + delta * second["count"] / count,
+        "m2": first["m2"] + second["m2"] + delta ** 2 * first["count"] * second["count"] / count,
+        "human_wins": first["human_wins"] + second["human_wins"]
+    }
+
+
+def _stream_chunks(simulation, num_rounds, seed_sequence, chunk_size):
+    # Yields the aggregate of every chunk of num_rounds rounds drawn from one RNG stream
+    rng = np.random.default_rng(seed_sequence)
+    facade = simulation.game_facade
+
+    remaining = num_rounds
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        seeker_positions, hider_positions = simulation.draw_rounds(size, rng)
+        seeker_wins, human_score_changes = facade._evaluate_rounds(hider_positions, seeker_positions)
+
+        mean = float(human_score_changes.mean())
+        yield {
+            "count": size,
+            "total": float(human_score_changes.sum()),
+            "mean": mean,
+            "m2": float(((human_score_changes - mean) ** 2).sum()),
+            "human_wins": int(np.count_nonzero(seeker_wins))
+        }
+        remaining -= size
+
+
+def _simulate_stream(simulation, num_rounds, seed_sequence, chunk_size):
+    # Aggregates the human (seeker) score changes of num_rounds rounds drawn from one RNG stream
+    aggregate = _empty_aggregate()
+    for chunk in _stream_chunks(simulation, num_rounds, seed_sequence, chunk_size):
+        aggregate = _merge_aggregates(aggregate, chunk)
+    return aggregate
+
+
+def _simulate_streams(simulation, rounds_per_stream, seed_sequences, chunk_size):
+    return [_simulate_stream(simulation, num_rounds, seed_sequence, chunk_size)
+            for num_rounds, seed_sequence in zip(rounds_per_stream, seed_sequences)]
+
+
+def _split(total, parts):
+    # Sizes of near-equal parts of total, larger ones first (like np.array_split)
+    quotient, remainder = divmod(total, parts)
+    return [quotient + 1] * remainder + [quotient] * (parts - remainder)
+
+
+def _normal_interval(center, standard_error, z):
+    return [center - z * standard_error, center + z * standard_error]
+
+
+def _wilson_interval(successes, trials, z):
+    if trials == 0:
+        return [0.0, 1.0]
+    rate = successes / trials
+    denominator = 1 + z ** 2 / trials
+    center = (rate + z ** 2 / (2 * trials)) / denominator
+    half_width = z * math.sqrt(rate * (1 - rate) / trials + z ** 2 / (4 * trials ** 2)) / denominator
+    return [center - half_width, center + half_width]
+
+
+class MonteCarloSimulation:
+    """
+    Parallel Monte Carlo estimate of equilibrium play built on GameSimulation.
+
+    One user seed drives everything: the first spawned child of SeedSequence(seed) draws
+    the place types of the grid, the following children seed the RNG stream of every
+    worker (or of every replication). Aggregates are merged in stream order, so a
+    seed and worker count always reproduce the same bits. Workers are blocks of streams
+    submitted to a process pool shared by all runs, so concurrent runs queue for the
+    CPUs instead of each starting its own processes.
+    """
+
+    def __init__(self, grid_size=4, grid_type="linear", use_proximity=False, seed=None, num_workers=1,
+                 chunk_size=1_000_000):
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+
+        # A random seed is drawn when none is given and reported back in the results
+        self.seed = np.random.SeedSequence(seed).entropy
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+
+        grid_rng = np.random.default_rng(self._child_seed(0))
+        place_types = [list(PlaceType)[i] for i in grid_rng.integers(0, len(PlaceType), size=grid_size)]
+        self.simulation = GameSimulation(grid_size, grid_type, use_proximity, place_types)
+        self.simulation.setup_simulation(new_grid=False)
+
+    def _child_seed(self, index):
+        # Same as the index-th child of SeedSequence(seed).spawn()
+        return np.random.SeedSequence(self.seed, spawn_key=(index,))
+
+    def _run_streams(self, rounds_per_stream):
+        seed_sequences = [self._child_seed(i + 1) for i in range(len(rounds_per_stream))]
+        if self.num_workers == 1:
+            return _simulate_streams(self.simulation, rounds_per_stream, seed_sequences, self.chunk_size)
+
+        # Contiguous blocks of streams per worker, flattened back in stream order
+        bounds = np.cumsum([0] + _split(len(rounds_per_stream), self.num_workers))
+        blocks = [range(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+        executor = _shared_executor()
+        try:
+            results = list(executor.map(
+                _simulate_streams,
+                [self.simulation] * len(blocks),
+                [[rounds_per_stream[i] for i in block] for block in blocks],
+                [[seed_sequences[i] for i in block] for block in blocks],
+                [self.chunk_size] * len(blocks)
+            ))
+        except BrokenProcessPool:
+            _discard_executor(executor)
+            raise
+        return [aggregate for block_results in results for aggregate in block_results]
+
+    def run(self, num_rounds, num_replications=None, confidence=0.95):
+        # Without replications num_rounds is split across one stream per worker;
+        # with them every replication plays num_rounds rounds on its own stream
+        if num_replications is None:
+            rounds_per_stream = _split(num_rounds, self.num_workers)
+        else:
+            rounds_per_stream = [num_rounds] * num_replications
+
+        aggregates = self._run_streams(rounds_per_stream)
+
+        total = _empty_aggregate()
+        for aggregate in aggregates:
+            total = _merge_aggregates(total, aggregate)
+
+        result = self.summarize(total, confidence)
+        if num_replications is not None:
+            z = float(norm.ppf((1 + confidence) / 2))
+            totals = np.array([aggregate["total"] for aggregate in aggregates])
+            total_variance = float(totals.var(ddof=1)) if num_replications > 1 else 0.0
+            result["num_replications"] = num_replications
+            result["replication_score_mean"] = float(totals.mean())
+            result["replication_score_variance"] = total_variance
+            result["replication_score_interval"] = _normal_interval(
+                float(totals.mean()), math.sqrt(total_variance / num_replications), z
+            )
+
+        return result
+
+    def stream_chunks(self, num_rounds):
+        # Chunk aggregates of the single-stream run(num_rounds) with one worker, in order,
+        # for callers that report progress or stop early
+        return _stream_chunks(self.simulation, num_rounds, self._child_seed(1), self.chunk_size)
+
+    def summarize(self, total, confidence=0.95):
+        # Result dict of run() for a merged aggregate
+        z = float(norm.ppf((1 + confidence) / 2))
+        count = total["count"]
+        variance = total["m2"] / (count - 1) if count > 1 else 0.0
+        standard_error = math.sqrt(variance / count) if count else 0.0
+
+        return {
+            "seed": self.seed,
+            "num_workers": self.num_workers,
+            "num_rounds": count,
+            "confidence": confidence,
+            "score_mean": total["mean"],
+            "score_variance": variance,
+            "score_mean_interval": _normal_interval(total["mean"], standard_error, z),
+            "human_score": total["total"],
+            "human_wins": total["human_wins"],
+            "computer_wins": count - total["human_wins"],
+            "win_rate": total["human_wins"] / count if count else 0.0,
+            "win_rate_interval": _wilson_interval(total["human_wins"], count, z)
+        }
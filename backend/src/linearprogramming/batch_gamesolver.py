@@ -0,0 +1,50 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from src.linearprogramming.lp_gamesolver import solve_game
+
+
+def _solve_one(payoff_matrix, method, tolerance, dominance):
+    # Failures are reported per item so one bad matrix does not abort the batch
+    try:
+        result = solve_game(payoff_matrix, method=method, tolerance=tolerance, dominance=dominance)
+    except Exception as e:
+        return {'error': f"{type(e).__name__}: {e}"}
+
+    result.pop('solution', None)
+    result['error'] = None
+    return result
+
+
+def _solve_chunk(payoff_matrices, method, tolerance, dominance):
+    return [_solve_one(payoff_matrix, method, tolerance, dominance) for payoff_matrix in payoff_matrices]
+
+
+def solve_payoff_matrices(payoff_matrices, method="lp", tolerance=1e-4, max_workers=None, chunksize=None,
+                          dominance=None):
+    # payoff_matrices is a sequence of 2-D matrices or a stacked 3-D array.
+    # Returns one solve_game result per matrix, in input order, each with an
+    # 'error' entry that is None on success and the failure message otherwise.
+    payoff_matrices = list(payoff_matrices)
+    if not payoff_matrices:
+        return []
+
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, len(payoff_matrices))
+    if chunksize is None:
+        # A few chunks per worker balances load without paying per-item IPC
+        chunksize = max(1, math.ceil(len(payoff_matrices) / (max_workers * 4)))
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    chunks = [payoff_matrices[i:i + chunksize] for i in range(0, len(payoff_matrices), chunksize)]
+
+    if max_workers == 1:
+        results = [_solve_chunk(chunk, method, tolerance, dominance) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_solve_chunk, chunks, [method] * len(chunks), [tolerance] * len(chunks),
+                                        [dominance] * len(chunks)))
+
+    return [result for chunk_results in results for result in chunk_results]
@@ -0,0 +1,153 @@
+import os
+import threading
+
+import numpy as np
+
+
+class DiskEquilibriumCache:
+    """
+    Persistent equilibria, one .npy file per cache key.
+
+    A file holds the hider mix, the seeker mix, the value and the duality gap of an
+    in-memory cache entry in one vector; both players choose among the same n places,
+    so it has 2n + 2 values. Entries are keyed like the in-memory cache, by the digest
+    of the configuration and its payoffs (see make_cache_key). Files are written to a
+    temporary name and renamed, so concurrent workers never read a partial entry.
+    Hits refresh the file's modification time; once the directory exceeds max_bytes
+    the least recently used files are removed. The cache is disabled until a directory
+    is configured.
+    """
+
+    def __init__(self, directory=None, max_bytes=256 * 1024 * 1024):
+        self.directory = None
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size = None
+        self._lock = threading.Lock()
+        self.configure(directory, max_bytes)
+
+    @property
+    def enabled(self):
+        return self.directory is not None
+
+    def configure(self, directory=None, max_bytes=None):
+        if max_bytes is not None:
+            if max_bytes < 0:
+                raise ValueError("Cache size must be non-negative")
+            self.max_bytes = max_bytes
+        with self._lock:
+            self.directory = directory
+            self._size = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, digest):
+        return os.path.join(self.directory, f"{digest}.npy")
+
+    def _entries(self):
+        # (mtime, size, path) of every entry, oldest first
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue  # evicted by another worker meanwhile
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def get(self, digest):
+        if not self.enabled:
+            return None
+        path = self._path(digest)
+        try:
+            stored = _read_entry(path)
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            # Missing, or evicted and truncated by another worker
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return _to_entry(stored)
+
+    def put(self, digest, entry):
+        if not self.enabled:
+            return
+        stored = np.concatenate([
+            entry["hider_probabilities"], entry["seeker_probabilities"],
+            [entry["expected_value"], entry["duality_gap"]]
+        ]).astype(float)
+        path = self._path(digest)
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as file:
+            np.save(file, stored)
+        os.replace(temporary_path, path)
+
+        with self._lock:
+            if self._size is not None:
+                self._size += os.path.getsize(path)
+            self._evict()
+
+    def _evict(self):
+        # Caller holds the lock. The running size is only an estimate across processes,
+        # so the directory is rescanned before removing anything
+        if self._size is not None and self._size <= self.max_bytes:
+            return
+        entries = self._entries()
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= size
+
+    def warm_up(self, cache, max_entries=1000):
+        # Loads the most recently used entries into the in-memory cache, so the first
+        # requests after a restart do not touch the disk. Returns the number loaded
+        if not self.enabled:
+            return 0
+        loaded = 0
+        # Oldest first, so the most recent entries end up most recently used
+        for _, _, path in self._entries()[-max_entries:] if max_entries > 0 else []:
+            try:
+                stored = _read_entry(path)
+            except (FileNotFoundError, ValueError):
+                continue
+            cache.put(os.path.basename(path)[:-len(".npy")], _to_entry(stored))
+            loaded += 1
+        return loaded
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+def _read_entry(path):
+    # Entries are a few kilobytes, read whole rather than mapped
+    return np.load(path)
+
+
+def _to_entry(stored):
+    stored.setflags(write=False)
+    size = (len(stored) - 2) // 2
+    return {
+        "hider_probabilities": stored[:size],
+        "seeker_probabilities": stored[size:2 * size],
+        "expected_value": float(stored[2 * size]),
+        "duality_gap": float(stored[2 * size + 1])
+    }
+
+
+disk_equilibrium_cache = DiskEquilibriumCache()
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+def _dominated_rows(payoff_matrix, weak, tolerance, block_elements):
+    # Rows beaten by another row for a player who maximizes the row payoff.
+    # The pairwise differences are built for a block of candidate rows at a time
+    # to keep the (block, n, m) temporary bounded.
+    n, m = payoff_matrix.shape
+    dominated = np.zeros(n, dtype=bool)
+    block = max(1, block_elements // max(1, n * m))
+    for start in range(0, n, block):
+        # difference[i, k, j] = A[k, j] - A[i, j]
+        difference = payoff_matrix[np.newaxis, :, :] - payoff_matrix[start:start + block, np.newaxis, :]
+        if weak:
+            dominates = np.all(difference >= -tolerance, axis=2) & np.any(difference > tolerance, axis=2)
+        else:
+            dominates = np.all(difference > tolerance, axis=2)
+        dominated[start:start + block] = np.any(dominates, axis=1)
+    return dominated
+
+
+def eliminate_dominated_strategies(payoff_matrix, weak=False, tolerance=1e-12, block_elements=4_000_000):
+    """
+    Iterated elimination of dominated hider rows and seeker columns.
+
+    The hider maximizes, so a row is removed when another row pays more against every
+    remaining seeker column; the seeker minimizes, so a column is removed when another
+    column pays less against every remaining hider row. Passes alternate until nothing
+    changes. Strict elimination keeps every equilibrium, weak elimination keeps the value
+    and at least one equilibrium. Returns the indices of the surviving rows and columns.
+    """
+    payoff_matrix = np.asarray(payoff_matrix, dtype=float)
+    hider_indices = np.arange(payoff_matrix.shape[0])
+    seeker_indices = np.arange(payoff_matrix.shape[1])
+
+    while True:
+        reduced = payoff_matrix[np.ix_(hider_indices, seeker_indices)]
+        hider_dominated = _dominated_rows(reduced, weak, tolerance, block_elements)
+        hider_indices = hider_indices[~hider_dominated]
+
+        reduced = reduced[~hider_dominated]
+        seeker_dominated = _dominated_rows(-reduced.T, weak, tolerance, block_elements)
+        seeker_indices = seeker_indices[~seeker_dominated]
+
+        # Row dominance only depends on the columns, so without a removed column
+        # another hider pass cannot find anything new
+        if not seeker_dominated.any():
+            return hider_indices, seeker_indices
+
+
+def expand_probabilities(probabilities, indices, size):
+    # Maps a mix over the surviving strategies back to all positions, zero elsewhere
+    expanded = np.zeros(size)
+    expanded[indices] = probabilities
+    return expanded
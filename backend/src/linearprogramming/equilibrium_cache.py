@@ -0,0 +1,176 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src.linearprogramming.disk_cache import disk_equilibrium_cache
+from src.linearprogramming.lp_gamesolver import solve_game
+from src.linearprogramming.structured_payoff_matrix import StructuredPayoffMatrix
+
+
+class EquilibriumCache:
+    """Bounded LRU cache of solved equilibria with hit/miss counters."""
+
+    def __init__(self, max_size=256):
+        if max_size < 0:
+            raise ValueError("Cache size must be non-negative")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def resize(self, max_size):
+        if max_size < 0:
+            raise ValueError("Cache size must be non-negative")
+        with self._lock:
+            self.max_size = max_size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def _evict(self):
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+equilibrium_cache = EquilibriumCache()
+
+
+def make_cache_key(payoff_matrix, grid_type, use_proximity, place_types, method="lp", tolerance=1e-4):
+    # Returns the cache key and the permutation from grid positions to key slots.
+    # Without proximity the linear payoff of a slot depends only on its own place
+    # type, so permuting the places permutes the solution: sorting the place types
+    # lets every permutation of one multiset share a single entry. The key is a digest
+    # of that configuration and of its payoffs in key order, which also names its file
+    # in the disk cache: entries persisted before a change of the scoring are not served
+    # for the new one. Iterative results are only as exact as their tolerance, which is
+    # part of their key
+    grid_type = grid_type.lower()
+    # 2D grids always apply proximity, whatever flag they were created with
+    use_proximity = True if grid_type == "2d" else bool(use_proximity)
+    names = [place_type.name for place_type in place_types]
+
+    if grid_type == "linear" and not use_proximity:
+        order = np.argsort(names, kind="stable")
+        names = [names[i] for i in order]
+    else:
+        order = None
+
+    text = f"{grid_type}|{int(use_proximity)}|{','.join(names)}|{method}"
+    if method == "iterative":
+        text += f"|{tolerance!r}"
+    digest = hashlib.sha256(text.encode())
+    for part in _payoff_parts(payoff_matrix, order):
+        digest.update(np.ascontiguousarray(part).tobytes())
+    return digest.hexdigest()[:32], order
+
+
+def _payoff_parts(payoff_matrix, order):
+    # Arrays that pin down the payoffs with rows and columns in key order. Structured
+    # payoffs cost O(n + nnz), the dense matrix is never built for them
+    if isinstance(payoff_matrix, StructuredPayoffMatrix):
+        row_values, correction = payoff_matrix.row_values, payoff_matrix.correction
+        if order is not None:
+            row_values, correction = row_values[order], correction[order][:, order]
+        correction = correction.copy()
+        correction.sum_duplicates()
+        correction.eliminate_zeros()
+        correction.sort_indices()
+        return (np.frombuffer(b"structured", dtype=np.uint8), row_values,
+                correction.indptr.astype(np.int64), correction.indices.astype(np.int64), correction.data)
+
+    payoff_matrix = np.asarray(payoff_matrix, dtype=float)
+    if order is not None:
+        payoff_matrix = payoff_matrix[np.ix_(order, order)]
+    return np.frombuffer(b"dense", dtype=np.uint8), np.asarray(payoff_matrix.shape, dtype=np.int64), payoff_matrix
+
+
+def _to_key_order(probabilities, order):
+    stored = np.array(probabilities if order is None else probabilities[order])
+    stored.setflags(write=False)
+    return stored
+
+
+def _from_key_order(stored, order):
+    if order is None:
+        return stored
+    probabilities = np.empty_like(stored)
+    probabilities[order] = stored
+    return probabilities
+
+
+def cached_solve_game(payoff_matrix, grid_type, use_proximity, place_types, method="lp", cache=None,
+                      initial_strategies=None, disk_cache=None, tolerance=1e-4):
+    # initial_strategies (in place order) only matter on a cache miss, see solve_game.
+    # Misses of the in-memory cache go to the persistent cache (when configured) before
+    # solving; results that missed the tolerance are returned but not cached
+    cache = equilibrium_cache if cache is None else cache
+    disk_cache = disk_equilibrium_cache if disk_cache is None else disk_cache
+    key, order = make_cache_key(payoff_matrix, grid_type, use_proximity, place_types, method, tolerance)
+
+    entry = cache.get(key)
+    if entry is None:
+        entry = disk_cache.get(key)
+        if entry is None:
+            result = solve_game(payoff_matrix, method=method, tolerance=tolerance,
+                                initial_strategies=initial_strategies)
+            entry = {
+                "hider_probabilities": _to_key_order(result["hider_probabilities"], order),
+                "seeker_probabilities": _to_key_order(result["seeker_probabilities"], order),
+                "expected_value": result["expected_value"],
+                "duality_gap": result["duality_gap"]
+            }
+            if entry["duality_gap"] <= tolerance:
+                disk_cache.put(key, entry)
+                cache.put(key, entry)
+        else:
+            cache.put(key, entry)
+
+    return {
+        "hider_probabilities": _from_key_order(entry["hider_probabilities"], order),
+        "seeker_probabilities": _from_key_order(entry["seeker_probabilities"], order),
+        "expected_value": entry["expected_value"],
+        "duality_gap": entry["duality_gap"]
+    }
+
+
+def cached_solve_payoff_matrix(payoff_matrix, grid_type, use_proximity, place_types, player="hider",
+                               method="lp", cache=None, tolerance=1e-4):
+    if player.lower() not in ("hider", "seeker"):
+        raise ValueError("Player must be either 'hider' or 'seeker'")
+
+    result = cached_solve_game(payoff_matrix, grid_type, use_proximity, place_types, method=method, cache=cache,
+                               tolerance=tolerance)
+    return result[f"{player.lower()}_probabilities"], result["expected_value"]
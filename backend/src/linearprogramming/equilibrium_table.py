@@ -0,0 +1,179 @@
+import argparse
+import logging
+import os
+import threading
+
+import numpy as np
+
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.game.gamelogic.gamegrid.place_type import PlaceType
+from src.linearprogramming.batch_gamesolver import solve_payoff_matrices
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TABLE_DIRECTORY = os.environ.get(
+    "HIDE_SEEK_EQUILIBRIUM_TABLES",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "equilibrium_tables")
+)
+
+# (grid_type, use_proximity, size) of the boards worth precomputing: 3^size configurations each
+SUPPORTED_VARIANTS = ([("linear", False, size) for size in range(2, 11)]
+                      + [("linear", True, size) for size in range(2, 11)]
+                      + [("2d", True, 9)])
+
+# Bumped whenever the layout of a table changes; tables of another version are refused
+TABLE_VERSION = 1
+GRID_TYPES = ("linear", "2d")
+
+# Place type digits of the base-3 index, the first position is the most significant digit
+PLACE_TYPES = (PlaceType.EASY, PlaceType.NEUTRAL, PlaceType.HARD)
+_DIGITS = {place_type: digit for digit, place_type in enumerate(PLACE_TYPES)}
+
+
+def _variant(grid_type, use_proximity, size):
+    # 2D grids always apply proximity, whatever flag they were created with
+    grid_type = grid_type.lower()
+    return grid_type, True if grid_type == "2d" else bool(use_proximity), size
+
+
+def table_path(directory, grid_type, use_proximity, size):
+    grid_type, use_proximity, size = _variant(grid_type, use_proximity, size)
+    return os.path.join(directory, f"{grid_type}-{'proximity' if use_proximity else 'base'}-{size}.npy")
+
+
+def table_header(grid_type, use_proximity, size):
+    # First row of a table: version, grid type, proximity and board size, zero padded
+    grid_type, use_proximity, size = _variant(grid_type, use_proximity, size)
+    header = np.zeros(2 * size + 2)
+    header[:4] = (TABLE_VERSION, GRID_TYPES.index(grid_type), use_proximity, size)
+    return header
+
+
+def encode_place_types(place_types):
+    index = 0
+    for place_type in place_types:
+        index = 3 * index + _DIGITS[place_type]
+    return index
+
+
+def decode_index(index, size):
+    digits = []
+    for _ in range(size):
+        index, digit = divmod(index, 3)
+        digits.append(PLACE_TYPES[digit])
+    return digits[::-1]
+
+
+class EquilibriumTable:
+    """
+    Precomputed equilibria of every place type configuration of small boards.
+
+    Each (grid_type, proximity, size) variant is one .npy file of shape (3^n + 1, 2n + 2).
+    Row 0 is the table_header naming the variant; row 1 + encode_place_types(place_types)
+    holds the hider mix, the seeker mix, the value and the duality gap. Files are
+    memory-mapped read-only, so a lookup reads one row and worker processes share the
+    pages through the OS page cache. A file whose header or shape does not match its
+    variant (stale, or built for another board) is logged once and ignored, so those
+    boards are solved instead of read from it.
+    """
+
+    def __init__(self, directory=DEFAULT_TABLE_DIRECTORY):
+        self.directory = directory
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def _table(self, variant):
+        # Missing and rejected files are remembered as None so lookups do not hit the
+        # filesystem again
+        if variant not in self._tables:
+            path = table_path(self.directory, *variant)
+            table = None
+            if os.path.exists(path):
+                try:
+                    table = _check_table(path, np.load(path, mmap_mode="r"), *variant)
+                except ValueError as e:
+                    logger.warning("Ignoring equilibrium table: %s", e)
+            with self._lock:
+                self._tables.setdefault(variant, table)
+        return self._tables[variant]
+
+    def lookup(self, grid_type, use_proximity, place_types):
+        size = len(place_types)
+        table = self._table(_variant(grid_type, use_proximity, size))
+        if table is None:
+            return None
+
+        row = table[1 + encode_place_types(place_types)]
+        return {
+            "hider_probabilities": row[:size],
+            "seeker_probabilities": row[size:2 * size],
+            "expected_value": float(row[2 * size]),
+            "duality_gap": float(row[2 * size + 1])
+        }
+
+    def reload(self):
+        # Picks up tables built after the first lookup
+        with self._lock:
+            self._tables.clear()
+
+
+def _check_table(path, table, grid_type, use_proximity, size):
+    expected = table_header(grid_type, use_proximity, size)
+    if table.shape != (3 ** size + 1, len(expected)) or not np.array_equal(table[0], expected):
+        raise ValueError(f"{path} is not a version {TABLE_VERSION} table of {grid_type} boards of size {size} "
+                         f"{'with' if use_proximity else 'without'} proximity, rebuild it")
+    return table
+
+
+equilibrium_table = EquilibriumTable()
+
+
+def build_table(directory, grid_type, use_proximity, size, max_workers=None):
+    grid_type, use_proximity, size = _variant(grid_type, use_proximity, size)
+    # Dense payoffs: at these sizes the LP overhead of sparse constraints outweighs their gain
+    payoff_matrices = [
+        create_game_grid(size, grid_type, use_proximity, decode_index(index, size)).get_payoff_matrix()
+        for index in range(3 ** size)
+    ]
+    results = solve_payoff_matrices(payoff_matrices, max_workers=max_workers)
+
+    table = np.empty((len(results) + 1, 2 * size + 2))
+    table[0] = table_header(grid_type, use_proximity, size)
+    for index, result in enumerate(results, start=1):
+        if result["error"] is not None:
+            raise RuntimeError(f"Solving {decode_index(index - 1, size)} failed: {result['error']}")
+        table[index, :size] = result["hider_probabilities"]
+        table[index, size:2 * size] = result["seeker_probabilities"]
+        table[index, 2 * size] = result["expected_value"]
+        table[index, 2 * size + 1] = result["duality_gap"]
+
+    # Written next to the target and renamed, so readers never map a half-written file
+    os.makedirs(directory, exist_ok=True)
+    path = table_path(directory, grid_type, use_proximity, size)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        np.save(file, table)
+    os.replace(temporary_path, path)
+    return path
+
+
+def build_tables(directory=DEFAULT_TABLE_DIRECTORY, variants=SUPPORTED_VARIANTS, max_workers=None):
+    return [build_table(directory, *variant, max_workers=max_workers) for variant in variants]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the equilibria of every small board.")
+    parser.add_argument("--output", default=DEFAULT_TABLE_DIRECTORY, help="directory of the .npy tables")
+    parser.add_argument("--max-linear-size", type=int, default=10, help="largest linear board to enumerate")
+    parser.add_argument("--skip-2d", action="store_true", help="do not build the 3x3 board")
+    parser.add_argument("--workers", type=int, default=None, help="solver processes (default: all CPUs)")
+    args = parser.parse_args(argv)
+
+    variants = [(grid_type, use_proximity, size) for grid_type, use_proximity, size in SUPPORTED_VARIANTS
+                if (grid_type == "linear" and size <= args.max_linear_size) or (grid_type == "2d" and not args.skip_2d)]
+    for variant in variants:
+        print(f"{build_table(args.output, *variant, max_workers=args.workers)}: {3 ** variant[2]} configurations")
+
+
+if __name__ == "__main__":
+    main()
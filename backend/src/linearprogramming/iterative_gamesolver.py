@@ -0,0 +1,128 @@
+import numpy as np
+
+
+class IterativeGameSolver:
+    """
+    Approximate equilibrium solver based on alternating predictive regret matching+ (PRM+).
+
+    Every iteration costs one product with the payoff matrix and one with its transpose,
+    so the payoff can be a dense array or any matrix-free operator supporting ``@`` and
+    ``.T`` (e.g. a ``scipy.sparse.linalg.LinearOperator``). The solver stops once the
+    exploitability of the averaged or last strategies, max_i (A y)_i - min_j (x A)_j,
+    drops to the requested tolerance, and reports how far it got otherwise.
+    """
+
+    def __init__(self, payoff_matrix, tolerance=1e-4, max_iterations=10000, check_interval=10,
+                 initial_strategies=None, regret_scale=None):
+        self.payoff_matrix = payoff_matrix
+        self.n_hider, self.n_seeker = payoff_matrix.shape
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.check_interval = check_interval
+        # (hider, seeker) mixes to start from, e.g. the equilibrium of a slightly different game
+        self.initial_strategies = initial_strategies
+        self.regret_scale = regret_scale
+
+    def _hider_payoffs(self, seeker_probabilities):
+        return np.asarray(self.payoff_matrix @ seeker_probabilities).ravel()
+
+    def _seeker_payoffs(self, hider_probabilities):
+        return np.asarray(self.payoff_matrix.T @ hider_probabilities).ravel()
+
+    def exploitability(self, hider_probabilities, seeker_probabilities):
+        best_hider_reply = np.max(self._hider_payoffs(seeker_probabilities))
+        best_seeker_reply = np.min(self._seeker_payoffs(hider_probabilities))
+        return float(best_hider_reply - best_seeker_reply), best_hider_reply, best_seeker_reply
+
+    @staticmethod
+    def _regret_matching(regrets):
+        total = regrets.sum()
+        if total <= 0:
+            return np.full(regrets.shape[0], 1.0 / regrets.shape[0])
+        return regrets / total
+
+    def solve_both(self):
+        # Predictive RM+ plays as if the last instantaneous regret is seen once more
+        hider_prediction = np.zeros(self.n_hider)
+        seeker_prediction = np.zeros(self.n_seeker)
+        hider_average = np.zeros(self.n_hider)
+        seeker_average = np.zeros(self.n_seeker)
+
+        best = None
+        iteration = 0
+        if self.initial_strategies is None:
+            hider_regrets = np.zeros(self.n_hider)
+            seeker_regrets = np.zeros(self.n_seeker)
+            hider_probabilities = np.full(self.n_hider, 1.0 / self.n_hider)
+            seeker_probabilities = np.full(self.n_seeker, 1.0 / self.n_seeker)
+        else:
+            hider_probabilities, seeker_probabilities = (
+                self._regret_matching(np.maximum(np.asarray(probabilities, dtype=float), 0))
+                for probabilities in self.initial_strategies
+            )
+            report = self.exploitability(hider_probabilities, seeker_probabilities)
+            best = ((hider_probabilities, seeker_probabilities), report)
+            # Seeding the regrets with the warm mixes makes regret matching replay them
+            # until new regrets outweigh the seed, so it should be of the payoff's order
+            scale = self.regret_scale
+            if scale is None:
+                scale = self.check_interval * max(abs(report[1]), abs(report[2]), self.tolerance)
+            hider_regrets = hider_probabilities * scale
+            seeker_regrets = seeker_probabilities * scale
+        # A warm start that is already good enough is returned without iterating
+        while iteration < self.max_iterations and (best is None or best[1][0] > self.tolerance):
+            iteration += 1
+
+            # Hider (maximizer) reacts to the current seeker mix
+            hider_payoffs = self._hider_payoffs(seeker_probabilities)
+            hider_prediction = hider_payoffs - hider_probabilities @ hider_payoffs
+            hider_regrets = np.maximum(hider_regrets + hider_prediction, 0)
+            hider_probabilities = self._regret_matching(np.maximum(hider_regrets + hider_prediction, 0))
+
+            # Seeker (minimizer) reacts to the hider mix just chosen (alternating updates)
+            seeker_payoffs = self._seeker_payoffs(hider_probabilities)
+            seeker_prediction = seeker_probabilities @ seeker_payoffs - seeker_payoffs
+            seeker_regrets = np.maximum(seeker_regrets + seeker_prediction, 0)
+            seeker_probabilities = self._regret_matching(np.maximum(seeker_regrets + seeker_prediction, 0))
+
+            # Later iterates are better, so weight them quadratically in the average
+            hider_average += iteration ** 2 * hider_probabilities
+            seeker_average += iteration ** 2 * seeker_probabilities
+
+            if iteration % self.check_interval == 0 or iteration == self.max_iterations:
+                # The last iterate often converges faster than the average, keep the better one
+                for candidate in ((hider_average / hider_average.sum(), seeker_average / seeker_average.sum()),
+                                  (hider_probabilities, seeker_probabilities)):
+                    report = self.exploitability(*candidate)
+                    if best is None or report[0] < best[1][0]:
+                        best = (candidate, report)
+                if best[1][0] <= self.tolerance:
+                    break
+
+        (hider_result, seeker_result), (exploitability, upper, lower) = best
+        return {
+            'hider_probabilities': hider_result,
+            'seeker_probabilities': seeker_result,
+            # The true value lies between the two best-reply payoffs
+            'expected_value': float((upper + lower) / 2),
+            'duality_gap': exploitability,
+            'exploitability': exploitability,
+            'iterations': iteration,
+            'converged': exploitability <= self.tolerance
+        }
+
+    def solve_for_hider(self):
+        result = self.solve_both()
+        return {
+            'probabilities': result['hider_probabilities'],
+            'expected_value': result['expected_value'],
+            'solution': result
+        }
+
+    def solve_for_seeker(self):
+        result = self.solve_both()
+        return {
+            'probabilities': result['seeker_probabilities'],
+            'expected_value': result['expected_value'],
+            'solution': result
+        }
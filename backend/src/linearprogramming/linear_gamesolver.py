@@ -0,0 +1,120 @@
+import numpy as np
+
+from src.linearprogramming.structured_payoff_matrix import StructuredPayoffMatrix
+
+
+def detect_linear_game(payoff_matrix):
+    # A linear (non-proximity) game has a constant r_i in every hider row except
+    # for the diagonal entry d_i, and the diagonal is below the row constant.
+    # Returns (row_values, diagonal) for such matrices, None otherwise.
+    if isinstance(payoff_matrix, StructuredPayoffMatrix):
+        if payoff_matrix.shape[0] < 2 or payoff_matrix.has_band:
+            return None
+        diagonal = payoff_matrix.diagonal
+        return (payoff_matrix.row_values, diagonal) if np.all(payoff_matrix.row_values > diagonal) else None
+
+    payoff_matrix = np.asarray(payoff_matrix)
+    if payoff_matrix.ndim != 2 or payoff_matrix.shape[0] != payoff_matrix.shape[1] or payoff_matrix.shape[0] < 2:
+        return None
+
+    # Column 1 is off-diagonal for row 0, column 0 for every other row
+    row_values = payoff_matrix[:, 0].copy()
+    row_values[0] = payoff_matrix[0, 1]
+    diagonal = np.diagonal(payoff_matrix).copy()
+
+    # Every entry must equal its row constant; the diagonal is exempt and checked below
+    matches = payoff_matrix == row_values[:, np.newaxis]
+    np.fill_diagonal(matches, True)
+    if not np.all(matches):
+        return None
+    if not np.all(row_values > diagonal):
+        return None
+
+    return row_values, diagonal
+
+
+class LinearGameSolver:
+    """
+    Closed-form solver for payoff matrices A with A[i][j] = r_i for i != j and A[i][i] = d_i < r_i.
+
+    With c_i = r_i - d_i, the seeker searches the places with the highest r_i so that
+    every searched row pays the same value v, y_i = (r_i - v) / c_i, and the hider
+    spreads x_i proportional to 1 / c_i over the same places. Picking the support is
+    a water-filling problem solved after one sort, so the whole solve is O(n log n).
+    """
+
+    def __init__(self, row_values, diagonal):
+        self.row_values = np.asarray(row_values, dtype=float)
+        self.diagonal = np.asarray(diagonal, dtype=float)
+        self.n = self.row_values.shape[0]
+        self._support = None
+        self._value = None
+
+    @classmethod
+    def from_payoff_matrix(cls, payoff_matrix):
+        structure = detect_linear_game(payoff_matrix)
+        if structure is None:
+            raise ValueError("Payoff matrix is not a linear (row-constant plus diagonal) game")
+        return cls(*structure)
+
+    def _solve(self):
+        if self._support is not None:
+            return
+
+        costs = self.row_values - self.diagonal
+        order = np.argsort(-self.row_values, kind="stable")
+        sorted_values = self.row_values[order]
+
+        # v_k is the common value when the seeker searches the k most rewarding rows
+        weighted_values = np.cumsum(sorted_values / costs[order])
+        inverse_costs = np.cumsum(1.0 / costs[order])
+        values = (weighted_values - 1.0) / inverse_costs
+
+        # The first k whose value already covers the next row is the optimal support
+        next_values = np.append(sorted_values[1:], -np.inf)
+        k = int(np.argmax(values >= next_values))
+
+        self._support = order[:k + 1]
+        self._value = float(values[k])
+
+    def solve_for_hider(self):
+        self._solve()
+        costs = self.row_values - self.diagonal
+
+        probabilities = np.zeros(self.n)
+        probabilities[self._support] = 1.0 / costs[self._support]
+        probabilities /= probabilities.sum()
+
+        return {
+            'probabilities': probabilities,
+            'expected_value': self._value
+        }
+
+    def solve_for_seeker(self):
+        self._solve()
+        costs = self.row_values - self.diagonal
+
+        probabilities = np.zeros(self.n)
+        probabilities[self._support] = np.maximum(self.row_values[self._support] - self._value, 0) / costs[self._support]
+        probabilities /= probabilities.sum()
+
+        return {
+            'probabilities': probabilities,
+            'expected_value': self._value
+        }
+
+    def solve_both(self):
+        hider_probabilities = self.solve_for_hider()['probabilities']
+        seeker_probabilities = self.solve_for_seeker()['probabilities']
+        costs = self.row_values - self.diagonal
+
+        # Best replies in O(n): (A y)_i = r_i - c_i * y_i and (x A)_j = x.r - c_j * x_j
+        best_hider_reply = np.max(self.row_values - costs * seeker_probabilities)
+        best_seeker_reply = np.min(hider_probabilities @ self.row_values - costs * hider_probabilities)
+
+        return {
+            'hider_probabilities': hider_probabilities,
+            'seeker_probabilities': seeker_probabilities,
+            'expected_value': self._value,
+            'duality_gap': float(best_hider_reply - best_seeker_reply)
+        }
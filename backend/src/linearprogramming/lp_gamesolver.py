@@ -1,87 +1,236 @@
+import time
+
 import numpy as np
 from scipy.optimize import linprog
+from scipy.sparse import csr_matrix, hstack
 
+from src.linearprogramming.dominance import eliminate_dominated_strategies, expand_probabilities
+from src.linearprogramming.iterative_gamesolver import IterativeGameSolver
+from src.linearprogramming.linear_gamesolver import LinearGameSolver, detect_linear_game
+from src.linearprogramming.structured_payoff_matrix import StructuredPayoffMatrix
 
-class LPGameSolver:
-    def __init__(self, payoff_matrix):
-        self.payoff_matrix = payoff_matrix
-        self.n = self.payoff_matrix.shape[0]  # number of places
 
-    def solve_for_hider(self):
-        # sum(x_i * Aij) >= v for all j (constraint 1)
-        # sum(x_i) = 1 (constraint 2)
-        # x_i >= 0 for all i
-        # v >= 0
+class HighsConfig:
+    """
+    Chooses the HiGHS method and presolve setting of an LP from its size and density.
 
-        # min z = -v (equivalent to max v)
-        # convert ">= v" into "<= -v"
+    The dual simplex wins on dense constraint matrices and small problems, where presolve
+    finds nothing to remove and only costs time. The interior point method catches up
+    on large sparse problems (structured payoffs with a few thousand places). A fixed
+    method or presolve setting overrides the automatic choice.
+    """
 
-        c = np.zeros(self.n + 1)
-        c[-1] = -1  # coefficient of v
+    def __init__(self, method=None, presolve=None, ipm_min_variables=2000, sparse_max_density=0.05):
+        if method not in (None, "highs", "highs-ds", "highs-ipm"):
+            raise ValueError("Method must be None, 'highs', 'highs-ds' or 'highs-ipm'")
+        self.method = method
+        self.presolve = presolve
+        self.ipm_min_variables = ipm_min_variables
+        self.sparse_max_density = sparse_max_density
 
-        # Constraint 1
-        # convert sum(x_i) * Aij - v >= 0 for all j
-        # into -sum(x_i) * Aij + v <= 0 for all j
-        A_ub = np.zeros((self.n, self.n + 1))
-        for j in range(self.n):
-            A_ub[j, :-1] = -self.payoff_matrix[:, j]
-            A_ub[j, -1] = 1
-        b_ub = np.zeros(self.n)
+    def select(self, num_variables, num_constraints, nnz):
+        sparse = bool(nnz <= self.sparse_max_density * num_variables * num_constraints)
+        method = self.method
+        if method is None:
+            method = "highs-ipm" if sparse and num_variables >= self.ipm_min_variables else "highs-ds"
+        presolve = sparse if self.presolve is None else self.presolve
+        return method, presolve
 
-        # Constraint 2
-        A_eq = np.zeros((1, self.n + 1))
-        A_eq[0, :-1] = 1
-        b_eq = np.array([1])
 
-        bounds = [(0, None) for _ in range(self.n)] + [(None, None)]
+highs_config = HighsConfig()
 
-        solution = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds)
-        probabilities = solution.x[:-1]
-        expected_value = solution.x[-1]
+# Largest exploitability at which a previous equilibrium counts as an exact LP solution
+REUSE_TOLERANCE = 1e-9
 
-        return {
-            'probabilities': probabilities,
-            'expected_value': expected_value,
-            'solution': solution
-        }
 
-    def solve_for_seeker(self):
-        # sum(x_i * Aij) <= w for all i (constraint 1)
-        # sum(x_i) = 1 (constraint 2)
-        # x_i >= 0 for all i
-        # w >= 0
+class LPGameSolver:
+    """
+    Solves a zero-sum game as a linear program with HiGHS.
 
-        # min z = w
+    Dense payoffs give dense constraint matrices. A StructuredPayoffMatrix A = r 1^T + C is
+    solved on the sparse correction instead: x^T A y = r.x + x^T C y because y sums to one,
+    so shifting the game value by r.x (hider) or by r_i in every row (seeker) leaves
+    only C in the constraints, with O(n) non-zeros instead of n^2.
+    """
 
-        c = np.zeros(self.n + 1)
-        c[-1] = 1
+    def __init__(self, payoff_matrix, config=None):
+        self.payoff_matrix = payoff_matrix
+        self.n = self.payoff_matrix.shape[0]  # number of places
+        self.config = config or highs_config
+        self.structured = isinstance(payoff_matrix, StructuredPayoffMatrix)
+
+    def _hider_program(self):
+        # sum(x_i * Aij) >= v for all j, sum(x_i) = 1, x_i >= 0; max v
+        # written as -sum(x_i * Aij) + v <= 0 and min -v
+        ones = np.ones((self.payoff_matrix.shape[1], 1))
+        if self.structured:
+            # v = w + r.x, so min -(r.x) - w subject to -sum(x_i * Cij) + w <= 0
+            c = np.append(-self.payoff_matrix.row_values, -1)
+            A_ub = hstack([-self.payoff_matrix.correction.T, csr_matrix(ones)], format="csr")
+        else:
+            c = np.append(np.zeros(self.n), -1)
+            A_ub = np.hstack([-np.asarray(self.payoff_matrix).T, ones])
+        b_ub = np.zeros(A_ub.shape[0])
+        return c, A_ub, b_ub
+
+    def _seeker_program(self):
+        # sum(y_j * Aij) <= w for all i, sum(y_j) = 1, y_j >= 0; min w
+        ones = np.ones((self.n, 1))
+        if self.structured:
+            # r_i + sum(y_j * Cij) <= w, with r_i moved to the right-hand side
+            A_ub = hstack([self.payoff_matrix.correction, csr_matrix(-ones)], format="csr")
+            b_ub = -self.payoff_matrix.row_values
+        else:
+            A_ub = np.hstack([np.asarray(self.payoff_matrix), -ones])
+            b_ub = np.zeros(self.n)
+        c = np.append(np.zeros(A_ub.shape[1] - 1), 1)
+        return c, A_ub, b_ub
+
+    def _solve(self, build_program):
+        start = time.perf_counter()
+        c, A_ub, b_ub = build_program()
+        num_variables = c.shape[0] - 1
+        A_eq = np.append(np.ones(num_variables), 0)[np.newaxis, :]
+        if self.structured:
+            A_eq = csr_matrix(A_eq)
+        bounds = [(0, None)] * num_variables + [(None, None)]
+        build_time = time.perf_counter() - start
+
+        nnz = A_ub.nnz if self.structured else np.count_nonzero(A_ub)
+        method, presolve = self.config.select(num_variables, A_ub.shape[0], nnz)
+
+        start = time.perf_counter()
+        solution = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=np.array([1]), bounds=bounds,
+                           method=method, options={"presolve": presolve})
+        solve_time = time.perf_counter() - start
+        if not solution.success:
+            raise RuntimeError(f"LP solve failed: {solution.message}")
+
+        timing = {
+            'build_time': build_time,
+            'solve_time': solve_time,
+            'method': method,
+            'presolve': presolve,
+            'sparse': self.structured
+        }
+        return solution, timing
 
-        # Constraint 1
-        A_ub = np.zeros((self.n, self.n + 1))
-        for i in range(self.n):
-            A_ub[i, :-1] = self.payoff_matrix[i, :]
-            A_ub[i, -1] = -1
-        b_ub = np.zeros(self.n)
+    def solve_for_hider(self):
+        solution, timing = self._solve(self._hider_program)
+        return {
+            'probabilities': solution.x[:-1],
+            # -fun is v for dense payoffs and w + r.x for structured ones
+            'expected_value': -solution.fun,
+            'solution': solution,
+            'timing': timing
+        }
 
-        # Constraint 2
-        A_eq = np.zeros((1, self.n + 1))
-        A_eq[0, :-1] = 1
-        b_eq = np.array([1])
+    def solve_for_seeker(self):
+        solution, timing = self._solve(self._seeker_program)
+        return {
+            'probabilities': solution.x[:-1],
+            'expected_value': solution.fun,
+            'solution': solution,
+            'timing': timing
+        }
 
-        bouds = [(0, None) for _ in range(self.n)] + [(None, None)]
+    def solve_both(self):
+        # The seeker's LP is the dual of the hider's one: the marginals of the
+        # "-sum(x_i * Aij) + v <= 0" constraints are -y_j, so one solve gives both mixes
+        hider = self.solve_for_hider()
+        solution = hider['solution']
 
-        solution = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bouds)
-        probabilities = solution.x[:-1]
-        expected_value = solution.x[-1]
+        seeker_probabilities = np.maximum(-solution.ineqlin.marginals, 0)
+        seeker_probabilities /= seeker_probabilities.sum()
 
         return {
-            'probabilities': probabilities,
-            'expected_value': expected_value,
-            'solution': solution
+            'hider_probabilities': hider['probabilities'],
+            'seeker_probabilities': seeker_probabilities,
+            'expected_value': hider['expected_value'],
+            'duality_gap': duality_gap(self.payoff_matrix, hider['probabilities'], seeker_probabilities),
+            'solution': solution,
+            'timing': hider['timing']
         }
 
-def solve_payoff_matrix(payoff_matrix, player="hider"):
-    solver = LPGameSolver(payoff_matrix)
+
+def duality_gap(payoff_matrix, hider_probabilities, seeker_probabilities):
+    # Best hider reply against y minus best seeker reply against x, zero at equilibrium
+    return float(np.max(payoff_matrix @ seeker_probabilities) - np.min(payoff_matrix.T @ hider_probabilities))
+
+
+def _create_solver(payoff_matrix, method="lp", tolerance=1e-4, initial_strategies=None):
+    if method == "iterative":
+        return IterativeGameSolver(payoff_matrix, tolerance=tolerance, initial_strategies=initial_strategies)
+    if method != "lp":
+        raise ValueError("Method must be either 'lp' or 'iterative'")
+
+    # Linear games without proximity have a closed-form equilibrium, skip the LP for them
+    structure = detect_linear_game(payoff_matrix)
+    if structure is not None:
+        return LinearGameSolver(*structure)
+    return LPGameSolver(payoff_matrix)
+
+
+def _reuse_initial_strategies(payoff_matrix, initial_strategies, tolerance):
+    # A previous equilibrium often survives a small change of the game (e.g. when the
+    # changed places are outside its support); checking it costs two matrix products
+    hider_probabilities, seeker_probabilities = (np.asarray(probabilities, dtype=float)
+                                                 for probabilities in initial_strategies)
+    upper = float(np.max(payoff_matrix @ seeker_probabilities))
+    lower = float(np.min(payoff_matrix.T @ hider_probabilities))
+    if upper - lower > tolerance:
+        return None
+    return {
+        'hider_probabilities': hider_probabilities,
+        'seeker_probabilities': seeker_probabilities,
+        'expected_value': (upper + lower) / 2,
+        'duality_gap': upper - lower,
+        'reused_equilibrium': True
+    }
+
+
+def solve_game(payoff_matrix, method="lp", tolerance=1e-4, dominance=None, initial_strategies=None):
+    # tolerance is the target exploitability of the iterative engine, the LP is exact.
+    # dominance="strict" or "weak" removes dominated strategies before solving; it compares dense
+    # rows, so structured payoffs are refused rather than densified.
+    # initial_strategies=(hider, seeker) warm-starts the iterative engine. The LP does not warm
+    # start: it reuses them unchanged when they are still an exact equilibrium (reuse-if-optimal)
+    # and solves from scratch otherwise
+    if dominance not in (None, "strict", "weak"):
+        raise ValueError("Dominance must be None, 'strict' or 'weak'")
+    if dominance is not None and isinstance(payoff_matrix, StructuredPayoffMatrix):
+        raise ValueError("Dominance elimination needs a dense payoff matrix")
+
+    if initial_strategies is not None and method == "lp":
+        result = _reuse_initial_strategies(payoff_matrix, initial_strategies, REUSE_TOLERANCE)
+        if result is not None:
+            return result
+        initial_strategies = None
+
+    if dominance is None:
+        return _create_solver(payoff_matrix, method, tolerance, initial_strategies).solve_both()
+
+    payoff_matrix = np.asarray(payoff_matrix, dtype=float)
+    hider_indices, seeker_indices = eliminate_dominated_strategies(payoff_matrix, weak=dominance == "weak")
+    reduced = payoff_matrix[np.ix_(hider_indices, seeker_indices)]
+    if initial_strategies is not None:
+        initial_strategies = (np.asarray(initial_strategies[0])[hider_indices],
+                              np.asarray(initial_strategies[1])[seeker_indices])
+    result = _create_solver(reduced, method, tolerance, initial_strategies).solve_both()
+
+    n_hider, n_seeker = payoff_matrix.shape
+    result['hider_probabilities'] = expand_probabilities(result['hider_probabilities'], hider_indices, n_hider)
+    result['seeker_probabilities'] = expand_probabilities(result['seeker_probabilities'], seeker_indices, n_seeker)
+    result['duality_gap'] = duality_gap(payoff_matrix, result['hider_probabilities'], result['seeker_probabilities'])
+    result['removed_strategies'] = {
+        'hider': n_hider - len(hider_indices),
+        'seeker': n_seeker - len(seeker_indices)
+    }
+    return result
+
+
+def solve_payoff_matrix(payoff_matrix, player="hider", method="lp", tolerance=1e-4):
+    solver = _create_solver(payoff_matrix, method, tolerance)
 
     if player.lower() == "hider":
         result = solver.solve_for_hider()
@@ -0,0 +1,102 @@
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix
+from scipy.sparse.linalg import LinearOperator
+
+
+class StructuredPayoffMatrix(LinearOperator):
+    """
+    Payoff matrix stored as A = r 1^T + C: a constant r_i per hider row plus a sparse correction C.
+
+    The grid payoffs are row-constant except for the diagonal and the proximity band,
+    so C holds O(n) entries and the whole matrix fits in O(n) memory. Products with
+    A and A^T, rows, columns and single entries are computed from (r, C) directly;
+    the dense matrix is only built by toarray().
+    """
+
+    def __init__(self, row_values, correction):
+        self.row_values = np.asarray(row_values, dtype=float)
+        self.correction = csr_matrix(correction, dtype=float)
+        self._correction_columns = None
+        size = self.row_values.shape[0]
+        if self.correction.shape != (size, size):
+            raise ValueError(f"Correction must be {size}x{size}, got {self.correction.shape}")
+        super().__init__(dtype=np.dtype(float), shape=(size, size))
+
+    @classmethod
+    def from_entries(cls, row_values, rows, cols, values):
+        # Duplicate (row, col) entries are summed, like in scipy's COO format
+        size = len(row_values)
+        return cls(row_values, csr_matrix((values, (rows, cols)), shape=(size, size)))
+
+    def replace_rows(self, positions, row_values, rows, cols, values):
+        # New matrix with the hider rows at positions rewritten: their row constants become
+        # row_values and their correction becomes the (rows, cols, values) entries.
+        # Costs O(n + nnz), the other rows are carried over untouched
+        positions = np.asarray(positions)
+        new_row_values = self.row_values.copy()
+        new_row_values[positions] = row_values
+
+        kept = self.correction.tocoo()
+        keep = ~np.isin(kept.row, positions)
+        return self.from_entries(
+            new_row_values,
+            np.concatenate([kept.row[keep], rows]),
+            np.concatenate([kept.col[keep], cols]),
+            np.concatenate([kept.data[keep], values])
+        )
+
+    @property
+    def diagonal(self):
+        return self.row_values + self.correction.diagonal()
+
+    @property
+    def has_band(self):
+        # True when C has entries off the diagonal (proximity grids)
+        rows, cols = self.correction.nonzero()
+        return bool(np.any(rows != cols))
+
+    @property
+    def nbytes(self):
+        return (self.row_values.nbytes + self.correction.data.nbytes + self.correction.indices.nbytes
+                + self.correction.indptr.nbytes)
+
+    def _matvec(self, y):
+        y = np.asarray(y).ravel()
+        return self.row_values * y.sum() + self.correction @ y
+
+    def _rmatvec(self, x):
+        x = np.asarray(x).ravel()
+        return np.full(self.shape[1], self.row_values @ x) + self.correction.T @ x
+
+    def _matmat(self, Y):
+        return self.row_values[:, np.newaxis] * Y.sum(axis=0) + self.correction @ Y
+
+    def row(self, i):
+        row = np.full(self.shape[1], self.row_values[i])
+        start, end = self.correction.indptr[i], self.correction.indptr[i + 1]
+        row[self.correction.indices[start:end]] += self.correction.data[start:end]
+        return row
+
+    def column(self, j):
+        if self._correction_columns is None:
+            self._correction_columns = csc_matrix(self.correction)
+        columns = self._correction_columns
+        column = self.row_values.copy()
+        start, end = columns.indptr[j], columns.indptr[j + 1]
+        column[columns.indices[start:end]] += columns.data[start:end]
+        return column
+
+    def block(self, row_start, row_stop, col_start, col_stop):
+        # Dense tile A[row_start:row_stop, col_start:col_stop], O(tile size + its non-zeros)
+        tile = np.repeat(self.row_values[row_start:row_stop, np.newaxis], max(col_stop - col_start, 0), axis=1)
+        tile += self.correction[row_start:row_stop, col_start:col_stop].toarray()
+        return tile
+
+    def __getitem__(self, index):
+        i, j = index
+        return float(self.row_values[i] + self.correction[i, j])
+
+    def toarray(self):
+        dense = np.repeat(self.row_values[:, np.newaxis], self.shape[1], axis=1)
+        dense += self.correction.toarray()
+        return dense
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import threading
+
+from src.asgi import GameASGIApp
+from src.app import app as flask_app
+from src.controller.session_registry import session_registry
+
+asgi_app = GameASGIApp(flask_app, solver_threads=2, stream_threads=2)
+
+
+def http_scope(method, path, query_string=b''):
+    return {'type': 'http', 'method': method, 'path': path, 'query_string': query_string,
+            'headers': [(b'content-type', b'application/json')], 'http_version': '1.1'}
+
+
+async def call(method, path, data=None, query_string=b''):
+    body = json.dumps(data).encode() if data is not None else b''
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        sent.append(message)
+
+    await asgi_app(http_scope(method, path, query_string), receive, send)
+    return sent[0]['status'], dict(sent[0]['headers']), b''.join(message.get('body', b'') for message in sent[1:])
+
+
+def test_light_requests_run_inline_and_solves_on_the_pool():
+    async def play():
+        status, _, body = await call('POST', '/api/game/initialize', {'grid_size': 5})
+        session_id = json.loads(body)['session_id']
+        await call('POST', '/api/game/start-game', {'session_id': session_id, 'human_role': 'seeker'})
+        rounds = await asyncio.gather(*[
+            call('POST', '/api/game/play-round', {'session_id': session_id, 'human_position': i % 5})
+            for i in range(20)
+        ])
+        return status, session_id, rounds
+
+    status, session_id, rounds = asyncio.run(play())
+    assert status == 200
+    assert sorted(json.loads(body)['round_number'] for _, _, body in rounds) == list(range(1, 21))
+
+    session = session_registry.get(session_id)
+    # The computer's alias table was built by /start-game on the pool, moves only draw from it
+    assert 'hider' in session.game.configuration._samplers
+
+    play_round = json.dumps({'session_id': session_id}).encode()
+    assert asgi_app._inline_session(http_scope('POST', '/api/game/play-round'), play_round) == (True, session)
+    assert asgi_app._inline_session(http_scope('POST', '/api/game/initialize'), b'{}') == (False, None)
+    # Game states carrying the O(n^2) matrix are built on the pool
+    state = http_scope('GET', '/api/game/get-game-state', f'session_id={session_id}'.encode())
+    assert asgi_app._inline_session(state, b'') == (False, None)
+    state['query_string'] += b'&include_matrix=false'
+    assert asgi_app._inline_session(state, b'') == (True, session)
+
+    # A request on a session held by a solver thread leaves the loop to the other requests
+    locked, release = threading.Event(), threading.Event()
+
+    def solve():
+        with session.lock:
+            locked.set()
+            release.wait(timeout=5)
+
+    async def wait_for_solver():
+        waiting = asyncio.ensure_future(call('POST', '/api/game/play-round',
+                                             {'session_id': session_id, 'human_position': 0}))
+        await asyncio.sleep(0.05)
+        health, _, _ = await call('GET', '/api/health')
+        blocked = not waiting.done()
+        release.set()
+        return health, blocked, await waiting
+
+    solver = threading.Thread(target=solve)
+    solver.start()
+    locked.wait(timeout=5)
+    try:
+        health, blocked, (status, _, _) = asyncio.run(wait_for_solver())
+    finally:
+        release.set()
+        solver.join()
+    assert health == 200 and blocked and status == 200
+
+
+def test_event_stream_and_websocket():
+    async def stream():
+        _, _, body = await call('POST', '/api/game/simulation-jobs',
+                                {'grid_size': 4, 'seed': 3, 'num_rounds': 3000, 'chunk_size': 1000})
+        job_id = json.loads(body)['job_id']
+        return await call('GET', f'/api/game/simulation-jobs/{job_id}/events')
+
+    status, headers, body = asyncio.run(stream())
+    assert status == 200 and headers[b'content-type'].startswith(b'text/event-stream')
+    assert body.decode().rstrip().split('\n\n')[-1].startswith('event: completed')
+
+    client = flask_app.test_client()
+    session_id = client.post('/api/game/initialize', json={'grid_size': 4}).json['session_id']
+    client.post('/api/game/start-game', json={'session_id': session_id, 'human_role': 'hider'})
+
+    async def play():
+        messages = [{'type': 'websocket.connect'},
+                    {'type': 'websocket.receive', 'text': json.dumps({'m': [0, 1, 2], 'id': 1})},
+                    {'type': 'websocket.disconnect'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'websocket', 'path': '/api/game/ws', 'query_string': f'session_id={session_id}'.encode()}
+        await asgi_app(scope, receive, send)
+        return sent
+
+    accepted, reply = asyncio.run(play())
+    assert accepted['type'] == 'websocket.accept'
+    reply = json.loads(reply['text'])
+    assert reply['id'] == 1 and reply['r'] == 3 and len(reply['c']) == 3
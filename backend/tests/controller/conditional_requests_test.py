@@ -0,0 +1,42 @@
+from src.app import app
+
+
+def test_game_state_is_revalidated_by_version():
+    client = app.test_client()
+    session_id = client.post('/api/game/initialize', json={'grid_size': 4}).json['session_id']
+    url = f'/api/game/get-game-state?session_id={session_id}&include_matrix=false&include_place_types=false'
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert 'payoff_matrix' not in first.json['game_state'] and 'place_types' not in first.json['game_state']
+    etag = first.headers['ETag']
+
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+    # Other representations of the same state have their own tags
+    assert client.get(f'/api/game/get-game-state?session_id={session_id}',
+                      headers={'If-None-Match': etag}).status_code == 200
+
+    client.post('/api/game/start-game', json={'session_id': session_id, 'human_role': 'hider'})
+    client.post('/api/game/play-round', json={'session_id': session_id, 'human_position': 0})
+    changed = client.get(url, headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.json['game_state']['round_number'] == 1
+    assert changed.headers['ETag'] != etag
+
+
+def test_configuration_resources_are_immutable():
+    client = app.test_client()
+    session_id = client.post('/api/game/initialize', json={'grid_size': 9, 'grid_type': '2d'}).json['session_id']
+    state = client.get(f'/api/game/get-game-state?session_id={session_id}').json['game_state']
+    digest = state['configuration_digest']
+
+    place_types = client.get(f'/api/game/configuration/{digest}/place-types')
+    assert place_types.json['place_types'] == state['place_types']
+    assert 'immutable' in place_types.headers['Cache-Control']
+
+    url = f'/api/game/configuration/{digest}/payoff-matrix?matrix_format=json'
+    matrix = client.get(url)
+    assert matrix.json['payoff_matrix'] == state['payoff_matrix']
+    assert client.get(url, headers={'If-None-Match': matrix.headers['ETag']}).status_code == 304
+
+    assert client.get('/api/game/configuration/unknown/place-types').status_code == 404
@@ -0,0 +1,114 @@
+import io
+import json
+
+import numpy as np
+
+from src.app import app
+from src.game.round_history import MAX_CAPACITY
+
+
+def test_sessions_do_not_share_games():
+    client = app.test_client()
+    first = client.post('/api/game/initialize', json={'grid_size': 4, 'grid_type': 'linear'}).json['session_id']
+    second = client.post('/api/game/initialize', json={'grid_size': 9, 'grid_type': '2d'}).json['session_id']
+
+    client.post('/api/game/start-game', json={'session_id': first, 'human_role': 'hider'})
+    response = client.post('/api/game/play-round', json={'session_id': first, 'human_position': 1})
+    assert response.status_code == 200
+
+    first_state = client.get(f'/api/game/get-game-state?session_id={first}').json['game_state']
+    second_state = client.get(f'/api/game/get-game-state?session_id={second}').json['game_state']
+    assert first_state['round_number'] == 1 and first_state['grid_size'] == 4
+    assert second_state['round_number'] == 0 and second_state['grid_size'] == 9
+    assert not second_state['is_game_running']
+
+
+def test_missing_and_unknown_sessions_are_rejected():
+    client = app.test_client()
+
+    assert client.post('/api/game/start-game', json={'human_role': 'hider'}).status_code == 400
+    assert client.get('/api/game/get-game-state?session_id=unknown').status_code == 404
+    # JSON bodies that are not objects, or carry a non-string session_id, are bad requests
+    assert client.post('/api/game/play-round', json=[1]).status_code == 400
+    assert client.post('/api/game/play-round', json={'session_id': [1]}).status_code == 400
+
+    session_id = client.post('/api/game/initialize', json={'grid_size': 4}).json['session_id']
+    assert client.post('/api/game/close-session', json={'session_id': session_id}).status_code == 200
+    assert client.post('/api/game/reset-game', json={'session_id': session_id}).status_code == 404
+
+
+def test_edit_places():
+    client = app.test_client()
+    session_id = client.post('/api/game/initialize', json={'grid_size': 4, 'grid_type': 'linear'}).json['session_id']
+
+    response = client.post('/api/game/edit-places', json={'session_id': session_id, 'places': {'0': 'hard'}})
+    assert response.status_code == 200
+    assert response.json['place_types'][0] == 'HARD'
+    assert 'computer_strategy' not in response.json
+
+    for places in ({'9': 'HARD'}, {'0': 'LAVA'}, {}):
+        response = client.post('/api/game/edit-places', json={'session_id': session_id, 'places': places})
+        assert response.status_code == 400
+
+
+def test_play_rounds():
+    client = app.test_client()
+    session_id = client.post('/api/game/initialize', json={'grid_size': 9, 'grid_type': '2d'}).json['session_id']
+    client.post('/api/game/start-game', json={'session_id': session_id, 'human_role': 'seeker'})
+
+    response = client.post('/api/game/play-rounds', json={'session_id': session_id,
+                                                          'human_positions': [0, 4, 8, 4] * 50})
+    assert response.status_code == 200
+    rounds = response.json
+    assert len(rounds['computer_positions']) == len(rounds['seeker_wins']) == 200
+    assert rounds['round_number'] == 200
+    assert rounds['human_wins'] == sum(rounds['seeker_wins'])
+    assert abs(sum(rounds['human_score_changes']) - rounds['human_score']) < 1e-9
+
+    # One bad position rejects the whole batch
+    response = client.post('/api/game/play-rounds', json={'session_id': session_id, 'human_positions': [1, 9]})
+    assert response.status_code == 400
+    state = client.get(f'/api/game/get-game-state?session_id={session_id}').json['game_state']
+    assert state['round_number'] == 200
+
+
+def test_round_history_export():
+    client = app.test_client()
+    session_id = client.post('/api/game/initialize', json={'grid_size': 4, 'history_capacity': 100}).json['session_id']
+    client.post('/api/game/start-game', json={'session_id': session_id, 'human_role': 'hider'})
+    client.post('/api/game/play-rounds', json={'session_id': session_id, 'human_positions': [0, 1, 2, 3] * 30})
+
+    csv = client.get(f'/api/game/round-history?session_id={session_id}&chunk_size=7')
+    assert csv.mimetype == 'text/csv'
+    lines = csv.get_data(as_text=True).splitlines()
+    assert lines[0] == 'round_number,human_position,computer_position,winner,human_score_change,computer_score_change'
+    # The ring buffer keeps the latest 100 of the 120 rounds
+    assert len(lines) == 101 and lines[1].startswith('21,0,')
+
+    ndjson = client.get(f'/api/game/round-history?session_id={session_id}&format=ndjson')
+    rounds = [json.loads(line) for line in ndjson.get_data(as_text=True).splitlines()]
+    assert [record['round_number'] for record in rounds] == list(range(21, 121))
+    assert {record['winner'] for record in rounds} <= {'hider', 'seeker'}
+
+    assert client.get(f'/api/game/round-history?session_id={session_id}&format=xml').status_code == 400
+    assert client.post('/api/game/initialize', json={'history_capacity': -1}).status_code == 400
+    assert client.post('/api/game/initialize', json={'history_capacity': MAX_CAPACITY + 1}).status_code == 400
+
+    npy = client.get(f'/api/game/round-history?session_id={session_id}&format=npy&chunk_size=7')
+    records = np.load(io.BytesIO(npy.get_data()))
+    assert records['round_number'].tolist() == list(range(21, 121))
+
+
+def test_simulation_parameters_are_validated():
+    client = app.test_client()
+    for body in ({'confidence': 1.5}, {'seed': [1]}, {'seed': -1}, {'num_rounds': 0}, {'num_workers': 10 ** 6},
+                 {'num_replications': 0}, {'num_rounds': 10 ** 10}, {'num_replications': 10 ** 7}):
+        response = client.post('/api/game/run-monte-carlo', json={'grid_size': 4, 'num_rounds': 100, **body})
+        assert response.status_code == 400, body
+    for mode in ('exact', 'vectorized'):
+        for body in ({'confidence': 0}, {'seed': 'x'}, {'num_rounds': -5}):
+            response = client.post('/api/game/run-simulation', json={'grid_size': 4, 'mode': mode, **body})
+            assert response.status_code == 400, (mode, body)
+
+    response = client.post('/api/game/run-monte-carlo', json={'grid_size': 4, 'num_rounds': 1000, 'seed': '5'})
+    assert response.status_code == 200 and response.json['seed'] == '5'
@@ -0,0 +1,49 @@
+import json
+
+from src.app import app
+from src.controller.game_socket import handle_message
+from src.controller.session_registry import session_registry
+from src.game.gamefacade import MAX_BATCH_ROUNDS
+
+
+def start_session():
+    client = app.test_client()
+    session_id = client.post('/api/game/initialize', json={'grid_size': 4}).json['session_id']
+    client.post('/api/game/start-game', json={'session_id': session_id, 'human_role': 'hider'})
+    return client, session_registry.get(session_id)
+
+
+def test_single_and_batch_moves():
+    client, session = start_session()
+
+    reply = handle_message(session, json.dumps({'m': 2, 'id': 7}))
+    assert reply['id'] == 7 and reply['r'] == 1
+    assert reply['hs'] == reply['d'] and reply['cs'] == -reply['d']
+    assert reply['w'] in (0, 1)
+
+    reply = handle_message(session, json.dumps({'m': [0, 1, 3]}))
+    assert reply['r'] == 4 and len(reply['c']) == len(reply['w']) == len(reply['d']) == 3
+
+    # Moves over the socket and over REST play the same game
+    state = client.get(f'/api/game/get-game-state?session_id={session.session_id}').json['game_state']
+    assert state['round_number'] == 4 and state['human_score'] == reply['hs']
+
+
+def test_bad_messages_get_error_replies():
+    _, session = start_session()
+
+    assert 'e' in handle_message(session, 'not json')
+    assert 'e' in handle_message(session, json.dumps({'move': 1}))
+    assert 'e' in handle_message(session, json.dumps({'m': 9, 'id': 'a'}))
+    assert handle_message(session, json.dumps({'m': 'x', 'id': 'b'}))['id'] == 'b'
+    # Non-integer moves are refused the same way for single moves, batches and REST
+    for move in (1.5, True, [1.5], [True]):
+        assert 'e' in handle_message(session, json.dumps({'m': move}))
+    client = app.test_client()
+    for move in (1.5, True):
+        response = client.post('/api/game/play-round', json={'session_id': session.session_id, 'human_position': move})
+        assert response.status_code == 400
+    # Batches are capped like /play-rounds
+    assert 'e' in handle_message(session, json.dumps({'m': [0] * (MAX_BATCH_ROUNDS + 1)}))
+    assert session.game.round_number == 0
+    assert len(session.game.history) == 0
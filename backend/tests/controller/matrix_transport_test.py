@@ -0,0 +1,77 @@
+import base64
+import gzip
+import io
+import zlib
+
+import numpy as np
+
+from src.app import app
+from src.controller.matrix_encoding import encode_matrix, parse_matrix_options
+from src.controller.session_registry import session_registry
+
+
+def decode(envelope):
+    payload = base64.b64decode(envelope['data'])
+    if envelope['compression'] == 'zlib':
+        payload = zlib.decompress(payload)
+    elif envelope['compression'] == 'gzip':
+        payload = gzip.decompress(payload)
+    return np.frombuffer(payload, dtype=envelope['dtype']).reshape(envelope['shape'])
+
+
+def test_base64_envelopes_round_trip():
+    matrix = np.arange(12, dtype=float).reshape(3, 4) / 8
+    for dtype in ('float64', 'float32'):
+        for compression in (None, 'zlib', 'gzip'):
+            options = parse_matrix_options({'matrix_format': 'base64', 'dtype': dtype, 'compression': compression})
+            assert np.array_equal(decode(encode_matrix(matrix, options)), matrix)
+
+    assert encode_matrix(matrix, parse_matrix_options({})) == matrix.tolist()
+
+
+def test_endpoints_negotiate_the_matrix():
+    client = app.test_client()
+    initialized = client.post('/api/game/initialize', json={'grid_size': 9, 'grid_type': '2d', 'include_matrix': False})
+    assert 'payoff_matrix' not in initialized.json
+    session_id = initialized.json['session_id']
+
+    state = client.get(f'/api/game/get-game-state?session_id={session_id}').json['game_state']
+    started = client.post('/api/game/start-game', json={'session_id': session_id, 'matrix_format': 'base64',
+                                                         'dtype': 'float32', 'compression': 'gzip'})
+    assert np.array_equal(decode(started.json['payoff_matrix']), np.array(state['payoff_matrix']))
+
+    response = client.post('/api/game/reset-game', json={'session_id': session_id, 'matrix_format': 'xml'})
+    assert response.status_code == 400
+    # Malformed options and bodies are bad requests as well
+    for body in ({'dtype': [1]}, {'matrix_format': {}}, {'compression': 5}):
+        assert client.post('/api/game/reset-game', json={'session_id': session_id, **body}).status_code == 400
+    assert client.post('/api/game/initialize', json=[1]).status_code == 400
+
+
+def test_payoff_matrix_tiles():
+    client = app.test_client()
+    session_id = client.post('/api/game/initialize', json={'grid_size': 16, 'grid_type': '2d'}).json['session_id']
+    full = np.array(client.get(f'/api/game/get-game-state?session_id={session_id}').json['game_state']['payoff_matrix'])
+
+    response = client.get(f'/api/game/payoff-matrix?session_id={session_id}&row_start=3&row_stop=7&col_start=5')
+    assert response.mimetype == 'application/octet-stream'
+    assert np.array_equal(np.load(io.BytesIO(response.data)), full[3:7, 5:])
+
+    response = client.get(f'/api/game/payoff-matrix?session_id={session_id}&compression=zlib')
+    assert response.headers['Content-Encoding'] == 'deflate'
+    assert np.array_equal(np.load(io.BytesIO(zlib.decompress(response.data))), full)
+
+    response = client.get(f'/api/game/payoff-matrix?session_id={session_id}&matrix_format=json&row_stop=2')
+    assert response.json['payoff_matrix'] == full[:2].tolist()
+
+    assert client.get(f'/api/game/payoff-matrix?session_id={session_id}&row_stop=17').status_code == 400
+
+
+def test_excluded_matrix_is_never_built():
+    client = app.test_client()
+    session_id = client.post('/api/game/initialize', json={'grid_size': 200, 'include_matrix': False}).json['session_id']
+    client.post('/api/game/start-game', json={'session_id': session_id, 'human_role': 'hider', 'include_matrix': False})
+    state = client.get(f'/api/game/get-game-state?session_id={session_id}&include_matrix=false').json['game_state']
+
+    assert 'payoff_matrix' not in state
+    assert session_registry.get(session_id).game.configuration._payoff_matrix is None
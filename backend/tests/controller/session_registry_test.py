@@ -0,0 +1,37 @@
+from src.controller.session_registry import SessionRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_session_is_evicted():
+    registry = SessionRegistry(capacity=2, ttl=None)
+    first = registry.create("first")
+    second = registry.create("second")
+    registry.get(first.session_id)
+    registry.create("third")
+
+    assert registry.get(second.session_id) is None
+    assert registry.get(first.session_id).game == "first"
+    assert registry.stats()["evicted"] == 1
+    assert registry.stats()["live"] == 2
+
+
+def test_idle_sessions_expire():
+    clock = FakeClock()
+    registry = SessionRegistry(capacity=10, ttl=30, clock=clock)
+    idle = registry.create("idle")
+    active = registry.create("active")
+
+    clock.now = 20
+    registry.get(active.session_id)
+    clock.now = 35
+
+    assert registry.get(idle.session_id) is None
+    assert registry.get(active.session_id) is not None
+    assert registry.stats()["expired"] == 1
@@ -0,0 +1,74 @@
+import json
+import threading
+
+import pytest
+
+from src.app import app
+from src.controller.simulation_jobs import JobQueueFull, SimulationJobQueue
+from src.game.montecarlo import MonteCarloSimulation
+
+
+class BlockingSimulation:
+    # Plays one-round chunks, each waiting for the test to release it
+    def __init__(self, release):
+        self.release = release
+
+    def stream_chunks(self, num_rounds):
+        for _ in range(num_rounds):
+            self.release.wait(timeout=5)
+            yield {"count": 1, "total": 1.0, "mean": 1.0, "m2": 0.0, "human_wins": 1}
+
+    def summarize(self, total, confidence=0.95):
+        return {"num_rounds": total["count"]}
+
+
+def test_full_queue_rejects_and_cancelled_jobs_stop():
+    queue = SimulationJobQueue(max_workers=1, max_queued=1)
+    release = threading.Event()
+    running = queue.submit(lambda: BlockingSimulation(release), 3)
+    queued = queue.submit(lambda: BlockingSimulation(release), 3)
+
+    with pytest.raises(JobQueueFull):
+        queue.submit(lambda: BlockingSimulation(release), 3)
+    assert queue.stats()["rejected"] == 1
+
+    queue.cancel(queued.job_id)
+    assert queued.status == "cancelled"
+    queue.cancel(running.job_id)
+    release.set()
+    running.future.result(timeout=5)
+
+    assert running.status == "cancelled"
+    assert running.result is None
+    assert queue.status(running)["rounds_done"] < 3
+    # Finished jobs free their slots
+    assert queue.submit(lambda: BlockingSimulation(release), 1).future.result(timeout=5) is None
+
+
+def test_job_matches_synchronous_monte_carlo_and_streams_progress():
+    client = app.test_client()
+    submitted = client.post('/api/game/simulation-jobs',
+                            json={'grid_size': 5, 'seed': 7, 'num_rounds': 25000, 'chunk_size': 10000})
+    assert submitted.status_code == 202
+    job_id = submitted.json['job_id']
+
+    events = client.get(f'/api/game/simulation-jobs/{job_id}/events')
+    assert events.mimetype == 'text/event-stream'
+    messages = [message for message in events.get_data(as_text=True).split('\n\n') if message.startswith('event')]
+    names = [message.split('\n')[0] for message in messages]
+    assert names[-1] == 'event: completed'
+    progress = [json.loads(message.split('data: ')[1])['rounds_done'] for message in messages]
+    assert progress == sorted(progress) and progress[-1] == 25000
+
+    result = client.get(f'/api/game/simulation-jobs/{job_id}/result').json
+    expected = MonteCarloSimulation(5, seed=7, chunk_size=10000).run(25000)
+    assert result['score_mean'] == pytest.approx(expected['score_mean'])
+    assert result['human_wins'] == expected['human_wins']
+    assert result['seed'] == '7'
+
+    status = client.get(f'/api/game/simulation-jobs/{job_id}').json['job']
+    assert status['status'] == 'completed' and status['progress'] == 1.0
+    assert client.get('/api/game/simulation-jobs/unknown').status_code == 404
+
+    for body in ({'chunk_size': 10 ** 9}, {'num_rounds': 10 ** 12}, {'num_rounds': 0}, {'confidence': 1}):
+        assert client.post('/api/game/simulation-jobs', json={'grid_size': 4, **body}).status_code == 400
@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.game.alias_sampler import AliasSampler
+from src.game.gamefacade import GameFacade, PlayerRole
+from src.game.gamelogic.gamegrid.place_type import PlaceType
+
+
+def test_batch_draws_follow_the_strategy():
+    probabilities = np.array([0.5, 0.0, 0.2, 0.25, 0.05, -1e-12])
+    sampler = AliasSampler(probabilities)
+
+    draws = sampler.sample_many(200_000, np.random.default_rng(0))
+    frequencies = np.bincount(draws, minlength=len(probabilities)) / len(draws)
+
+    assert np.allclose(frequencies, np.maximum(probabilities, 0), atol=5e-3)
+    # Positions without probability mass are never drawn
+    assert frequencies[1] == 0 and frequencies[5] == 0
+
+
+def test_single_draws_are_seeded():
+    sampler = AliasSampler([0.1, 0.6, 0.3])
+    first = [sampler.sample(np.random.default_rng(5)) for _ in range(3)]
+    rng = np.random.default_rng(5)
+    draws = [sampler.sample(rng) for _ in range(1000)]
+
+    assert len(set(first)) == 1
+    assert set(draws) <= {0, 1, 2}
+    assert np.isclose(draws.count(1) / 1000, 0.6, atol=0.06)
+
+
+def test_facade_moves_are_reproducible():
+    moves = []
+    for _ in range(2):
+        facade = GameFacade(9, "2d", True, [PlaceType.HARD] * 3 + [PlaceType.EASY] * 6, rng=11)
+        facade.start_new_game(PlayerRole.HIDER)
+        moves.append([facade.get_computer_move() for _ in range(50)])
+
+    assert moves[0] == moves[1]
+    support = np.flatnonzero(facade.computer_strategy["probabilities"] > 0)
+    assert set(moves[0]) <= set(support.tolist())
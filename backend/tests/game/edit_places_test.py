@@ -0,0 +1,57 @@
+import numpy as np
+
+from src.game.game_configuration import GameConfiguration
+from src.game.gamefacade import GameFacade, PlayerRole
+from src.game.gamelogic.gamegrid.place_type import PlaceType
+from src.linearprogramming.lp_gamesolver import solve_game
+
+
+def test_edited_payoffs_match_a_fresh_grid():
+    for size, grid_type, use_proximity in ((7, "linear", False), (7, "linear", True), (16, "2d", True)):
+        configuration = GameConfiguration(size, grid_type, use_proximity)
+        changes = {0: PlaceType.HARD, 5: PlaceType.EASY, size - 1: PlaceType.NEUTRAL}
+        edited = configuration.edited(changes)
+
+        place_types = list(configuration.place_types)
+        for position, place_type in changes.items():
+            place_types[position] = place_type
+        fresh = GameConfiguration(size, grid_type, use_proximity, place_types)
+
+        assert edited.place_types == fresh.place_types
+        assert np.array_equal(edited.payoff_matrix, fresh.payoff_matrix)
+        assert np.isclose(edited.equilibrium["expected_value"], fresh.equilibrium["expected_value"])
+
+
+def test_still_optimal_equilibrium_is_reused():
+    place_types = [PlaceType.NEUTRAL] * 8
+    payoff = GameConfiguration(8, "linear", True, place_types).structured_payoff_matrix
+    previous = solve_game(payoff)
+
+    result = solve_game(payoff, initial_strategies=(previous["hider_probabilities"],
+                                                    previous["seeker_probabilities"]))
+    assert result["reused_equilibrium"]
+    assert np.isclose(result["expected_value"], previous["expected_value"])
+
+    # Strategies that are no equilibrium are not reused, the game is solved from scratch
+    uniform = np.full(8, 1 / 8)
+    assert "reused_equilibrium" not in solve_game(payoff, initial_strategies=(np.eye(8)[0], uniform))
+
+
+def test_facade_keeps_counters_across_edits():
+    facade = GameFacade(4, "linear", True, [PlaceType.EASY, PlaceType.HARD, PlaceType.NEUTRAL, PlaceType.EASY])
+    facade.start_new_game(PlayerRole.SEEKER)
+    facade.play_round(1)
+
+    result = facade.edit_places({2: PlaceType.HARD})
+    assert result["place_types"] == ["EASY", "HARD", "HARD", "EASY"]
+    assert facade.round_number == 1
+    assert np.allclose(result["computer_strategy"]["probabilities"], facade.equilibrium["hider_probabilities"])
+
+
+def test_edit_does_not_build_the_dense_matrix():
+    facade = GameFacade(300, "linear", True)
+    facade.start_new_game(PlayerRole.SEEKER)
+    facade.edit_places({0: PlaceType.HARD, 150: PlaceType.EASY})
+
+    assert facade.configuration._payoff_matrix is None
+    assert facade.equilibrium["duality_gap"] < 1e-6
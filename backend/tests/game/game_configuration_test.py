@@ -0,0 +1,62 @@
+import pickle
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from src.game.game_configuration import ConfigurationStore
+from src.game.gamefacade import GameFacade, PlayerRole
+from src.game.gamelogic.gamegrid.place_type import PlaceType
+
+
+def test_equal_grids_share_one_configuration():
+    place_types = [PlaceType.EASY, PlaceType.HARD, PlaceType.NEUTRAL, PlaceType.EASY]
+    first = GameFacade(4, "linear", True, place_types)
+    second = GameFacade(4, "linear", True, place_types)
+    other = GameFacade(4, "linear", False, place_types)
+
+    assert first.configuration is second.configuration
+    assert first.configuration is not other.configuration
+
+    first.start_new_game(PlayerRole.HIDER)
+    second.start_new_game(PlayerRole.SEEKER)
+    assert first.equilibrium is second.equilibrium
+    assert first.computer_strategy["probabilities"] is first.equilibrium["seeker_probabilities"]
+
+
+def test_payoff_matrix_is_read_only_and_sessions_are_small():
+    facade = GameFacade(100, "2d", True)
+
+    with pytest.raises(ValueError):
+        facade.payoff_matrix[0, 0] = 1
+    assert not hasattr(facade, "__dict__")
+
+    # Everything an idle game allocates beyond the shared configuration, history and RNG included
+    place_types = facade.configuration.place_types
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        games = [GameFacade(100, "2d", True, place_types) for _ in range(1000)]
+        per_game = (tracemalloc.get_traced_memory()[0] - before) / len(games)
+    finally:
+        tracemalloc.stop()
+    assert all(game.configuration is facade.configuration for game in games)
+    assert per_game < 300
+
+
+def test_unused_configurations_are_released():
+    store = ConfigurationStore()
+    configuration = store.intern(9, "2d", True)
+    assert len(store) == 1
+
+    del configuration
+    assert len(store) == 0
+
+
+def test_configurations_survive_pickling():
+    facade = GameFacade(9, "2d", True)
+    facade.start_new_game(PlayerRole.SEEKER)
+
+    copy = pickle.loads(pickle.dumps(facade))
+    assert np.array_equal(copy.payoff_matrix, facade.payoff_matrix)
+    assert np.array_equal(copy.computer_strategy["probabilities"], facade.computer_strategy["probabilities"])
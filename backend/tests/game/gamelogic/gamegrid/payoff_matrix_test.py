@@ -0,0 +1,34 @@
+import numpy as np
+
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+
+
+def reference_payoff_matrix(world, use_proximity):
+    # Cell-by-cell construction the vectorized grids must reproduce
+    payoff = np.zeros((world.size, world.size))
+    for hider_pos in range(world.size):
+        for seeker_pos in range(world.size):
+            if hider_pos == seeker_pos:
+                payoff[hider_pos][seeker_pos] = -world.get_place_score(seeker_pos, "seeker")
+            else:
+                payoff[hider_pos][seeker_pos] = world.get_place_score(hider_pos, "hider")
+                if use_proximity:
+                    distance = world._calculate_distance(hider_pos, seeker_pos)
+                    payoff[hider_pos][seeker_pos] *= world._apply_proximity_multiplier(distance)
+    return payoff
+
+
+def test_linear_payoff_matches_reference():
+    world = create_game_grid(12, grid_type="linear", use_proximity=False)
+    assert np.array_equal(world.get_payoff_matrix(), reference_payoff_matrix(world, False))
+
+
+def test_linear_proximity_payoff_matches_reference():
+    world = create_game_grid(12, grid_type="linear", use_proximity=True)
+    assert np.array_equal(world.get_payoff_matrix(), reference_payoff_matrix(world, True))
+
+
+def test_2d_payoff_matches_reference():
+    for size in (9, 16, 25):
+        world = create_game_grid(size, grid_type="2d")
+        assert np.array_equal(world.get_payoff_matrix(), reference_payoff_matrix(world, True))
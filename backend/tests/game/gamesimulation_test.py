@@ -0,0 +1,105 @@
+import numpy as np
+
+from src.game.gamefacade import GameFacade, PlayerRole
+from src.game.gamesimulation import GameSimulation
+
+
+def final_state(facade):
+    state = facade.get_game_state()
+    return {key: state[key] for key in ("human_score", "computer_score", "human_wins", "computer_wins",
+                                        "round_number")}
+
+
+class ScriptedFacade(GameFacade):
+    # The computer replays a fixed list of moves instead of sampling its strategy
+    __slots__ = ("moves",)
+
+    def get_computer_move(self):
+        return int(next(self.moves))
+
+
+def play_one_by_one(facade, human_positions, computer_positions):
+    facade.moves = iter(computer_positions)
+    for human_position in human_positions:
+        facade.play_round(int(human_position))
+
+
+def test_vectorized_rounds_match_round_by_round_play():
+    rng = np.random.default_rng(3)
+    for size, grid_type, use_proximity in ((6, "linear", False), (6, "linear", True), (16, "2d", True)):
+        for role in (PlayerRole.HIDER, PlayerRole.SEEKER):
+            looped = ScriptedFacade(size, grid_type, use_proximity)
+            vectorized = GameFacade(size, grid_type, use_proximity, looped.game_grid.place_types)
+            looped.start_new_game(role)
+            vectorized.start_new_game(role)
+
+            human_positions = rng.integers(0, size, 500)
+            computer_positions = rng.integers(0, size, 500)
+            play_one_by_one(looped, human_positions, computer_positions)
+            vectorized._apply_rounds(human_positions, computer_positions)
+
+            assert final_state(looped) == final_state(vectorized)
+            assert type(looped.human_score) is type(vectorized.human_score)
+
+
+def test_vectorized_simulation_is_seeded_and_chunked():
+    simulation = GameSimulation(9, "2d", True)
+    simulation.setup_simulation()
+    simulation.simulate_rounds(10_000, rng=42, chunk_size=10_000)
+    whole = final_state(simulation.game_facade)
+
+    simulation.game_facade.start_new_game(PlayerRole.SEEKER)
+    simulation.simulate_rounds(10_000, rng=42, chunk_size=10_000)
+    assert final_state(simulation.game_facade) == whole
+    assert whole["round_number"] == 10_000
+    assert whole["human_wins"] + whole["computer_wins"] == 10_000
+
+    # Each chunk draws all seeker moves, then all hider moves, so the bits depend on the
+    # chunk size; the totals and the distribution of the outcome do not
+    exact = simulation.compute_exact_outcome(num_rounds=100_000, confidence=0.999)
+    for chunk_size in (100_000, 7_000):
+        simulation.game_facade.start_new_game(PlayerRole.SEEKER)
+        simulation.simulate_rounds(100_000, rng=42, chunk_size=chunk_size)
+        chunked = final_state(simulation.game_facade)
+        assert chunked["round_number"] == chunked["human_wins"] + chunked["computer_wins"] == 100_000
+        low, high = exact["human_score_interval"]
+        assert low <= chunked["human_score"] <= high
+        low, high = exact["human_wins_interval"]
+        assert low <= chunked["human_wins"] <= high
+
+    simulation.run_simulation(2_500, vectorized=True, rng=1)
+    assert simulation.game_facade.round_number == 2_500
+
+
+def test_exact_outcome_matches_enumeration_of_all_rounds():
+    for size, grid_type, use_proximity in ((6, "linear", False), (7, "linear", True), (16, "2d", True)):
+        simulation = GameSimulation(size, grid_type, use_proximity)
+        simulation.setup_simulation()
+        exact = simulation.compute_exact_outcome(num_rounds=1_000_000)
+
+        # Weight every (hider, seeker) pair by its probability under the two mixes
+        hider_positions, seeker_positions = np.meshgrid(np.arange(size), np.arange(size), indexing="ij")
+        seeker_wins, changes = simulation.game_facade._evaluate_rounds(hider_positions.ravel(), seeker_positions.ravel())
+        weights = np.outer(simulation.game_facade.computer_strategy["probabilities"], simulation.seeker_strategy).ravel()
+        weights = weights / weights.sum()
+
+        mean = weights @ changes
+        assert np.isclose(exact["round_score_mean"], mean)
+        assert np.isclose(exact["round_score_variance"], weights @ (changes - mean) ** 2)
+        assert np.isclose(exact["win_probability"], weights @ seeker_wins)
+        assert np.isclose(exact["expected_human_score"], 1_000_000 * mean)
+
+
+def test_play_rounds_matches_round_by_round_play():
+    for role in (PlayerRole.HIDER, PlayerRole.SEEKER):
+        batched = GameFacade(16, "2d", True, rng=5)
+        looped = ScriptedFacade(16, "2d", True, batched.game_grid.place_types)
+        batched.start_new_game(role)
+        looped.start_new_game(role)
+
+        human_positions = np.random.default_rng(8).integers(0, 16, 300)
+        rounds = batched.play_rounds(human_positions)
+        play_one_by_one(looped, human_positions, rounds["computer_positions"])
+
+        assert final_state(looped) == final_state(batched)
+        assert rounds["round_number"] == 300
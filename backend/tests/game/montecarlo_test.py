@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+
+from src.game import montecarlo
+from src.game.montecarlo import MonteCarloSimulation, _split
+
+
+def test_same_seed_and_workers_reproduce_results():
+    first = MonteCarloSimulation(9, "2d", True, seed=1234, num_workers=2, chunk_size=7_000).run(50_000)
+    second = MonteCarloSimulation(9, "2d", True, seed=1234, num_workers=2, chunk_size=7_000).run(50_000)
+
+    assert first == second
+    assert first["num_rounds"] == 50_000
+    assert first["human_wins"] + first["computer_wins"] == 50_000
+
+
+def test_intervals_cover_the_estimates():
+    result = MonteCarloSimulation(6, "linear", True, seed=5).run(20_000, num_replications=8)
+
+    low, high = result["score_mean_interval"]
+    assert low <= result["score_mean"] <= high
+    low, high = result["win_rate_interval"]
+    assert 0 <= low <= result["win_rate"] <= high <= 1
+    assert result["num_rounds"] == 8 * 20_000
+    assert np.isclose(result["replication_score_mean"] * 8, result["human_score"])
+
+
+def test_seed_also_fixes_the_grid():
+    first = MonteCarloSimulation(8, "linear", False, seed=9)
+    second = MonteCarloSimulation(8, "linear", False, seed=9)
+
+    assert first.simulation.game_facade.game_grid.place_types == second.simulation.game_facade.game_grid.place_types
+
+
+def test_rounds_are_split_like_array_split():
+    for total, parts in ((10, 3), (2, 5), (10 ** 6 + 7, 4)):
+        assert _split(total, parts) == [len(part) for part in np.array_split(np.arange(total), parts)]
+
+
+def test_runs_share_one_process_pool():
+    MonteCarloSimulation(5, seed=1, num_workers=2).run(1_000)
+    executor = montecarlo._executor
+    MonteCarloSimulation(5, seed=2, num_workers=2).run(1_000)
+
+    assert montecarlo._executor is executor and executor._max_workers == os.cpu_count()
@@ -0,0 +1,65 @@
+import io
+
+import numpy as np
+
+from src.game.gamefacade import GameFacade, PlayerRole
+from src.game.round_history import RoundHistory, iter_npy
+
+
+def test_ring_buffer_keeps_the_latest_rounds():
+    history = RoundHistory(capacity=4)
+    for round_number in range(1, 4):
+        history.append(round_number, 0, 1, False, -1.0)
+    history.extend(np.arange(4, 11), np.arange(7), np.zeros(7), np.ones(7, dtype=bool), np.full(7, 2.0))
+
+    records = history.read(history.start, history.stop)
+    assert len(history) == 4
+    assert records["round_number"].tolist() == [7, 8, 9, 10]
+    assert records["winner"].tolist() == [1, 1, 1, 1]
+    assert records["computer_score_change"].tolist() == [-2.0] * 4
+
+    # A reader that started before a clear() stops instead of returning newer rounds
+    chunks = history.chunks(chunk_size=2)
+    first = next(chunks)
+    history.clear()
+    history.append(1, 0, 0, True, 1.0)
+    assert first["round_number"].tolist() == [7, 8]
+    assert list(chunks) == []
+
+
+def test_history_matches_played_rounds_and_exports_npy():
+    game = GameFacade(5, rng=1)
+    game.start_new_game(PlayerRole.SEEKER)
+    results = [game.play_round(position) for position in (0, 3, 4)]
+    batch = game.play_rounds(np.arange(500) % 5)
+
+    records = np.concatenate(list(game.history.chunks(chunk_size=128)))
+    assert records["round_number"].tolist() == list(range(1, 504))
+    assert records["computer_position"][:3].tolist() == [result["computer_position"] for result in results]
+    assert records["human_position"][3:].tolist() == (np.arange(500) % 5).tolist()
+    assert np.array_equal(records["winner"][3:], batch["seeker_wins"])
+    assert records["human_score_change"].sum() == game.human_score
+
+    history = game.history
+    exported = np.load(io.BytesIO(b"".join(iter_npy(history.read(history.start, history.stop), chunk_size=100))))
+    assert np.array_equal(exported, records)
+
+    game.start_new_game(PlayerRole.HIDER)
+    assert len(game.history) == 0
+
+
+def test_bounded_history_grows_only_up_to_its_capacity():
+    history = RoundHistory(capacity=1000)
+    assert history.nbytes == 0 and len(history.read(0, 10)) == 0
+    history.extend(np.arange(10), np.zeros(10), np.zeros(10), np.zeros(10, dtype=bool), np.zeros(10))
+    assert history.nbytes == 64 * 25
+
+    history.extend(np.arange(10, 5000), np.zeros(4990), np.zeros(4990), np.zeros(4990, dtype=bool), np.zeros(4990))
+    assert history.nbytes == 1000 * 25
+    assert history.read(history.start, history.stop)["round_number"].tolist() == list(range(4000, 5000))
+
+    history.clear()
+    assert history.nbytes == 0
+    history.append(1, 2, 3, True, 1.0)
+    assert history.nbytes == 64 * 25
+    assert history.read(history.start, history.stop)["human_position"].tolist() == [2]
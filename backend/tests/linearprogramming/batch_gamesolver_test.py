@@ -0,0 +1,29 @@
+import numpy as np
+
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.linearprogramming.batch_gamesolver import solve_payoff_matrices
+from src.linearprogramming.lp_gamesolver import solve_game
+
+
+def test_batch_results_are_in_order_and_match_serial_solves():
+    matrices = [create_game_grid(size, grid_type="linear", use_proximity=True).get_payoff_matrix()
+                for size in range(3, 11)]
+
+    results = solve_payoff_matrices(matrices, max_workers=2, chunksize=3)
+
+    assert len(results) == len(matrices)
+    for payoff, result in zip(matrices, results):
+        assert result['error'] is None
+        assert len(result['hider_probabilities']) == payoff.shape[0]
+        assert np.isclose(result['expected_value'], solve_game(payoff)['expected_value'])
+
+
+def test_stacked_array_and_per_item_failures():
+    stacked = np.stack([create_game_grid(9, grid_type="2d").get_payoff_matrix() for _ in range(3)])
+    items = list(stacked) + [np.array([1.0, 2.0])]
+
+    results = solve_payoff_matrices(items, max_workers=1)
+
+    assert [result['error'] is None for result in results] == [True, True, True, False]
+    assert all(np.isclose(result['hider_probabilities'].sum(), 1) for result in results[:3])
+    assert len(solve_payoff_matrices(stacked, max_workers=1)) == 3
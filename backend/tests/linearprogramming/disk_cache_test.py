@@ -0,0 +1,73 @@
+import os
+
+import numpy as np
+
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.game.gamelogic.gamegrid.place_type import PlaceType
+from src.linearprogramming import equilibrium_cache
+from src.linearprogramming.disk_cache import DiskEquilibriumCache
+from src.linearprogramming.equilibrium_cache import EquilibriumCache, cached_solve_game, make_cache_key
+from src.linearprogramming.lp_gamesolver import solve_game
+from src.linearprogramming.structured_payoff_matrix import StructuredPayoffMatrix
+
+PLACE_TYPES = [PlaceType.EASY, PlaceType.HARD, PlaceType.NEUTRAL, PlaceType.HARD, PlaceType.EASY, PlaceType.NEUTRAL]
+
+
+def test_entries_survive_a_restart(tmp_path):
+    payoff = create_game_grid(6, "linear", True, PLACE_TYPES).get_structured_payoff_matrix()
+    disk_cache = DiskEquilibriumCache(str(tmp_path))
+    solved = cached_solve_game(payoff, "linear", True, PLACE_TYPES, cache=EquilibriumCache(), disk_cache=disk_cache)
+    assert disk_cache.misses == 1
+    assert os.listdir(tmp_path) == [f"{make_cache_key(payoff, 'linear', True, PLACE_TYPES)[0]}.npy"]
+
+    # A new process starts with empty in-memory caches
+    restarted = DiskEquilibriumCache(str(tmp_path))
+    result = cached_solve_game(payoff, "linear", True, PLACE_TYPES, cache=EquilibriumCache(), disk_cache=restarted)
+    assert restarted.hits == 1 and restarted.misses == 0
+    assert np.array_equal(result["hider_probabilities"], solved["hider_probabilities"])
+    assert result["expected_value"] == solved["expected_value"]
+
+    # Warming up fills the in-memory cache, so the disk is not read again
+    cache = EquilibriumCache()
+    assert restarted.warm_up(cache) == 1
+    result = cached_solve_game(payoff, "linear", True, PLACE_TYPES, cache=cache, disk_cache=restarted)
+    assert cache.hits == 1 and restarted.hits == 1
+    assert np.array_equal(result["seeker_probabilities"], solved["seeker_probabilities"])
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    # Changed scoring (here one row constant) must not be answered by the old entry
+    rescored = StructuredPayoffMatrix(payoff.row_values + np.eye(6)[0], payoff.correction)
+    cached_solve_game(rescored, "linear", True, PLACE_TYPES, cache=EquilibriumCache(), disk_cache=restarted)
+    assert restarted.misses == 1 and len(os.listdir(tmp_path)) == 2
+
+
+def test_unconverged_results_are_not_persisted(tmp_path, monkeypatch):
+    grid = create_game_grid(6, "linear", True, PLACE_TYPES)
+    payoff = grid.get_structured_payoff_matrix()
+    unconverged = dict(solve_game(payoff), duality_gap=1e-3)
+    monkeypatch.setattr(equilibrium_cache, "solve_game", lambda *args, **kwargs: unconverged)
+
+    disk_cache = DiskEquilibriumCache(str(tmp_path))
+    cached_solve_game(payoff, "linear", True, PLACE_TYPES, method="iterative", cache=EquilibriumCache(),
+                      disk_cache=disk_cache, tolerance=1e-4)
+    assert os.listdir(tmp_path) == []
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    entry = {"hider_probabilities": np.full(6, 1 / 6), "seeker_probabilities": np.full(6, 1 / 6),
+             "expected_value": 0.5, "duality_gap": 0.0}
+    disk_cache = DiskEquilibriumCache(str(tmp_path))
+    for i, digest in enumerate("abcd"):
+        disk_cache.put(digest, entry)
+        # Distinct modification times, oldest first
+        os.utime(os.path.join(str(tmp_path), f"{digest}.npy"), (i, i))
+    entry_size = os.path.getsize(os.path.join(str(tmp_path), "a.npy"))
+
+    disk_cache.configure(str(tmp_path), max_bytes=2 * entry_size)
+    disk_cache.put("a", entry)
+
+    assert len(os.listdir(tmp_path)) == 2
+    assert disk_cache.get("a") is not None and disk_cache.get("d") is not None
+    assert disk_cache.get("b") is None
+    assert np.array_equal(disk_cache.get("a")["seeker_probabilities"], entry["seeker_probabilities"])
+    assert disk_cache.stats()["hits"] == 3 and disk_cache.stats()["misses"] == 1
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.linearprogramming.dominance import eliminate_dominated_strategies
+from src.linearprogramming.lp_gamesolver import solve_game
+
+
+def test_iterated_strict_elimination():
+    # Row 2 is dominated by row 0, which then makes column 2 dominated by column 1,
+    # which in turn leaves row 1 dominated by row 0
+    payoff = np.array([
+        [3.0, 2.0, 4.0],
+        [1.0, 1.0, 5.0],
+        [2.0, 1.0, 3.0]
+    ])
+    hider_indices, seeker_indices = eliminate_dominated_strategies(payoff)
+
+    assert hider_indices.tolist() == [0]
+    assert seeker_indices.tolist() == [1]
+
+
+def test_weak_elimination_keeps_ties():
+    payoff = np.array([
+        [1.0, 2.0],
+        [1.0, 2.0],
+        [1.0, 1.0]
+    ])
+    assert eliminate_dominated_strategies(payoff)[0].tolist() == [0, 1, 2]
+    # Identical rows survive together, the weakly dominated one goes
+    assert eliminate_dominated_strategies(payoff, weak=True)[0].tolist() == [0, 1]
+
+
+def test_reduced_solve_maps_back_to_full_size():
+    rng = np.random.default_rng(7)
+    payoff = rng.uniform(0, 1, size=(12, 10))
+    # Make a few rows clearly worse and a few columns clearly worse for the seeker
+    payoff[[2, 5, 9]] -= 2
+    payoff[:, [1, 4]] += 2
+
+    full = solve_game(payoff)
+    reduced = solve_game(payoff, dominance="strict")
+
+    assert np.isclose(reduced['expected_value'], full['expected_value'])
+    assert reduced['hider_probabilities'].shape == (12,)
+    assert reduced['seeker_probabilities'].shape == (10,)
+    assert np.all(reduced['hider_probabilities'][[2, 5, 9]] == 0)
+    assert np.all(reduced['seeker_probabilities'][[1, 4]] == 0)
+    assert abs(reduced['duality_gap']) < 1e-7
+    assert reduced['removed_strategies']['hider'] >= 3
+    assert reduced['removed_strategies']['seeker'] >= 2
+
+
+def test_grid_games_are_unchanged():
+    payoff = create_game_grid(9, grid_type="2d", use_proximity=True).get_payoff_matrix()
+    result = solve_game(payoff, dominance="weak")
+
+    assert result['removed_strategies'] == {'hider': 0, 'seeker': 0}
+    assert np.isclose(result['expected_value'], solve_game(payoff)['expected_value'])
+
+
+def test_structured_payoffs_are_refused():
+    payoff = create_game_grid(5, grid_type="linear", use_proximity=True).get_structured_payoff_matrix()
+
+    with pytest.raises(ValueError):
+        solve_game(payoff, dominance="strict")
+    with pytest.raises(ValueError):
+        solve_game(payoff.toarray(), dominance="strong")
+    assert 'removed_strategies' in solve_game(payoff.toarray(), dominance="strict")
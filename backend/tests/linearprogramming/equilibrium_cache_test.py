@@ -0,0 +1,73 @@
+import numpy as np
+
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.game.gamelogic.gamegrid.place_type import PlaceType
+from src.linearprogramming import equilibrium_cache
+from src.linearprogramming.equilibrium_cache import EquilibriumCache, cached_solve_payoff_matrix, make_cache_key
+from src.linearprogramming.lp_gamesolver import solve_game, solve_payoff_matrix
+
+
+def make_world(place_types, use_proximity=False):
+    world = create_game_grid(len(place_types), grid_type="linear", use_proximity=use_proximity)
+    world.place_types = list(place_types)
+    return world
+
+
+def test_repeated_configuration_hits_cache():
+    cache = EquilibriumCache(max_size=4)
+    world = make_world([PlaceType.EASY, PlaceType.HARD, PlaceType.NEUTRAL], use_proximity=True)
+    payoff = world.get_payoff_matrix()
+
+    first = cached_solve_payoff_matrix(payoff, "linear", True, world.place_types, "hider", cache=cache)
+    second = cached_solve_payoff_matrix(payoff, "linear", True, world.place_types, "hider", cache=cache)
+
+    assert np.array_equal(first[0], second[0])
+    assert cache.stats() == {"size": 1, "max_size": 4, "hits": 1, "misses": 1}
+
+
+def test_permuted_linear_grids_share_one_solve():
+    cache = EquilibriumCache()
+    original = make_world([PlaceType.NEUTRAL, PlaceType.EASY, PlaceType.HARD, PlaceType.EASY])
+    permuted = make_world([PlaceType.HARD, PlaceType.EASY, PlaceType.EASY, PlaceType.NEUTRAL])
+
+    cached_solve_payoff_matrix(original.get_payoff_matrix(), "linear", False, original.place_types, "seeker",
+                               cache=cache)
+    probabilities, value = cached_solve_payoff_matrix(permuted.get_payoff_matrix(), "linear", False,
+                                                      permuted.place_types, "seeker", cache=cache)
+    expected_probabilities, expected_value = solve_payoff_matrix(permuted.get_payoff_matrix(), "seeker")
+
+    assert cache.hits == 1 and cache.misses == 1
+    assert np.isclose(value, expected_value)
+    # Structured payoffs are keyed in the same sorted order
+    assert make_cache_key(original.get_structured_payoff_matrix(), "linear", False, original.place_types)[0] == \
+        make_cache_key(permuted.get_structured_payoff_matrix(), "linear", False, permuted.place_types)[0]
+    assert np.allclose(probabilities, expected_probabilities)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = EquilibriumCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_iterative_entries_depend_on_tolerance_and_convergence(monkeypatch):
+    world = make_world([PlaceType.EASY, PlaceType.HARD, PlaceType.NEUTRAL], use_proximity=True)
+    payoff = world.get_payoff_matrix()
+    assert make_cache_key(payoff, "linear", True, world.place_types, "iterative", 1e-4)[0] != \
+        make_cache_key(payoff, "linear", True, world.place_types, "iterative", 1e-8)[0]
+    assert make_cache_key(payoff, "linear", True, world.place_types, "lp", 1e-4)[0] == \
+        make_cache_key(payoff, "linear", True, world.place_types, "lp", 1e-8)[0]
+
+    unconverged = dict(solve_game(payoff), duality_gap=1e-3)
+    monkeypatch.setattr(equilibrium_cache, "solve_game", lambda *args, **kwargs: unconverged)
+    cache = EquilibriumCache()
+    result = cached_solve_payoff_matrix(payoff, "linear", True, world.place_types, method="iterative", cache=cache,
+                                        tolerance=1e-4)
+
+    assert np.array_equal(result[0], unconverged["hider_probabilities"])
+    assert len(cache) == 0
@@ -0,0 +1,66 @@
+import logging
+import os
+
+import numpy as np
+
+from src.game import game_configuration
+from src.game.game_configuration import GameConfiguration
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.game.gamelogic.gamegrid.place_type import PlaceType
+from src.linearprogramming.equilibrium_table import (EquilibriumTable, build_tables, decode_index,
+                                                     encode_place_types, table_path)
+from src.linearprogramming.lp_gamesolver import solve_game
+
+
+def test_base3_encoding_round_trips():
+    place_types = [PlaceType.HARD, PlaceType.EASY, PlaceType.NEUTRAL]
+    assert encode_place_types(place_types) == 2 * 9 + 0 * 3 + 1
+    assert decode_index(encode_place_types(place_types), 3) == place_types
+    assert [encode_place_types(decode_index(i, 4)) for i in range(81)] == list(range(81))
+
+
+def test_lookup_matches_the_solver(tmp_path):
+    build_tables(str(tmp_path), variants=[("linear", False, 3), ("linear", True, 4)], max_workers=1)
+    table = EquilibriumTable(str(tmp_path))
+
+    for use_proximity, size in ((False, 3), (True, 4)):
+        for index in (0, 17, 3 ** size - 1):
+            place_types = decode_index(index, size)
+            expected = solve_game(create_game_grid(size, "linear", use_proximity, place_types).get_payoff_matrix())
+            result = table.lookup("linear", use_proximity, place_types)
+
+            assert np.isclose(result["expected_value"], expected["expected_value"])
+            assert np.allclose(result["hider_probabilities"], expected["hider_probabilities"])
+            assert np.isclose(result["seeker_probabilities"].sum(), 1)
+
+    # Variants that were not built fall back to solving
+    assert table.lookup("2d", True, decode_index(0, 9)) is None
+    assert table.lookup("linear", True, decode_index(0, 5)) is None
+
+
+def test_configuration_reads_the_table(tmp_path, monkeypatch):
+    build_tables(str(tmp_path), variants=[("linear", True, 3)], max_workers=1)
+    table = EquilibriumTable(str(tmp_path))
+    monkeypatch.setattr(game_configuration, "equilibrium_table", table)
+
+    equilibrium = GameConfiguration(3, "linear", True).equilibrium
+    assert isinstance(equilibrium["hider_probabilities"], np.memmap)
+
+
+def test_mismatched_tables_are_ignored(tmp_path, caplog, monkeypatch):
+    build_tables(str(tmp_path), variants=[("linear", False, 3)], max_workers=1)
+    # A table built for another variant, or in an older layout without the header row
+    os.replace(table_path(str(tmp_path), "linear", False, 3), table_path(str(tmp_path), "linear", True, 3))
+    np.save(table_path(str(tmp_path), "linear", False, 3), np.zeros((27, 8)))
+    table = EquilibriumTable(str(tmp_path))
+
+    with caplog.at_level(logging.WARNING):
+        for _ in range(2):
+            for use_proximity in (True, False):
+                assert table.lookup("linear", use_proximity, decode_index(0, 3)) is None
+    # Each file is rejected once, and the games fall back to solving
+    assert len(caplog.records) == 2
+
+    monkeypatch.setattr(game_configuration, "equilibrium_table", table)
+    equilibrium = GameConfiguration(3, "linear", False, decode_index(5, 3)).equilibrium
+    assert np.isclose(equilibrium["hider_probabilities"].sum(), 1)
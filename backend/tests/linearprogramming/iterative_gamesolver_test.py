@@ -0,0 +1,60 @@
+import numpy as np
+from scipy.sparse.linalg import aslinearoperator
+
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.linearprogramming.iterative_gamesolver import IterativeGameSolver
+from src.linearprogramming.lp_gamesolver import LPGameSolver, solve_game, solve_payoff_matrix
+
+
+def test_iterative_engine_matches_lp_on_small_grids():
+    for size, grid_type, use_proximity in ((5, "linear", False), (8, "linear", True), (9, "2d", True),
+                                           (16, "2d", True)):
+        payoff = create_game_grid(size, grid_type=grid_type, use_proximity=use_proximity).get_payoff_matrix()
+        lp_value = LPGameSolver(payoff).solve_for_hider()['expected_value']
+
+        result = solve_game(payoff, method="iterative", tolerance=1e-5)
+
+        assert result['converged']
+        assert result['exploitability'] <= 1e-5
+        assert abs(result['expected_value'] - lp_value) <= 1e-5
+        # Each mix guarantees the LP value up to the reported exploitability
+        assert np.min(result['hider_probabilities'] @ payoff) >= lp_value - 1e-5
+        assert np.max(payoff @ result['seeker_probabilities']) <= lp_value + 1e-5
+
+
+def test_matrix_free_operator_is_accepted():
+    payoff = create_game_grid(16, grid_type="2d").get_payoff_matrix()
+
+    dense = IterativeGameSolver(payoff, tolerance=1e-4).solve_both()
+    operator = IterativeGameSolver(aslinearoperator(payoff), tolerance=1e-4).solve_both()
+
+    assert operator['converged']
+    assert np.allclose(dense['hider_probabilities'], operator['hider_probabilities'])
+
+
+def test_reports_non_convergence():
+    payoff = create_game_grid(16, grid_type="2d").get_payoff_matrix()
+    result = IterativeGameSolver(payoff, tolerance=1e-12, max_iterations=20).solve_both()
+
+    assert not result['converged']
+    assert result['iterations'] == 20
+    assert result['exploitability'] > 1e-12
+
+
+def test_method_is_selectable_per_call():
+    payoff = create_game_grid(8, grid_type="linear", use_proximity=True).get_payoff_matrix()
+    _, lp_value = solve_payoff_matrix(payoff, "seeker")
+    _, iterative_value = solve_payoff_matrix(payoff, "seeker", method="iterative", tolerance=1e-6)
+
+    assert abs(lp_value - iterative_value) <= 1e-6
+
+
+def test_warm_start_from_the_equilibrium_needs_no_iterations():
+    payoff = create_game_grid(16, grid_type="2d", use_proximity=True).get_payoff_matrix()
+    exact = solve_game(payoff)
+
+    solver = IterativeGameSolver(payoff, tolerance=1e-6,
+                                 initial_strategies=(exact["hider_probabilities"], exact["seeker_probabilities"]))
+    result = solver.solve_both()
+    assert result["iterations"] == 0
+    assert result["converged"]
@@ -0,0 +1,71 @@
+import numpy as np
+
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.game.gamelogic.gamegrid.place_type import PlaceType
+from src.linearprogramming.linear_gamesolver import LinearGameSolver, detect_linear_game
+from src.linearprogramming.lp_gamesolver import LPGameSolver
+
+
+def test_detects_only_linear_games():
+    place_types = [PlaceType.EASY, PlaceType.HARD, PlaceType.NEUTRAL, PlaceType.HARD, PlaceType.EASY, PlaceType.NEUTRAL]
+    linear = create_game_grid(6, grid_type="linear", use_proximity=False, place_types=place_types)
+    proximity = create_game_grid(6, grid_type="linear", use_proximity=True, place_types=place_types)
+
+    assert detect_linear_game(linear.get_payoff_matrix()) is not None
+    assert detect_linear_game(linear.get_structured_payoff_matrix()) is not None
+    assert detect_linear_game(proximity.get_payoff_matrix()) is None
+    assert detect_linear_game(proximity.get_structured_payoff_matrix()) is None
+
+    # A single off-diagonal deviation is enough to rule the closed form out
+    payoff = linear.get_payoff_matrix().copy()
+    payoff[3, 4] += 1
+    assert detect_linear_game(payoff) is None
+
+
+def test_assignment_example_matches_lp():
+    world = create_game_grid(4, grid_type="linear", use_proximity=False)
+    world.place_types = [PlaceType.NEUTRAL, PlaceType.EASY, PlaceType.HARD, PlaceType.EASY]
+    payoff = world._generate_base_payoff_matrix()
+
+    closed_form = LinearGameSolver.from_payoff_matrix(payoff)
+    lp = LPGameSolver(payoff)
+
+    for closed, reference in ((closed_form.solve_for_hider(), lp.solve_for_hider()),
+                              (closed_form.solve_for_seeker(), lp.solve_for_seeker())):
+        assert np.isclose(closed['expected_value'], reference['expected_value'])
+        assert np.allclose(closed['probabilities'], reference['probabilities'], atol=1e-8)
+
+
+def test_random_linear_games_match_lp():
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        size = int(rng.integers(2, 30))
+        world = create_game_grid(size, grid_type="linear", use_proximity=False)
+        payoff = world.get_payoff_matrix()
+
+        hider = LinearGameSolver.from_payoff_matrix(payoff).solve_for_hider()
+        seeker = LinearGameSolver.from_payoff_matrix(payoff).solve_for_seeker()
+        lp_value = LPGameSolver(payoff).solve_for_hider()['expected_value']
+
+        # Equilibria are not always unique, so check the value and that both mixes guarantee it
+        assert np.isclose(hider['expected_value'], lp_value)
+        assert np.isclose(seeker['expected_value'], lp_value)
+        assert np.isclose(hider['probabilities'].sum(), 1) and np.all(hider['probabilities'] >= 0)
+        assert np.isclose(seeker['probabilities'].sum(), 1) and np.all(seeker['probabilities'] >= 0)
+        assert np.min(hider['probabilities'] @ payoff) >= lp_value - 1e-9
+        assert np.max(payoff @ seeker['probabilities']) <= lp_value + 1e-9
+
+
+def test_arbitrary_row_constants_match_lp():
+    rng = np.random.default_rng(11)
+    for _ in range(20):
+        size = int(rng.integers(2, 15))
+        row_values = rng.uniform(-2, 5, size)
+        payoff = np.repeat(row_values[:, np.newaxis], size, axis=1)
+        np.fill_diagonal(payoff, row_values - rng.uniform(0.5, 6, size))
+
+        solver = LinearGameSolver.from_payoff_matrix(payoff)
+        lp = LPGameSolver(payoff)
+        assert np.isclose(solver.solve_for_hider()['expected_value'], lp.solve_for_hider()['expected_value'])
+        assert np.allclose(solver.solve_for_hider()['probabilities'], lp.solve_for_hider()['probabilities'], atol=1e-6)
+        assert np.allclose(solver.solve_for_seeker()['probabilities'], lp.solve_for_seeker()['probabilities'], atol=1e-6)
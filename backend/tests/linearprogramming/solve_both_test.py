@@ -0,0 +1,31 @@
+import numpy as np
+
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.game.gamesimulation import GameSimulation
+from src.linearprogramming.lp_gamesolver import LPGameSolver
+
+
+def test_single_solve_matches_both_lps():
+    for size, grid_type in ((6, "linear"), (12, "linear"), (9, "2d"), (16, "2d")):
+        payoff = create_game_grid(size, grid_type=grid_type, use_proximity=True).get_payoff_matrix()
+        solver = LPGameSolver(payoff)
+
+        both = solver.solve_both()
+        hider = solver.solve_for_hider()
+        seeker = solver.solve_for_seeker()
+
+        assert np.isclose(both['expected_value'], hider['expected_value'])
+        assert np.isclose(both['expected_value'], seeker['expected_value'])
+        assert np.isclose(both['seeker_probabilities'].sum(), 1)
+        assert abs(both['duality_gap']) < 1e-7
+        # The dual mix must guarantee the same value as the seeker's own LP
+        assert np.max(payoff @ both['seeker_probabilities']) <= seeker['expected_value'] + 1e-7
+
+
+def test_simulation_uses_seeker_mix():
+    simulation = GameSimulation(9, "2d", True)
+    simulation.setup_simulation()
+
+    equilibrium = simulation.game_facade.equilibrium
+    assert simulation.seeker_strategy is equilibrium["seeker_probabilities"]
+    assert simulation.game_facade.computer_strategy["probabilities"] is equilibrium["hider_probabilities"]
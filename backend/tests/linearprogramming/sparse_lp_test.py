@@ -0,0 +1,39 @@
+import numpy as np
+
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.linearprogramming.lp_gamesolver import HighsConfig, LPGameSolver, solve_game
+
+
+def test_sparse_formulation_matches_dense():
+    for size, grid_type in ((8, "linear"), (25, "linear"), (16, "2d"), (36, "2d")):
+        grid = create_game_grid(size, grid_type=grid_type, use_proximity=True)
+        dense = LPGameSolver(grid.get_payoff_matrix())
+        sparse = LPGameSolver(grid.get_structured_payoff_matrix())
+
+        dense_both = dense.solve_both()
+        sparse_both = sparse.solve_both()
+        assert np.isclose(sparse_both['expected_value'], dense_both['expected_value'])
+        assert abs(sparse_both['duality_gap']) < 1e-7
+        assert np.isclose(sparse_both['seeker_probabilities'].sum(), 1)
+
+        assert np.isclose(sparse.solve_for_hider()['expected_value'], dense_both['expected_value'])
+        assert np.isclose(sparse.solve_for_seeker()['expected_value'], dense_both['expected_value'])
+
+
+def test_solve_game_reports_timing():
+    grid = create_game_grid(16, grid_type="2d", use_proximity=True)
+    timing = solve_game(grid.get_structured_payoff_matrix())['timing']
+
+    assert timing['sparse'] is True
+    assert timing['build_time'] >= 0 and timing['solve_time'] >= 0
+    assert timing['method'] in ("highs-ds", "highs-ipm")
+
+
+def test_method_selection():
+    config = HighsConfig(ipm_min_variables=1000)
+    # Dense problems use the dual simplex without presolve, whatever their size
+    assert config.select(5000, 5000, 5000 * 5000) == ("highs-ds", False)
+    # Sparse problems switch to the interior point method once they are large
+    assert config.select(500, 500, 2000) == ("highs-ds", True)
+    assert config.select(5000, 5000, 20000) == ("highs-ipm", True)
+    assert HighsConfig(method="highs-ipm", presolve=False).select(10, 10, 100) == ("highs-ipm", False)
@@ -0,0 +1,45 @@
+import numpy as np
+
+from src.game.gamelogic.gamegrid.gamegrid_factory import create_game_grid
+from src.linearprogramming.lp_gamesolver import solve_game
+
+
+def grids():
+    yield create_game_grid(12, grid_type="linear", use_proximity=False)
+    yield create_game_grid(12, grid_type="linear", use_proximity=True)
+    yield create_game_grid(25, grid_type="2d")
+
+
+def test_structured_matrix_matches_dense_matrix():
+    rng = np.random.default_rng(0)
+    for world in grids():
+        dense = world.get_payoff_matrix()
+        structured = world.get_structured_payoff_matrix()
+        x, y = rng.random(world.size), rng.random(world.size)
+
+        assert np.array_equal(structured.toarray(), dense)
+        assert np.allclose(structured @ y, dense @ y)
+        assert np.allclose(structured.T @ x, x @ dense)
+        assert np.allclose(structured.matmat(np.eye(world.size)), dense)
+        assert np.array_equal(structured.row(3), dense[3])
+        assert np.array_equal(structured.column(5), dense[:, 5])
+        assert structured[4, 5] == dense[4, 5] and structured[5, 5] == dense[5, 5]
+
+
+def test_solvers_accept_structured_matrices():
+    for world in grids():
+        dense_result = solve_game(world.get_payoff_matrix())
+        structured_result = solve_game(world.get_structured_payoff_matrix())
+        iterative_result = solve_game(world.get_structured_payoff_matrix(), method="iterative", tolerance=1e-6)
+
+        assert np.isclose(dense_result['expected_value'], structured_result['expected_value'])
+        assert abs(dense_result['expected_value'] - iterative_result['expected_value']) <= 1e-6
+
+
+def test_large_grids_fit_in_linear_memory():
+    world = create_game_grid(300 * 300, grid_type="2d")
+    structured = world.get_structured_payoff_matrix()
+
+    # 25 entries per place at most (diagonal plus a Chebyshev radius of 2)
+    assert structured.correction.nnz <= 25 * world.size
+    assert structured.nbytes < 400 * world.size
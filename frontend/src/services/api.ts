@@ -9,6 +9,9 @@ const api = axios.create({
   },
 });
 
+// Session of the interactive game, returned by /initialize
+let sessionId: string | null = null;
+
 // Game API functions
 export const initializeGame = async (
   gridSize: number,
@@ -18,11 +21,13 @@ export const initializeGame = async (
     grid_size: gridSize,
     grid_type: gridType,
   });
+  sessionId = response.data.session_id;
   return response.data;
 };
 
 export const startGame = async (humanRole: string) => {
   const response = await api.post("/start-game", {
+    session_id: sessionId,
     human_role: humanRole,
   });
   return response.data;
@@ -30,18 +35,21 @@ export const startGame = async (humanRole: string) => {
 
 export const playRound = async (humanPosition: number) => {
   const response = await api.post("/play-round", {
+    session_id: sessionId,
     human_position: humanPosition,
   });
   return response.data;
 };
 
 export const resetGame = async () => {
-  const response = await api.post("/reset-game", {});
+  const response = await api.post("/reset-game", { session_id: sessionId });
   return response.data;
 };
 
 export const getGameState = async () => {
-  const response = await api.get("/get-game-state");
+  const response = await api.get("/get-game-state", {
+    params: { session_id: sessionId },
+  });
   return response.data;
 };
 
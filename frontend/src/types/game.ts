@@ -34,6 +34,7 @@ export interface GameState {
 // API Response Types
 export interface InitializeResponse {
   status: string;
+  session_id: string;
   payoff_matrix: number[][];
   grid_size: number;
   grid_type: string;
@@ -81,6 +82,7 @@ export interface GameStateResponse {
     human_wins: number;
     computer_wins: number;
     payoff_matrix: number[][];
+    configuration_digest?: string;
     human_position?: number;
     computer_position?: number;
     winner?: string;